@@ -1,7 +1,9 @@
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Request, status
 from pydantic import UUID4
 
+from api.dependencies.request_cache import get_request_cache
 from api.helpers import get_repository
+from core import config
 from db.repositories.airlock_requests import AirlockRequestRepository
 from models.domain.airlock_request import AirlockRequest
 from db.errors import EntityDoesNotExist, UnableToAccessDatabase
@@ -17,5 +19,5 @@ async def get_airlock_request_by_id(airlock_request_id: UUID4, airlock_request_r
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=strings.STATE_STORE_ENDPOINT_NOT_RESPONDING)
 
 
-async def get_airlock_request_by_id_from_path(airlock_request_id: UUID4 = Path(...), airlock_request_repo=Depends(get_repository(AirlockRequestRepository))) -> AirlockRequest:
-    return await get_airlock_request_by_id(airlock_request_id, airlock_request_repo)
+async def get_airlock_request_by_id_from_path(request: Request, airlock_request_id: UUID4 = Path(...), airlock_request_repo=Depends(get_repository(AirlockRequestRepository))) -> AirlockRequest:
+    return await get_request_cache(request).get_or_read(config.STATE_STORE_AIRLOCK_REQUESTS_CONTAINER, airlock_request_id, lambda: get_airlock_request_by_id(airlock_request_id, airlock_request_repo))
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from azure.cosmos.aio import CosmosClient, DatabaseProxy, ContainerProxy
 
 from core.config import STATE_STORE_ENDPOINT, STATE_STORE_KEY, STATE_STORE_SSL_VERIFY, STATE_STORE_DATABASE
@@ -18,6 +20,7 @@ class Database(metaclass=Singleton):
 
     _cosmos_client: CosmosClient = None
     _database_proxy: DatabaseProxy = None
+    _container_proxies: Dict[str, ContainerProxy] = {}
 
     def __init__(cls):
         pass
@@ -61,4 +64,7 @@ class Database(metaclass=Singleton):
         if cls._database_proxy is None:
             cls._database_proxy = cls._cosmos_client.get_database_client(STATE_STORE_DATABASE)
 
-        return cls._database_proxy.get_container_client(container_name)
+        if container_name not in cls._container_proxies:
+            cls._container_proxies[container_name] = cls._database_proxy.get_container_client(container_name)
+
+        return cls._container_proxies[container_name]
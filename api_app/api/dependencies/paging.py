@@ -0,0 +1,24 @@
+from typing import Optional
+
+from fastapi import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CONTINUATION_HEADER = "x-ms-continuation"
+
+
+class PageParameters:
+    """
+    Optional paging of the list endpoints. Lists are returned in full unless a page size or the continuation token
+    returned with the previous page is passed.
+    """
+
+    def __init__(self,
+                 page_size: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE, description="The maximum number of items to return, enables paging."),
+                 continuation: Optional[str] = Query(default=None, description="The continuation token returned with the previous page.")):
+        self.continuation = continuation
+        self.page_size = page_size if page_size is not None or continuation is None else DEFAULT_PAGE_SIZE
+
+
+def get_stream_parameter(stream: bool = Query(default=False, description="Stream the list as it is read from the database, for lists that aren't paged.")) -> bool:
+    return stream
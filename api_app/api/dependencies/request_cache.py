@@ -0,0 +1,55 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi import Request
+from opentelemetry import trace
+
+T = TypeVar("T")
+
+
+class RequestEntityCache:
+    """
+    Entities resolved by the api/dependencies helpers during a single request, keyed by container and a key within it.
+
+    A workspace is typically resolved by the role check and again by the route (often as a deployed workspace),
+    the cache makes sure the document is only read from Cosmos once per request. The key has to identify everything
+    the read checked, e.g. a resource's type and parents as well as its id, as different kinds of resources share
+    a container.
+    """
+
+    def __init__(self):
+        self._entities: Dict[Tuple, Any] = {}
+        self.cosmos_reads = 0
+        self.hits = 0
+
+    @staticmethod
+    def _cache_key(container: str, key: Hashable) -> Tuple:
+        # ids may be given as UUIDs or strings
+        parts = key if isinstance(key, tuple) else (key,)
+        return (container,) + tuple(str(part) for part in parts)
+
+    def get(self, container: str, key: Hashable) -> Optional[Any]:
+        entity = self._entities.get(self._cache_key(container, key))
+        if entity is not None:
+            self.hits += 1
+            trace.get_current_span().set_attribute("request_cache_hits", self.hits)
+        return entity
+
+    async def get_or_read(self, container: str, key: Hashable, read: Callable[[], Awaitable[T]]) -> T:
+        entity = self.get(container, key)
+        if entity is None:
+            self.record_read()
+            entity = await read()
+            self._entities[self._cache_key(container, key)] = entity
+        return entity
+
+    def record_read(self):
+        self.cosmos_reads += 1
+        trace.get_current_span().set_attribute("cosmos_reads", self.cosmos_reads)
+
+
+def get_request_cache(request: Request) -> RequestEntityCache:
+    cache = getattr(request.state, "entity_cache", None)
+    if cache is None:
+        cache = RequestEntityCache()
+        request.state.entity_cache = cache
+    return cache
@@ -1,11 +1,14 @@
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Request, status
 from pydantic import UUID4
 
+from api.dependencies.request_cache import get_request_cache
 from api.helpers import get_repository
+from core import config
 from db.errors import EntityDoesNotExist
 from resources import strings
 from models.domain.shared_service import SharedService
 from models.domain.operation import Operation
+from models.domain.resource import ResourceType
 from db.repositories.shared_services import SharedServiceRepository
 from db.repositories.operations import OperationRepository
 
@@ -17,12 +20,12 @@ async def get_shared_service_by_id(shared_service_id: UUID4, shared_services_rep
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.SHARED_SERVICE_DOES_NOT_EXIST)
 
 
-async def get_shared_service_by_id_from_path(shared_service_id: UUID4 = Path(...), shared_service_repo=Depends(get_repository(SharedServiceRepository))) -> SharedService:
-    return await get_shared_service_by_id(shared_service_id, shared_service_repo)
+async def get_shared_service_by_id_from_path(request: Request, shared_service_id: UUID4 = Path(...), shared_service_repo=Depends(get_repository(SharedServiceRepository))) -> SharedService:
+    return await get_request_cache(request).get_or_read(config.STATE_STORE_RESOURCES_CONTAINER, (ResourceType.SharedService, shared_service_id), lambda: get_shared_service_by_id(shared_service_id, shared_service_repo))
 
 
-async def get_operation_by_id_from_path(operation_id: UUID4 = Path(...), operations_repo=Depends(get_repository(OperationRepository))) -> Operation:
+async def get_operation_by_id_from_path(request: Request, operation_id: UUID4 = Path(...), operations_repo=Depends(get_repository(OperationRepository))) -> Operation:
     try:
-        return await operations_repo.get_operation_by_id(operation_id=operation_id)
+        return await get_request_cache(request).get_or_read(config.STATE_STORE_OPERATIONS_CONTAINER, operation_id, lambda: operations_repo.get_operation_by_id(operation_id=operation_id))
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.OPERATION_DOES_NOT_EXIST)
@@ -1,7 +1,9 @@
-from fastapi import Depends, HTTPException, Path, status
+from fastapi import Depends, HTTPException, Path, Request, status
 from pydantic import UUID4
 
+from api.dependencies.request_cache import RequestEntityCache, get_request_cache
 from api.helpers import get_repository
+from core import config
 from db.errors import EntityDoesNotExist, ResourceIsNotDeployed
 from db.repositories.operations import OperationRepository
 from db.repositories.user_resources import UserResourceRepository
@@ -11,6 +13,7 @@ from models.domain.user_resource import UserResource
 from models.domain.workspace import Workspace
 from models.domain.workspace_service import WorkspaceService
 from models.domain.operation import Operation
+from models.domain.resource import ResourceType
 
 from resources import strings
 
@@ -22,44 +25,68 @@ async def get_workspace_by_id(workspace_id: UUID4, workspaces_repo) -> Workspace
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.WORKSPACE_DOES_NOT_EXIST)
 
 
-async def get_workspace_by_id_from_path(workspace_id: UUID4 = Path(...), workspaces_repo=Depends(get_repository(WorkspaceRepository))) -> Workspace:
-    return await get_workspace_by_id(workspace_id, workspaces_repo)
+def workspace_key(workspace_id: UUID4) -> tuple:
+    return (ResourceType.Workspace, workspace_id)
 
 
-async def get_deployed_workspace_by_id_from_path(workspace_id: UUID4 = Path(...), workspaces_repo=Depends(get_repository(WorkspaceRepository)), operations_repo=Depends(get_repository(OperationRepository))) -> Workspace:
+def workspace_service_key(workspace_id: UUID4, service_id: UUID4) -> tuple:
+    return (ResourceType.WorkspaceService, workspace_id, service_id)
+
+
+def user_resource_key(workspace_id: UUID4, service_id: UUID4, resource_id: UUID4) -> tuple:
+    return (ResourceType.UserResource, workspace_id, service_id, resource_id)
+
+
+async def _get_deployed_resource(cache: RequestEntityCache, key: tuple, resource_id: UUID4, read_deployed_resource, operations_repo: OperationRepository):
+    # if the resource was already resolved during this request only the deployment needs checking
+    resource = cache.get(config.STATE_STORE_RESOURCES_CONTAINER, key)
+    if resource is None:
+        return await cache.get_or_read(config.STATE_STORE_RESOURCES_CONTAINER, key, read_deployed_resource)
+
+    cache.record_read()
+    if not await operations_repo.resource_has_deployed_operation(resource_id=resource_id):
+        raise ResourceIsNotDeployed
+    return resource
+
+
+async def get_workspace_by_id_from_path(request: Request, workspace_id: UUID4 = Path(...), workspaces_repo=Depends(get_repository(WorkspaceRepository))) -> Workspace:
+    return await get_request_cache(request).get_or_read(config.STATE_STORE_RESOURCES_CONTAINER, workspace_key(workspace_id), lambda: get_workspace_by_id(workspace_id, workspaces_repo))
+
+
+async def get_deployed_workspace_by_id_from_path(request: Request, workspace_id: UUID4 = Path(...), workspaces_repo=Depends(get_repository(WorkspaceRepository)), operations_repo=Depends(get_repository(OperationRepository))) -> Workspace:
     try:
-        return await workspaces_repo.get_deployed_workspace_by_id(workspace_id, operations_repo)
+        return await _get_deployed_resource(get_request_cache(request), workspace_key(workspace_id), workspace_id, lambda: workspaces_repo.get_deployed_workspace_by_id(workspace_id, operations_repo), operations_repo)
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.WORKSPACE_DOES_NOT_EXIST)
     except ResourceIsNotDeployed:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=strings.WORKSPACE_IS_NOT_DEPLOYED)
 
 
-async def get_workspace_service_by_id_from_path(workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), workspace_services_repo=Depends(get_repository(WorkspaceServiceRepository))) -> WorkspaceService:
+async def get_workspace_service_by_id_from_path(request: Request, workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), workspace_services_repo=Depends(get_repository(WorkspaceServiceRepository))) -> WorkspaceService:
     try:
-        return await workspace_services_repo.get_workspace_service_by_id(workspace_id, service_id)
+        return await get_request_cache(request).get_or_read(config.STATE_STORE_RESOURCES_CONTAINER, workspace_service_key(workspace_id, service_id), lambda: workspace_services_repo.get_workspace_service_by_id(workspace_id, service_id))
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.WORKSPACE_SERVICE_DOES_NOT_EXIST)
 
 
-async def get_deployed_workspace_service_by_id_from_path(workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), workspace_services_repo=Depends(get_repository(WorkspaceServiceRepository)), operations_repo=Depends(get_repository(OperationRepository))) -> WorkspaceService:
+async def get_deployed_workspace_service_by_id_from_path(request: Request, workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), workspace_services_repo=Depends(get_repository(WorkspaceServiceRepository)), operations_repo=Depends(get_repository(OperationRepository))) -> WorkspaceService:
     try:
-        return await workspace_services_repo.get_deployed_workspace_service_by_id(workspace_id, service_id, operations_repo)
+        return await _get_deployed_resource(get_request_cache(request), workspace_service_key(workspace_id, service_id), service_id, lambda: workspace_services_repo.get_deployed_workspace_service_by_id(workspace_id, service_id, operations_repo), operations_repo)
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.WORKSPACE_SERVICE_DOES_NOT_EXIST)
     except ResourceIsNotDeployed:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=strings.WORKSPACE_SERVICE_IS_NOT_DEPLOYED)
 
 
-async def get_user_resource_by_id_from_path(workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), resource_id: UUID4 = Path(...), user_resource_repo=Depends(get_repository(UserResourceRepository))) -> UserResource:
+async def get_user_resource_by_id_from_path(request: Request, workspace_id: UUID4 = Path(...), service_id: UUID4 = Path(...), resource_id: UUID4 = Path(...), user_resource_repo=Depends(get_repository(UserResourceRepository))) -> UserResource:
     try:
-        return await user_resource_repo.get_user_resource_by_id(workspace_id, service_id, resource_id)
+        return await get_request_cache(request).get_or_read(config.STATE_STORE_RESOURCES_CONTAINER, user_resource_key(workspace_id, service_id, resource_id), lambda: user_resource_repo.get_user_resource_by_id(workspace_id, service_id, resource_id))
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.USER_RESOURCE_DOES_NOT_EXIST)
 
 
-async def get_operation_by_id_from_path(operation_id: UUID4 = Path(...), operations_repo=Depends(get_repository(OperationRepository))) -> Operation:
+async def get_operation_by_id_from_path(request: Request, operation_id: UUID4 = Path(...), operations_repo=Depends(get_repository(OperationRepository))) -> Operation:
     try:
-        return await operations_repo.get_operation_by_id(operation_id=operation_id)
+        return await get_request_cache(request).get_or_read(config.STATE_STORE_OPERATIONS_CONTAINER, operation_id, lambda: operations_repo.get_operation_by_id(operation_id=operation_id))
     except EntityDoesNotExist:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=strings.OPERATION_DOES_NOT_EXIST)
@@ -0,0 +1,9 @@
+from fastapi import Request, status
+from fastapi.responses import PlainTextResponse
+
+from db.errors import InvalidContinuationToken
+from resources import strings
+
+
+def invalid_continuation_token_error_handler(_: Request, _exception: InvalidContinuationToken) -> PlainTextResponse:
+    return PlainTextResponse(strings.INVALID_CONTINUATION_TOKEN, status_code=status.HTTP_400_BAD_REQUEST)
@@ -1,9 +1,14 @@
-from typing import Callable, Type
+import json
+from typing import AsyncIterator, Callable, Type
 
 from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from db.errors import UnableToAccessDatabase
 from db.repositories.base import BaseRepository
+from db.repositories.registry import RepositoryRegistry
 from resources.strings import UNABLE_TO_GET_STATE_STORE_CLIENT
 from services.logging import logger
 
@@ -11,7 +16,7 @@ from services.logging import logger
 def get_repository(repo_type: Type[BaseRepository],) -> Callable:
     async def _get_repo() -> BaseRepository:
         try:
-            return await repo_type.create()
+            return await RepositoryRegistry.get(repo_type)
         except UnableToAccessDatabase:
             logger.exception(UNABLE_TO_GET_STATE_STORE_CLIENT)
             raise HTTPException(
@@ -20,3 +25,38 @@ def get_repository(repo_type: Type[BaseRepository],) -> Callable:
             )
 
     return _get_repo
+
+
+STREAMED_ITEMS_PER_CHUNK = 50
+
+
+def _encode_item(item: BaseModel) -> str:
+    # encode like a response_model would, so streamed items use the same (aliased) field names as unstreamed ones
+    return json.dumps(jsonable_encoder(item))
+
+
+async def stream_json_list(list_name: str, items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """
+    Streams a list response ({list_name: [...]}) while the items are being read, encoding them in chunks, so the
+    response doesn't have to be held in memory. The first item is read before the response starts so that a failing
+    query still returns an error status.
+    """
+    items = items.__aiter__()
+    try:
+        first_item = await items.__anext__()
+    except StopAsyncIteration:
+        first_item = None
+
+    async def _encode():
+        chunk = [f'{{{json.dumps(list_name)}: [']
+        if first_item is not None:
+            chunk.append(_encode_item(first_item))
+            async for item in items:
+                if len(chunk) >= STREAMED_ITEMS_PER_CHUNK:
+                    yield "".join(chunk)
+                    chunk = []
+                chunk.append("," + _encode_item(item))
+        chunk.append("]}")
+        yield "".join(chunk)
+
+    return StreamingResponse(_encode(), media_type="application/json")
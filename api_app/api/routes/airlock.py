@@ -3,7 +3,8 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status as status_code, Response
 
 from jsonschema.exceptions import ValidationError
-from api.helpers import get_repository
+from api.helpers import get_repository, stream_json_list
+from api.dependencies.paging import PageParameters, get_stream_parameter
 from db.repositories.resources_history import ResourceHistoryRepository
 from db.repositories.user_resources import UserResourceRepository
 from db.repositories.workspace_services import WorkspaceServiceRepository
@@ -22,10 +23,11 @@ from resources import strings
 from auth.rbac import require_workspace_owner_or_researcher_or_airlock_manager, \
     require_workspace_owner_or_researcher, require_airlock_manager
 
-from .resource_helpers import construct_location_header
+from .resource_helpers import cascade_failed_http_exception, construct_location_header
 
 from services.airlock import create_review_vm, review_airlock_request, get_airlock_container_link, get_allowed_actions, save_and_publish_event_airlock_request, update_and_publish_event_airlock_request, \
-    enrich_requests_with_allowed_actions, get_airlock_requests_by_user_and_workspace, cancel_request, revoke_request
+    enrich_requests_with_allowed_actions, iter_requests_with_allowed_actions, get_airlock_requests_by_user_and_workspace, cancel_request, revoke_request
+from services.cascade import CascadeFailed
 from services.logging import logger
 
 airlock_workspace_router = APIRouter(dependencies=[Depends(require_workspace_owner_or_researcher_or_airlock_manager)])
@@ -61,13 +63,21 @@ async def get_all_airlock_requests_by_workspace(
         workspace=Depends(get_deployed_workspace_by_id_from_path),
         user=Depends(require_workspace_owner_or_researcher_or_airlock_manager),
         creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None,
-        order_by: Optional[str] = None, order_ascending: bool = True) -> AirlockRequestWithAllowedUserActionsInList:
+        order_by: Optional[str] = None, order_ascending: bool = True,
+        page=Depends(PageParameters),
+        stream=Depends(get_stream_parameter)) -> AirlockRequestWithAllowedUserActionsInList:
     try:
-        airlock_requests = await get_airlock_requests_by_user_and_workspace(user=user, workspace=workspace, airlock_request_repo=airlock_request_repo,
-                                                                            creator_user_id=creator_user_id, type=type, status=status,
-                                                                            order_by=order_by, order_ascending=order_ascending)
+        if stream and page.page_size is None:
+            airlock_requests = airlock_request_repo.get_airlock_requests_iter(workspace_id=workspace.id, creator_user_id=creator_user_id, type=type, status=status,
+                                                                              order_by=order_by, order_ascending=order_ascending)
+            return await stream_json_list("airlockRequests", iter_requests_with_allowed_actions(airlock_requests, user, airlock_request_repo))
+
+        airlock_requests, continuation = await get_airlock_requests_by_user_and_workspace(user=user, workspace=workspace, airlock_request_repo=airlock_request_repo,
+                                                                                          creator_user_id=creator_user_id, type=type, status=status,
+                                                                                          order_by=order_by, order_ascending=order_ascending,
+                                                                                          page_size=page.page_size, continuation=page.continuation)
         airlock_requests_with_allowed_user_actions = enrich_requests_with_allowed_actions(airlock_requests, user, airlock_request_repo)
-        return AirlockRequestWithAllowedUserActionsInList(airlockRequests=airlock_requests_with_allowed_user_actions)
+        return AirlockRequestWithAllowedUserActionsInList(airlockRequests=airlock_requests_with_allowed_user_actions, continuation=continuation)
     except (ValidationError, ValueError) as e:
         logger.exception("Failed retrieving all the airlock requests for a workspace")
         raise HTTPException(status_code=status_code.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -108,7 +118,10 @@ async def create_cancel_request(airlock_request=Depends(get_airlock_request_by_i
                                 resource_history_repo=Depends(get_repository(ResourceHistoryRepository)),
                                 operation_repo=Depends(get_repository(OperationRepository)),
                                 resource_template_repo=Depends(get_repository(ResourceTemplateRepository)),) -> AirlockRequestWithAllowedUserActions:
-    updated_request = await cancel_request(airlock_request, user, workspace, airlock_request_repo, user_resource_repo, workspace_service_repo, resource_template_repo, operation_repo, resource_history_repo)
+    try:
+        updated_request = await cancel_request(airlock_request, user, workspace, airlock_request_repo, user_resource_repo, workspace_service_repo, resource_template_repo, operation_repo, resource_history_repo)
+    except CascadeFailed as e:
+        raise cascade_failed_http_exception(e)
     allowed_actions = get_allowed_actions(updated_request, user, airlock_request_repo)
     return AirlockRequestWithAllowedUserActions(airlockRequest=updated_request, allowedUserActions=allowed_actions)
 
@@ -186,6 +199,8 @@ async def create_airlock_review(
     except (ValidationError, ValueError) as e:
         logger.exception("Failed creating airlock review model instance")
         raise HTTPException(status_code=status_code.HTTP_400_BAD_REQUEST, detail=str(e))
+    except CascadeFailed as e:
+        raise cascade_failed_http_exception(e)
 
 
 @airlock_workspace_router.get("/workspaces/{workspace_id}/requests/{airlock_request_id}/link",
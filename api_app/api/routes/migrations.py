@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.helpers import get_repository
 from auth.rbac import require_tre_admin
+from db.events import get_index_transformation_progress
+from db.migrations.resources import ResourceMigration
 from resources import strings
-from models.schemas.migrations import MigrationOutList
+from models.schemas.migrations import IndexTransformationProgressList, Migration, MigrationOutList
 from services.logging import logger
 
 migrations_core_router = APIRouter(dependencies=[Depends(require_tre_admin)])
@@ -12,7 +15,7 @@ migrations_core_router = APIRouter(dependencies=[Depends(require_tre_admin)])
                              name=strings.API_MIGRATE_DATABASE,
                              response_model=MigrationOutList,
                              dependencies=[Depends(require_tre_admin)])
-async def migrate_database():
+async def migrate_database(resource_migration=Depends(get_repository(ResourceMigration))):
     try:
         migrations = list()
 
@@ -21,9 +24,20 @@ async def migrate_database():
         # https://github.com/microsoft/AzureTRE/blob/v0.22.0/api_app/api/routes/migrations.py#L32-L84
         # and this folder:
         # https://github.com/microsoft/AzureTRE/tree/v0.22.0/api_app/db/migrations
-        logger.info("No migrations exist.")
+        logger.info("Backfill resource paths for the resource hierarchy lookups")
+        num_updated = await resource_migration.backfill_resource_paths()
+        migrations.append(Migration(issueNumber="Backfill resource paths", status=f"Updated {num_updated} resources"))
 
         return MigrationOutList(migrations=migrations)
     except Exception as e:
         logger.exception("Failed to migrate database")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@migrations_core_router.get("/migrations/indexing",
+                            name=strings.API_GET_INDEX_TRANSFORMATION_PROGRESS,
+                            response_model=IndexTransformationProgressList,
+                            dependencies=[Depends(require_tre_admin)])
+async def get_indexing_progress() -> IndexTransformationProgressList:
+    # the indexing policies are reconciled by the bootstrap on startup, Cosmos applies them in the background
+    return IndexTransformationProgressList(containers=await get_index_transformation_progress())
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 
-from api.helpers import get_repository
+from api.helpers import get_repository, stream_json_list
+from api.dependencies.paging import PageParameters, get_stream_parameter
 from db.repositories.operations import OperationRepository
 from models.schemas.operation import OperationInList
 from resources import strings
@@ -11,6 +12,8 @@ operations_router = APIRouter(dependencies=[Depends(require_tre_user_or_admin)])
 
 
 @operations_router.get("/operations", response_model=OperationInList, name=strings.API_GET_MY_OPERATIONS)
-async def get_my_operations(user=Depends(require_tre_user_or_admin), operations_repo=Depends(get_repository(OperationRepository))) -> OperationInList:
-    operations = await operations_repo.get_my_operations(user_id=user.id)
-    return OperationInList(operations=operations)
+async def get_my_operations(user=Depends(require_tre_user_or_admin), operations_repo=Depends(get_repository(OperationRepository)), page=Depends(PageParameters), stream=Depends(get_stream_parameter)) -> OperationInList:
+    if stream and page.page_size is None:
+        return await stream_json_list("operations", operations_repo.get_my_operations_iter(user_id=user.id))
+    operations, continuation = await operations_repo.get_my_operations_page(user_id=user.id, page_size=page.page_size, continuation=page.continuation)
+    return OperationInList(operations=operations, continuation=continuation)
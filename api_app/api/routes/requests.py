@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status as status_code
+from fastapi import APIRouter, Depends, HTTPException, Response, status as status_code
 from typing import List, Optional
 
 from api.helpers import get_repository
+from api.dependencies.paging import CONTINUATION_HEADER, PageParameters
 from resources import strings
 from db.repositories.airlock_requests import AirlockRequestRepository
 from models.domain.airlock_request import AirlockRequest, AirlockRequestStatus, AirlockRequestType
@@ -12,30 +13,57 @@ router = APIRouter(dependencies=[Depends(require_tre_user_or_admin)])
 
 @router.get("/requests", response_model=List[AirlockRequest], name=strings.API_LIST_REQUESTS)
 async def get_requests(
+    response: Response,
     user=Depends(require_tre_user_or_admin),
     airlock_request_repo: AirlockRequestRepository = Depends(get_repository(AirlockRequestRepository)),
     airlock_manager: bool = False,
     type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None,
-    order_by: Optional[str] = None, order_ascending: bool = True
+    order_by: Optional[str] = None, order_ascending: bool = True,
+    page=Depends(PageParameters)
 ) -> List[AirlockRequest]:
     try:
-        if not airlock_manager:
-            requests = await airlock_request_repo.get_airlock_requests(
+        continuation = None
+        if page.page_size is None:
+            if not airlock_manager:
+                requests = await airlock_request_repo.get_airlock_requests(
+                    creator_user_id=user.id,
+                    type=type,
+                    status=status,
+                    order_by=order_by,
+                    order_ascending=order_ascending,
+                )
+            else:
+                requests = await airlock_request_repo.get_airlock_requests_for_airlock_manager(
+                    user_id=user.id,
+                    type=type,
+                    status=status,
+                    order_by=order_by,
+                    order_ascending=order_ascending
+                )
+        elif not airlock_manager:
+            requests, continuation = await airlock_request_repo.get_airlock_requests_page(
                 creator_user_id=user.id,
                 type=type,
                 status=status,
                 order_by=order_by,
                 order_ascending=order_ascending,
+                page_size=page.page_size,
+                continuation=page.continuation
             )
         else:
-            requests = await airlock_request_repo.get_airlock_requests_for_airlock_manager(
+            requests, continuation = await airlock_request_repo.get_airlock_requests_for_airlock_manager_page(
                 user_id=user.id,
                 type=type,
                 status=status,
                 order_by=order_by,
-                order_ascending=order_ascending
+                order_ascending=order_ascending,
+                page_size=page.page_size,
+                continuation=page.continuation
             )
 
+        # the response is a plain list, so the continuation token of the next page is returned in a header
+        if continuation is not None:
+            response.headers[CONTINUATION_HEADER] = continuation
         return requests
 
     except ValueError as ve:
@@ -1,9 +1,12 @@
 from datetime import datetime, UTC
 import semantic_version
 from copy import deepcopy
-from typing import Dict, Any, Optional
+from itertools import groupby
+from typing import AsyncIterator, Dict, Any, List, Optional
 
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
 from fastapi import HTTPException, status
+from jsonschema.exceptions import ValidationError
 from db.repositories.user_resources import UserResourceRepository
 from models.domain.user_resource import UserResource
 from models.domain.workspace_service import WorkspaceService
@@ -14,7 +17,7 @@ from models.domain.resource_template import ResourceTemplate
 from models.domain.authentication import User
 from pydantic import parse_obj_as
 
-from db.errors import DuplicateEntity, EntityDoesNotExist
+from db.errors import DuplicateEntity, EntityDoesNotExist, InvalidInput, MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, VersionDowngradeDenied
 from db.repositories.operations import OperationRepository
 from db.repositories.resource_templates import ResourceTemplateRepository
 from models.domain.resource import AvailableUpgrade, ResourceType, Resource
@@ -25,6 +28,7 @@ from service_bus.resource_request_sender import (
     RequestAction,
 )
 from services.authentication import get_aad_service
+from services.cascade import CascadeFailed, run_cascade
 from services.logging import logger
 
 
@@ -38,10 +42,10 @@ async def delete_validation(resource: Resource, resource_repo: ResourceRepositor
 
 
 async def cascaded_update_resource(resource_patch: ResourcePatch, parent_resource: Resource, user: User, force_version_update: bool, resource_template_repo: ResourceTemplateRepository, resource_history_repo: ResourceHistoryRepository, resource_repo: ResourceRepository):
-    # Get dependecy list
+    # Get dependecy list (deepest resources first, the parent resource last)
     dependency_list = await resource_repo.get_resource_dependency_list(parent_resource)
-    # Patch all resources
-    for child_resource in dependency_list[:-1]:
+
+    async def patch_child_resource(child_resource: dict):
         child_etag = child_resource["_etag"]
         primary_parent_service_name = ""
         if child_resource["resourceType"] == ResourceType.WorkspaceService:
@@ -54,6 +58,30 @@ async def cascaded_update_resource(resource_patch: ResourcePatch, parent_resourc
         child_resource_template = await resource_template_repo.get_template_by_name_and_version(child_resource.templateName, child_resource.templateVersion, child_resource.resourceType, parent_service_name=primary_parent_service_name)
         await resource_repo.patch_resource(child_resource, resource_patch, child_resource_template, child_etag, resource_template_repo, resource_history_repo, user, strings.RESOURCE_ACTION_UPDATE, force_version_update)
 
+    # Patch all resources, a level of the hierarchy at a time so children are still updated before their parents
+    for _, level in groupby(dependency_list[:-1], key=lambda resource: resource["resourcePath"].count("/")):
+        await run_cascade(level, patch_child_resource, key=lambda resource: resource["id"], refresh=lambda resource: resource_repo.read_item_by_id(resource["id"]))
+
+
+def cascade_error_status_code(error: Exception) -> int:
+    if isinstance(error, HTTPException):
+        return error.status_code
+    if isinstance(error, CosmosAccessConditionFailedError):
+        return status.HTTP_409_CONFLICT
+    if isinstance(error, EntityDoesNotExist):
+        return status.HTTP_404_NOT_FOUND
+    if isinstance(error, (ValidationError, ValueError, InvalidInput, MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, VersionDowngradeDenied)):
+        return status.HTTP_400_BAD_REQUEST
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+def cascade_failed_http_exception(e: CascadeFailed) -> HTTPException:
+    """
+    Returns the HTTP error for a failed cascaded change, with the status of the worst failure and listing every
+    dependent resource that failed.
+    """
+    return HTTPException(status_code=max(cascade_error_status_code(error) for error in e.errors.values()), detail=str(e))
+
 
 async def save_and_deploy_resource(
     resource: Resource,
@@ -156,9 +184,9 @@ def construct_location_header(operation: Operation) -> str:
     return f"/api{operation.resourcePath}/operations/{operation.id}"
 
 
-def get_identity_role_assignments(user):
+async def get_identity_role_assignments(user):
     aad_service = get_aad_service()
-    return aad_service.get_identity_role_assignments(user.id)
+    return await aad_service.get_identity_role_assignments(user.id)
 
 
 async def send_uninstall_message(
@@ -310,9 +338,36 @@ async def update_user_resource(
 
 
 async def enrich_resource_with_available_upgrades(resource: Resource, resource_template_repo: ResourceTemplateRepository):
+    all_versions = await resource_template_repo.get_all_template_versions(resource.templateName)
+    _set_available_upgrades(resource, all_versions)
+
+
+async def enrich_resources_with_available_upgrades(resources: List[Resource], resource_template_repo: ResourceTemplateRepository):
+    """
+    Adds the available upgrades to every resource in a list using the template version index, so listing
+    resources costs (at most) one template query no matter how many resources there are
+    """
+    if not resources:
+        return
+
+    version_index = await resource_template_repo.get_template_version_index()
+    for resource in resources:
+        _set_available_upgrades(resource, version_index.get(resource.templateName, []))
+
+
+async def iter_resources_with_available_upgrades(resources: AsyncIterator[Resource], resource_template_repo: ResourceTemplateRepository) -> AsyncIterator[Resource]:
+    """
+    Streaming version of enrich_resources_with_available_upgrades
+    """
+    version_index = await resource_template_repo.get_template_version_index()
+    async for resource in resources:
+        _set_available_upgrades(resource, version_index.get(resource.templateName, []))
+        yield resource
+
+
+def _set_available_upgrades(resource: Resource, all_versions: List[str]):
     available_upgrades = []
     resource_version = semantic_version.Version(resource.templateVersion)
-    all_versions = await resource_template_repo.get_all_template_versions(resource.templateName)
 
     versions_higher_than_current = [version for version in all_versions if semantic_version.Version(version) > resource_version]
     major_update_versions = [version for version in versions_higher_than_current if semantic_version.Version(version).major > resource_version.major]
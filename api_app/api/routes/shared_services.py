@@ -1,11 +1,10 @@
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException, Header, status, Response
 from jsonschema.exceptions import ValidationError
 
 from db.repositories.operations import OperationRepository
 from db.errors import DuplicateEntity, MajorVersionUpdateDenied, UserNotAuthorizedToUseTemplate, TargetTemplateVersionDoesNotExist, VersionDowngradeDenied
-from api.helpers import get_repository
+from api.helpers import get_repository, stream_json_list
+from api.dependencies.paging import PageParameters, get_stream_parameter
 from api.dependencies.shared_services import get_shared_service_by_id_from_path, get_operation_by_id_from_path
 from db.repositories.resource_templates import ResourceTemplateRepository
 from db.repositories.resources_history import ResourceHistoryRepository
@@ -17,7 +16,7 @@ from models.schemas.resource import ResourceHistoryInList, ResourcePatch
 from resources import strings
 from .workspaces import save_and_deploy_resource, construct_location_header
 from azure.cosmos.exceptions import CosmosAccessConditionFailedError
-from .resource_helpers import enrich_resource_with_available_upgrades, send_custom_action_message, send_uninstall_message, send_resource_request_message
+from .resource_helpers import enrich_resource_with_available_upgrades, enrich_resources_with_available_upgrades, send_custom_action_message, send_uninstall_message, send_resource_request_message
 from auth.rbac import require_tre_admin, require_tre_user_or_admin
 from models.domain.request_action import RequestAction
 from services.logging import logger
@@ -35,7 +34,7 @@ def user_is_tre_admin(user):
 @shared_services_router.get("/shared-services", response_model=SharedServicesInList, name=strings.API_GET_ALL_SHARED_SERVICES, dependencies=[Depends(require_tre_user_or_admin)])
 async def retrieve_shared_services(shared_services_repo=Depends(get_repository(SharedServiceRepository)), user=Depends(require_tre_user_or_admin), resource_template_repo=Depends(get_repository(ResourceTemplateRepository))) -> SharedServicesInList:
     shared_services = await shared_services_repo.get_active_shared_services()
-    await asyncio.gather(*[enrich_resource_with_available_upgrades(shared_service, resource_template_repo) for shared_service in shared_services])
+    await enrich_resources_with_available_upgrades(shared_services, resource_template_repo)
     if user_is_tre_admin(user):
         return SharedServicesInList(sharedServices=shared_services)
     else:
@@ -143,8 +142,11 @@ async def invoke_action_on_shared_service(response: Response, action: str, user=
 
 # Shared service operations
 @shared_services_router.get("/shared-services/{shared_service_id}/operations", response_model=OperationInList, name=strings.API_GET_RESOURCE_OPERATIONS, dependencies=[Depends(require_tre_admin), Depends(get_shared_service_by_id_from_path)])
-async def retrieve_shared_service_operations_by_shared_service_id(shared_service=Depends(get_shared_service_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository))) -> OperationInList:
-    return OperationInList(operations=await operations_repo.get_operations_by_resource_id(resource_id=shared_service.id))
+async def retrieve_shared_service_operations_by_shared_service_id(shared_service=Depends(get_shared_service_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository)), page=Depends(PageParameters), stream=Depends(get_stream_parameter)) -> OperationInList:
+    if stream and page.page_size is None:
+        return await stream_json_list("operations", operations_repo.get_operations_by_resource_id_iter(resource_id=shared_service.id))
+    operations, continuation = await operations_repo.get_operations_by_resource_id_page(resource_id=shared_service.id, page_size=page.page_size, continuation=page.continuation)
+    return OperationInList(operations=operations, continuation=continuation)
 
 
 @shared_services_router.get("/shared-services/{shared_service_id}/operations/{operation_id}", response_model=OperationInResponse, name=strings.API_GET_RESOURCE_OPERATION_BY_ID, dependencies=[Depends(require_tre_admin), Depends(get_shared_service_by_id_from_path)])
@@ -154,5 +156,6 @@ async def retrieve_shared_service_operation_by_shared_service_id_and_operation_i
 
 # Shared service history
 @shared_services_router.get("/shared-services/{shared_service_id}/history", response_model=ResourceHistoryInList, name=strings.API_GET_RESOURCE_HISTORY, dependencies=[Depends(require_tre_admin)])
-async def retrieve_shared_service_history_by_shared_service_id(shared_service=Depends(get_shared_service_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository))) -> ResourceHistoryInList:
-    return ResourceHistoryInList(resource_history=await resource_history_repo.get_resource_history_by_resource_id(resource_id=shared_service.id))
+async def retrieve_shared_service_history_by_shared_service_id(shared_service=Depends(get_shared_service_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository)), page=Depends(PageParameters)) -> ResourceHistoryInList:
+    resource_history, continuation = await resource_history_repo.get_resource_history_by_resource_id_page(resource_id=shared_service.id, page_size=page.page_size, continuation=page.continuation)
+    return ResourceHistoryInList(resource_history=resource_history, continuation=continuation)
@@ -13,19 +13,19 @@ workspaces_users_shared_router = APIRouter(dependencies=[Depends(require_workspa
 
 @workspaces_users_shared_router.get("/workspaces/{workspace_id}/users", response_model=UsersInResponse, name=strings.API_GET_WORKSPACE_USERS)
 async def get_workspace_users(workspace=Depends(get_workspace_by_id_from_path), access_service=Depends(get_aad_service)) -> UsersInResponse:
-    users = access_service.get_workspace_users(workspace)
+    users = await access_service.get_workspace_users(workspace)
     return UsersInResponse(users=users)
 
 
 @workspaces_users_admin_router.get("/workspaces/{workspace_id}/assignable-users", response_model=AssignableUsersInResponse, name=strings.API_GET_ASSIGNABLE_USERS)
 async def get_assignable_users(filter: str = "", maxResultCount: int = 5, access_service=Depends(get_aad_service)) -> AssignableUsersInResponse:
-    assignable_users = access_service.get_assignable_users(filter, maxResultCount)
+    assignable_users = await access_service.get_assignable_users(filter, maxResultCount)
     return AssignableUsersInResponse(assignable_users=assignable_users)
 
 
 @workspaces_users_admin_router.get("/workspaces/{workspace_id}/roles", response_model=RolesInResponse, name=strings.API_GET_WORKSPACE_ROLES)
 async def get_workspace_roles(workspace=Depends(get_workspace_by_id_from_path), access_service=Depends(get_aad_service)) -> RolesInResponse:
-    roles = access_service.get_workspace_roles(workspace)
+    roles = await access_service.get_workspace_roles(workspace)
     return RolesInResponse(roles=roles)
 
 
@@ -33,7 +33,7 @@ async def get_workspace_roles(workspace=Depends(get_workspace_by_id_from_path),
 async def assign_workspace_user(response: Response, userRoleAssignmentRequest: UserRoleAssignmentRequest, workspace=Depends(get_workspace_by_id_from_path), access_service=Depends(get_aad_service)) -> WorkspaceUserOperationResponse:
 
     for user_id in userRoleAssignmentRequest.user_ids:
-        access_service.assign_workspace_user(
+        await access_service.assign_workspace_user(
             user_id,
             workspace,
             userRoleAssignmentRequest.role_id
@@ -48,7 +48,7 @@ async def remove_workspace_user_assignment(user_id: str,
                                            workspace=Depends(get_workspace_by_id_from_path),
                                            access_service=Depends(get_aad_service)) -> WorkspaceUserOperationResponse:
 
-    access_service.remove_workspace_role_user_assignment(
+    await access_service.remove_workspace_role_user_assignment(
         user_id,
         role_id,
         workspace
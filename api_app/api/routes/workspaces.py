@@ -1,11 +1,10 @@
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException, Header, Path, status, Response
 from pydantic import UUID4
 
 from jsonschema.exceptions import ValidationError
 
-from api.helpers import get_repository
+from api.helpers import get_repository, stream_json_list
+from api.dependencies.paging import PageParameters, get_stream_parameter
 from api.dependencies.workspaces import get_operation_by_id_from_path, get_workspace_by_id_from_path, get_deployed_workspace_by_id_from_path, get_deployed_workspace_service_by_id_from_path, get_workspace_service_by_id_from_path, get_user_resource_by_id_from_path
 from db.errors import InvalidInput, MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, UserNotAuthorizedToUseTemplate, VersionDowngradeDenied, StorageAccountNameGenerationTimeout, StorageAccountNameCheckFailed
 from db.repositories.operations import OperationRepository
@@ -30,9 +29,10 @@ from auth.rbac import require_tre_admin, require_workspace_owner, \
     require_workspace_owner_or_researcher_or_airlock_manager_or_tre_admin
 from services.authentication import get_aad_service, extract_auth_information
 from services.azure_resource_status import get_azure_resource_status
+from services.cascade import CascadeFailed
 from azure.cosmos.exceptions import CosmosAccessConditionFailedError
 
-from .resource_helpers import cascaded_update_resource, delete_validation, enrich_resource_with_available_upgrades, get_identity_role_assignments, save_and_deploy_resource, construct_location_header, send_uninstall_message, \
+from .resource_helpers import cascade_failed_http_exception, cascaded_update_resource, delete_validation, enrich_resource_with_available_upgrades, enrich_resources_with_available_upgrades, get_identity_role_assignments, iter_resources_with_available_upgrades, save_and_deploy_resource, construct_location_header, send_uninstall_message, \
     send_custom_action_message, send_resource_request_message, update_user_resource
 from models.domain.request_action import RequestAction
 from services.logging import logger
@@ -55,28 +55,31 @@ def validate_user_has_valid_role_for_user_resource(user, user_resource):
 
 # WORKSPACE ROUTES
 @workspaces_core_router.get("/workspaces", response_model=WorkspacesInList, name=strings.API_GET_ALL_WORKSPACES)
-async def retrieve_users_active_workspaces(user=Depends(require_tre_user_or_admin), workspace_repo=Depends(get_repository(WorkspaceRepository)), resource_template_repo=Depends(get_repository(ResourceTemplateRepository))) -> WorkspacesInList:
-
-    if "TREAdmin" in user.roles:
-        workspaces = await workspace_repo.get_active_workspaces()
-        await asyncio.gather(*[enrich_resource_with_available_upgrades(workspace, resource_template_repo) for workspace in workspaces])
-        return WorkspacesInList(workspaces=workspaces)
-
-    workspaces = await workspace_repo.get_active_workspaces()
-
-    access_service = get_aad_service()
-    user_role_assignments = get_identity_role_assignments(user)
-
-    def _safe_get_workspace_role(user, workspace, user_role_assignments):
+async def retrieve_users_active_workspaces(user=Depends(require_tre_user_or_admin), workspace_repo=Depends(get_repository(WorkspaceRepository)), resource_template_repo=Depends(get_repository(ResourceTemplateRepository)), page=Depends(PageParameters), stream=Depends(get_stream_parameter)) -> WorkspacesInList:
+    is_tre_admin = "TREAdmin" in user.roles
+    if not is_tre_admin:
+        access_service = get_aad_service()
+        user_role_assignments = await get_identity_role_assignments(user)
+
+    def _user_has_workspace_role(workspace) -> bool:
+        if is_tre_admin:
+            return True
         # provide graceful failure if there is a workspace without auth info
         # to prevent it blocking listing other workspaces
         try:
-            return access_service.get_workspace_role(user, workspace, user_role_assignments)
+            return access_service.get_workspace_role(user, workspace, user_role_assignments) != WorkspaceRole.NoRole
         except AuthConfigValidationError:
-            return WorkspaceRole.NoRole
-    user_workspaces = [workspace for workspace in workspaces if _safe_get_workspace_role(user, workspace, user_role_assignments) != WorkspaceRole.NoRole]
-    await asyncio.gather(*[enrich_resource_with_available_upgrades(workspace, resource_template_repo) for workspace in user_workspaces])
-    return WorkspacesInList(workspaces=user_workspaces)
+            return False
+
+    if stream and page.page_size is None:
+        user_workspaces = (workspace async for workspace in workspace_repo.get_active_workspaces_iter() if _user_has_workspace_role(workspace))
+        return await stream_json_list("workspaces", iter_resources_with_available_upgrades(user_workspaces, resource_template_repo))
+
+    # pages are filtered after they are read, so a page can hold fewer workspaces than the page size
+    workspaces, continuation = await workspace_repo.get_active_workspaces_page(page_size=page.page_size, continuation=page.continuation)
+    user_workspaces = [workspace for workspace in workspaces if _user_has_workspace_role(workspace)]
+    await enrich_resources_with_available_upgrades(user_workspaces, resource_template_repo)
+    return WorkspacesInList(workspaces=user_workspaces, continuation=continuation)
 
 
 @workspaces_shared_router.get("/workspaces/{workspace_id}", response_model=WorkspaceInResponse, name=strings.API_GET_WORKSPACE_BY_ID)
@@ -97,7 +100,7 @@ async def retrieve_workspace_scope_id_by_workspace_id(workspace=Depends(get_work
 async def create_workspace(workspace_create: WorkspaceInCreate, response: Response, user=Depends(require_tre_admin), workspace_repo=Depends(get_repository(WorkspaceRepository)), resource_template_repo=Depends(get_repository(ResourceTemplateRepository)), operations_repo=Depends(get_repository(OperationRepository)), resource_history_repo=Depends(get_repository(ResourceHistoryRepository))) -> OperationInResponse:
     try:
         # TODO: This requires Directory.ReadAll ( Application.Read.All ) to be enabled in the Azure AD application to enable a users workspaces to be listed. This should be made optional.
-        auth_info = extract_auth_information(workspace_create.properties)
+        auth_info = await extract_auth_information(workspace_create.properties)
         workspace, resource_template = await workspace_repo.create_workspace_item(workspace_create, auth_info, user.id, user.roles)
     except (ValidationError, ValueError) as e:
         logger.exception("Failed to create workspace model instance")
@@ -149,6 +152,8 @@ async def patch_workspace(resource_patch: ResourcePatch, response: Response, use
         return OperationInResponse(operation=operation)
     except CosmosAccessConditionFailedError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=strings.ETAG_CONFLICT)
+    except CascadeFailed as e:
+        raise cascade_failed_http_exception(e)
     except ValidationError as v:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=v.message)
     except (MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, VersionDowngradeDenied) as e:
@@ -213,8 +218,11 @@ async def get_user_resource_templates(
 
 
 @workspaces_shared_router.get("/workspaces/{workspace_id}/operations", response_model=OperationInList, name=strings.API_GET_RESOURCE_OPERATIONS, dependencies=[Depends(require_workspace_owner_or_tre_admin)])
-async def retrieve_workspace_operations_by_workspace_id(workspace=Depends(get_workspace_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository))) -> OperationInList:
-    return OperationInList(operations=await operations_repo.get_operations_by_resource_id(resource_id=workspace.id))
+async def retrieve_workspace_operations_by_workspace_id(workspace=Depends(get_workspace_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository)), page=Depends(PageParameters), stream=Depends(get_stream_parameter)) -> OperationInList:
+    if stream and page.page_size is None:
+        return await stream_json_list("operations", operations_repo.get_operations_by_resource_id_iter(resource_id=workspace.id))
+    operations, continuation = await operations_repo.get_operations_by_resource_id_page(resource_id=workspace.id, page_size=page.page_size, continuation=page.continuation)
+    return OperationInList(operations=operations, continuation=continuation)
 
 
 @workspaces_shared_router.get("/workspaces/{workspace_id}/operations/{operation_id}", response_model=OperationInResponse, name=strings.API_GET_RESOURCE_OPERATION_BY_ID, dependencies=[Depends(require_workspace_owner_or_tre_admin)])
@@ -223,15 +231,16 @@ async def retrieve_workspace_operation_by_workspace_id_and_operation_id(workspac
 
 
 @workspaces_shared_router.get("/workspaces/{workspace_id}/history", response_model=ResourceHistoryInList, name=strings.API_GET_RESOURCE_HISTORY, dependencies=[Depends(require_workspace_owner_or_tre_admin)])
-async def retrieve_workspace_history_by_workspace_id(workspace=Depends(get_workspace_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository))) -> ResourceHistoryInList:
-    return ResourceHistoryInList(resource_history=await resource_history_repo.get_resource_history_by_resource_id(resource_id=workspace.id))
+async def retrieve_workspace_history_by_workspace_id(workspace=Depends(get_workspace_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository)), page=Depends(PageParameters)) -> ResourceHistoryInList:
+    resource_history, continuation = await resource_history_repo.get_resource_history_by_resource_id_page(resource_id=workspace.id, page_size=page.page_size, continuation=page.continuation)
+    return ResourceHistoryInList(resource_history=resource_history, continuation=continuation)
 
 
 # WORKSPACE SERVICES ROUTES
 @workspace_services_workspace_router.get("/workspaces/{workspace_id}/workspace-services", response_model=WorkspaceServicesInList, name=strings.API_GET_ALL_WORKSPACE_SERVICES, dependencies=[Depends(require_workspace_owner_or_researcher_or_airlock_manager)])
 async def retrieve_users_active_workspace_services(workspace=Depends(get_workspace_by_id_from_path), workspace_services_repo=Depends(get_repository(WorkspaceServiceRepository)), resource_template_repo=Depends(get_repository(ResourceTemplateRepository))) -> WorkspaceServicesInList:
     workspace_services = await workspace_services_repo.get_active_workspace_services_for_workspace(workspace.id)
-    await asyncio.gather(*[enrich_resource_with_available_upgrades(workspace_service, resource_template_repo) for workspace_service in workspace_services])
+    await enrich_resources_with_available_upgrades(workspace_services, resource_template_repo)
     return WorkspaceServicesInList(workspaceServices=workspace_services)
 
 
@@ -306,6 +315,8 @@ async def patch_workspace_service(resource_patch: ResourcePatch, response: Respo
         return OperationInResponse(operation=operation)
     except CosmosAccessConditionFailedError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=strings.ETAG_CONFLICT)
+    except CascadeFailed as e:
+        raise cascade_failed_http_exception(e)
     except ValidationError as v:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=v.message)
     except (MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, VersionDowngradeDenied) as e:
@@ -349,8 +360,11 @@ async def invoke_action_on_workspace_service(response: Response, action: str, us
 
 # workspace service operations
 @workspace_services_workspace_router.get("/workspaces/{workspace_id}/workspace-services/{service_id}/operations", response_model=OperationInList, name=strings.API_GET_RESOURCE_OPERATIONS, dependencies=[Depends(require_workspace_owner_or_airlock_manager), Depends(get_workspace_by_id_from_path)])
-async def retrieve_workspace_service_operations_by_workspace_service_id(workspace_service=Depends(get_workspace_service_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository))) -> OperationInList:
-    return OperationInList(operations=await operations_repo.get_operations_by_resource_id(resource_id=workspace_service.id))
+async def retrieve_workspace_service_operations_by_workspace_service_id(workspace_service=Depends(get_workspace_service_by_id_from_path), operations_repo=Depends(get_repository(OperationRepository)), page=Depends(PageParameters), stream=Depends(get_stream_parameter)) -> OperationInList:
+    if stream and page.page_size is None:
+        return await stream_json_list("operations", operations_repo.get_operations_by_resource_id_iter(resource_id=workspace_service.id))
+    operations, continuation = await operations_repo.get_operations_by_resource_id_page(resource_id=workspace_service.id, page_size=page.page_size, continuation=page.continuation)
+    return OperationInList(operations=operations, continuation=continuation)
 
 
 @workspace_services_workspace_router.get("/workspaces/{workspace_id}/workspace-services/{service_id}/operations/{operation_id}", response_model=OperationInResponse, name=strings.API_GET_RESOURCE_OPERATION_BY_ID, dependencies=[Depends(require_workspace_owner_or_airlock_manager), Depends(get_workspace_by_id_from_path)])
@@ -359,8 +373,9 @@ async def retrieve_workspace_service_operation_by_workspace_service_id_and_opera
 
 
 @workspace_services_workspace_router.get("/workspaces/{workspace_id}/workspace-services/{service_id}/history", response_model=ResourceHistoryInList, name=strings.API_GET_RESOURCE_HISTORY, dependencies=[Depends(require_workspace_owner_or_airlock_manager), Depends(get_workspace_by_id_from_path)])
-async def retrieve_workspace_service_history_by_workspace_service_id(workspace_service=Depends(get_workspace_service_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository))) -> ResourceHistoryInList:
-    return ResourceHistoryInList(resource_history=await resource_history_repo.get_resource_history_by_resource_id(resource_id=workspace_service.id))
+async def retrieve_workspace_service_history_by_workspace_service_id(workspace_service=Depends(get_workspace_service_by_id_from_path), resource_history_repo=Depends(get_repository(ResourceHistoryRepository)), page=Depends(PageParameters)) -> ResourceHistoryInList:
+    resource_history, continuation = await resource_history_repo.get_resource_history_by_resource_id_page(resource_id=workspace_service.id, page_size=page.page_size, continuation=page.continuation)
+    return ResourceHistoryInList(resource_history=resource_history, continuation=continuation)
 
 
 # USER RESOURCE ROUTES
@@ -381,7 +396,7 @@ async def retrieve_user_resources_for_workspace_service(
         if 'azure_resource_id' in user_resource.properties:
             user_resource.azureStatus = get_azure_resource_status(user_resource.properties['azure_resource_id'])
 
-    await asyncio.gather(*[enrich_resource_with_available_upgrades(user_resource, resource_template_repo) for user_resource in user_resources])
+    await enrich_resources_with_available_upgrades(user_resources, resource_template_repo)
 
     return UserResourcesInList(userResources=user_resources)
 
@@ -547,9 +562,14 @@ async def invoke_action_on_user_resource(
 async def retrieve_user_resource_operations_by_user_resource_id(
         user_resource=Depends(get_user_resource_by_id_from_path),
         user=Depends(require_workspace_owner_or_researcher_or_airlock_manager),
-        operations_repo=Depends(get_repository(OperationRepository))) -> OperationInList:
+        operations_repo=Depends(get_repository(OperationRepository)),
+        page=Depends(PageParameters),
+        stream=Depends(get_stream_parameter)) -> OperationInList:
     validate_user_has_valid_role_for_user_resource(user, user_resource)
-    return OperationInList(operations=await operations_repo.get_operations_by_resource_id(resource_id=user_resource.id))
+    if stream and page.page_size is None:
+        return await stream_json_list("operations", operations_repo.get_operations_by_resource_id_iter(resource_id=user_resource.id))
+    operations, continuation = await operations_repo.get_operations_by_resource_id_page(resource_id=user_resource.id, page_size=page.page_size, continuation=page.continuation)
+    return OperationInList(operations=operations, continuation=continuation)
 
 
 @user_resources_workspace_router.get("/workspaces/{workspace_id}/workspace-services/{service_id}/user-resources/{resource_id}/operations/{operation_id}", response_model=OperationInResponse, name=strings.API_GET_RESOURCE_OPERATION_BY_ID, dependencies=[Depends(get_workspace_by_id_from_path)])
@@ -562,6 +582,7 @@ async def retrieve_user_resource_operations_by_user_resource_id_and_operation_id
 
 
 @user_resources_workspace_router.get("/workspaces/{workspace_id}/workspace-services/{service_id}/user-resources/{resource_id}/history", response_model=ResourceHistoryInList, name=strings.API_GET_RESOURCE_HISTORY, dependencies=[Depends(get_workspace_by_id_from_path)])
-async def retrieve_user_resource_history_by_user_resource_id(user_resource=Depends(get_user_resource_by_id_from_path), user=Depends(require_workspace_owner_or_researcher_or_airlock_manager), resource_history_repo=Depends(get_repository(ResourceHistoryRepository))) -> ResourceHistoryInList:
+async def retrieve_user_resource_history_by_user_resource_id(user_resource=Depends(get_user_resource_by_id_from_path), user=Depends(require_workspace_owner_or_researcher_or_airlock_manager), resource_history_repo=Depends(get_repository(ResourceHistoryRepository)), page=Depends(PageParameters)) -> ResourceHistoryInList:
     validate_user_has_valid_role_for_user_resource(user, user_resource)
-    return ResourceHistoryInList(resource_history=await resource_history_repo.get_resource_history_by_resource_id(resource_id=user_resource.id))
+    resource_history, continuation = await resource_history_repo.get_resource_history_by_resource_id_page(resource_id=user_resource.id, page_size=page.page_size, continuation=page.continuation)
+    return ResourceHistoryInList(resource_history=resource_history, continuation=continuation)
@@ -1,11 +1,30 @@
+import hashlib
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple, Union
 
 import jwt
 from jwt import PyJWKClient
 
 from auth.exceptions import TokenExpired, TokenInvalid, TokenSignatureInvalid
 from auth.models import AuthenticatedUser
+from core import config as app_config
+from services.cache import LRUCache
+
+# (token hash, audience) -> (token expiry, validated user or the reason the token is invalid for the audience)
+validated_tokens = LRUCache("validated_tokens", app_config.TOKEN_VALIDATION_CACHE_MAX_SIZE)
+
+
+def _unverified_expiry(token: str) -> Optional[float]:
+    try:
+        return jwt.decode_complete(token, options={"verify_signature": False})["payload"].get("exp")
+    except jwt.InvalidTokenError:
+        return None
+
+
+def _cache_result(key: Tuple[str, str], expires_at: Optional[float], result: Union[AuthenticatedUser, str]) -> None:
+    if expires_at is not None:
+        validated_tokens.set(key, (expires_at, result))
 
 
 @dataclass(frozen=True)
@@ -43,18 +62,44 @@ class TokenValidator:
 
         No silent exceptions — every failure mode raises a typed error.
 
+        The outcome for a token with a valid signature — the user, or a wrong
+        audience — is cached until the token expires, so a token that is sent
+        again (e.g. by UI polling) skips the signature verification.
+
         Raises:
             TokenExpired: token has passed its expiry time.
             TokenSignatureInvalid: signature cannot be verified.
             TokenInvalid: any other validation failure.
         """
+        key = (hashlib.sha256(token.encode()).hexdigest(), self._config.audience)
+        cached: Optional[Tuple[float, Union[AuthenticatedUser, str]]] = validated_tokens.get(key)
+        if cached is not None and time.time() < cached[0]:
+            expires_at, result = cached
+            if isinstance(result, str):
+                raise TokenInvalid(result)
+            return result
+
+        try:
+            claims = self._decode(token)
+        except TokenInvalid as exc:
+            if isinstance(exc.__cause__, jwt.InvalidAudienceError):
+                # PyJWT checks the audience after the signature, expiry and
+                # issuer, so the token stays invalid for this audience only.
+                _cache_result(key, _unverified_expiry(token), str(exc))
+            raise
+
+        user = self._to_user(claims)
+        _cache_result(key, claims.get("exp"), user)
+        return user
+
+    def _decode(self, token: str) -> dict:
         try:
             signing_key = self._jwks_client.get_signing_key_from_jwt(token)
         except Exception as exc:
             raise TokenInvalid("Cannot obtain signing key") from exc
 
         try:
-            claims = jwt.decode(
+            return jwt.decode(
                 token,
                 signing_key.key,
                 algorithms=["RS256"],
@@ -78,6 +123,7 @@ class TokenValidator:
         except jwt.InvalidTokenError as exc:
             raise TokenInvalid(f"Token invalid: {exc}") from exc
 
+    def _to_user(self, claims: dict) -> AuthenticatedUser:
         from pydantic import ValidationError
 
         try:
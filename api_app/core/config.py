@@ -33,6 +33,21 @@ STATE_STORE_RESOURCE_TEMPLATES_CONTAINER = "ResourceTemplates"
 STATE_STORE_RESOURCES_HISTORY_CONTAINER = "ResourceHistory"
 STATE_STORE_OPERATIONS_CONTAINER = "Operations"
 STATE_STORE_AIRLOCK_REQUESTS_CONTAINER = "Requests"
+# Resource templates are cached in-process, the change feed of the templates container is polled to pick up changes made by other replicas
+TEMPLATE_CACHE_MAX_SIZE: int = config("TEMPLATE_CACHE_MAX_SIZE", cast=int, default=512)
+TEMPLATE_CACHE_CHANGE_FEED_POLL_SECONDS: int = config("TEMPLATE_CACHE_CHANGE_FEED_POLL_SECONDS", cast=int, default=30)
+# The index of all template versions is also rebuilt periodically, in case a change on the feed was missed
+TEMPLATE_VERSION_INDEX_TTL_SECONDS: int = config("TEMPLATE_VERSION_INDEX_TTL_SECONDS", cast=int, default=300)
+# Ids of resources known to have been deployed are cached in-process, as a deployed resource stays deployed
+DEPLOYED_RESOURCE_CACHE_MAX_SIZE: int = config("DEPLOYED_RESOURCE_CACHE_MAX_SIZE", cast=int, default=10000)
+# Cascaded changes (e.g. disabling a workspace) update the dependent resources concurrently, retrying etag conflicts
+CASCADE_MAX_CONCURRENCY: int = config("CASCADE_MAX_CONCURRENCY", cast=int, default=10)
+CASCADE_ETAG_CONFLICT_RETRIES: int = config("CASCADE_ETAG_CONFLICT_RETRIES", cast=int, default=3)
+# Workspace role assignments read from Microsoft Graph are cached in-process for a short time, changes made through the API invalidate them
+GRAPH_ROLE_ASSIGNMENT_CACHE_MAX_SIZE: int = config("GRAPH_ROLE_ASSIGNMENT_CACHE_MAX_SIZE", cast=int, default=1000)
+GRAPH_ROLE_ASSIGNMENT_CACHE_TTL_SECONDS: int = config("GRAPH_ROLE_ASSIGNMENT_CACHE_TTL_SECONDS", cast=int, default=60)
+# Validated bearer tokens are cached in-process until they expire, so a token sent again skips the signature verification
+TOKEN_VALIDATION_CACHE_MAX_SIZE: int = config("TOKEN_VALIDATION_CACHE_MAX_SIZE", cast=int, default=1024)
 SUBSCRIPTION_ID: str = config("SUBSCRIPTION_ID", default="")
 RESOURCE_GROUP_NAME: str = config("RESOURCE_GROUP_NAME", default="")
 
@@ -41,10 +56,20 @@ SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE: str = config("SERVICE_BUS_FULLY_QUALIFIED
 SERVICE_BUS_RESOURCE_REQUEST_QUEUE: str = config("SERVICE_BUS_RESOURCE_REQUEST_QUEUE", default="")
 SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE: str = config("SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE", default="")
 SERVICE_BUS_STEP_RESULT_QUEUE: str = config("SERVICE_BUS_STEP_RESULT_QUEUE", default="")
+# Number of deployment status update sessions processed concurrently
+DEPLOYMENT_STATUS_UPDATE_SESSION_RECEIVERS: int = config("DEPLOYMENT_STATUS_UPDATE_SESSION_RECEIVERS", cast=int, default=4)
+# Maximum number of airlock step results received, and processed concurrently, at a time
+AIRLOCK_STEP_RESULT_BATCH_SIZE: int = config("AIRLOCK_STEP_RESULT_BATCH_SIZE", cast=int, default=10)
+# Number of airlock step results prefetched while a batch is processed, at most the batch size
+AIRLOCK_STEP_RESULT_PREFETCH_COUNT: int = config("AIRLOCK_STEP_RESULT_PREFETCH_COUNT", cast=int, default=10)
+# Maximum time (in seconds) a receive waits for messages on an idle airlock step result queue
+AIRLOCK_STEP_RESULT_MAX_IDLE_WAIT: int = config("AIRLOCK_STEP_RESULT_MAX_IDLE_WAIT", cast=int, default=10)
 
 # Event grid configuration
 EVENT_GRID_STATUS_CHANGED_TOPIC_ENDPOINT: str = config("EVENT_GRID_STATUS_CHANGED_TOPIC_ENDPOINT", default="")
 EVENT_GRID_AIRLOCK_NOTIFICATION_TOPIC_ENDPOINT: str = config("EVENT_GRID_AIRLOCK_NOTIFICATION_TOPIC_ENDPOINT", default="")
+# Events published to the same topic within this window are sent as one batch, 0 disables batching
+EVENT_GRID_PUBLISH_BATCH_WINDOW_MS: int = config("EVENT_GRID_PUBLISH_BATCH_WINDOW_MS", cast=int, default=0)
 
 # Managed identity configuration
 MANAGED_IDENTITY_CLIENT_ID: str = config("MANAGED_IDENTITY_CLIENT_ID", default="")
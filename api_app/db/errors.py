@@ -44,3 +44,7 @@ class StorageAccountNameGenerationTimeout(Exception):
 
 class StorageAccountNameCheckFailed(Exception):
     """Raised when the storage account name availability check fails due to an Azure SDK error."""
+
+
+class InvalidContinuationToken(Exception):
+    """Raised when a query is resumed from a malformed or expired continuation token."""
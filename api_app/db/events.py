@@ -1,23 +1,57 @@
 import asyncio
+from typing import List, Optional
 from azure.mgmt.cosmosdb import CosmosDBManagementClient
 
+from api.dependencies.database import Database
 from core.config import SUBSCRIPTION_ID, RESOURCE_GROUP_NAME, RESOURCE_LOCATION, COSMOSDB_ACCOUNT_NAME, STATE_STORE_DATABASE, STATE_STORE_RESOURCES_CONTAINER, STATE_STORE_RESOURCE_TEMPLATES_CONTAINER, STATE_STORE_RESOURCES_HISTORY_CONTAINER, STATE_STORE_OPERATIONS_CONTAINER, STATE_STORE_AIRLOCK_REQUESTS_CONTAINER
 from core.credentials import get_credential
+from models.schemas.migrations import IndexTransformationProgress
 from services.logging import logger
 
+INDEX_TRANSFORMATION_PROGRESS_HEADER = "x-ms-documentdb-collection-index-transformation-progress"
+
+
+def indexing_policy(excluded_paths: Optional[List[str]] = None, composite_indexes: Optional[List[List[str]]] = None) -> dict:
+    """
+    Consistent indexing policy that indexes every path apart from the excluded ones (bags of values no query filters
+    on, which only cost write RUs to index). Each composite index is declared ascending and descending so it serves
+    ORDER BY in either direction.
+    """
+    policy = {
+        "indexing_mode": "consistent",
+        "automatic": True,
+        "included_paths": [{"path": "/*"}],
+        "excluded_paths": [{"path": path} for path in (excluded_paths or [])] + [{"path": '/"_etag"/?'}]
+    }
+    if composite_indexes:
+        policy["composite_indexes"] = [[{"path": path, "order": order} for path in paths] for paths in composite_indexes for order in ("ascending", "descending")]
+    return policy
+
+
+CONTAINERS = {
+    STATE_STORE_RESOURCES_CONTAINER: ("/id", indexing_policy(
+        excluded_paths=["/properties/*"],
+        composite_indexes=[["/resourceType", "/deploymentStatus"], ["/templateName", "/deploymentStatus"]])),
+    STATE_STORE_RESOURCE_TEMPLATES_CONTAINER: ("/id", indexing_policy()),
+    STATE_STORE_RESOURCES_HISTORY_CONTAINER: ("/resourceId", indexing_policy(
+        excluded_paths=["/properties/*"])),
+    STATE_STORE_OPERATIONS_CONTAINER: ("/id", indexing_policy(
+        composite_indexes=[["/user/id", "/status", "/createdWhen"], ["/resourceId", "/createdWhen"]])),
+    STATE_STORE_AIRLOCK_REQUESTS_CONTAINER: ("/id", indexing_policy(
+        excluded_paths=["/history/*", "/reviews/*", "/files/*"],
+        composite_indexes=[["/workspaceId", "/status", "/createdWhen"], ["/workspaceId", "/status", "/updatedWhen"], ["/createdBy/id", "/status", "/createdWhen"]]))
+}
+
 
 async def bootstrap_database() -> bool:
     try:
         credential = get_credential()
         db_mgmt_client = CosmosDBManagementClient(credential=credential, subscription_id=SUBSCRIPTION_ID)
 
-        await asyncio.gather(
-            create_container_if_not_exists(db_mgmt_client, STATE_STORE_RESOURCES_CONTAINER, "/id"),
-            create_container_if_not_exists(db_mgmt_client, STATE_STORE_RESOURCE_TEMPLATES_CONTAINER, "/id"),
-            create_container_if_not_exists(db_mgmt_client, STATE_STORE_RESOURCES_HISTORY_CONTAINER, "/resourceId"),
-            create_container_if_not_exists(db_mgmt_client, STATE_STORE_OPERATIONS_CONTAINER, "/id"),
-            create_container_if_not_exists(db_mgmt_client, STATE_STORE_AIRLOCK_REQUESTS_CONTAINER, "/id")
-        )
+        await asyncio.gather(*[
+            create_container_if_not_exists(db_mgmt_client, container, partition_key, policy)
+            for container, (partition_key, policy) in CONTAINERS.items()
+        ])
 
         return True
 
@@ -27,7 +61,20 @@ async def bootstrap_database() -> bool:
         return False
 
 
-async def create_container_if_not_exists(db_mgmt_client, container, partition_key):
+async def create_container_if_not_exists(db_mgmt_client, container, partition_key, indexing_policy=None):
+    # create_update also reconciles the indexing policy of an existing container, Cosmos then transforms the index
+    # in the background (see get_index_transformation_progress)
+    resource = {
+        "id": container,
+        "partition_key": {
+            "paths": [
+                partition_key
+            ],
+            "kind": "Hash"
+        }
+    }
+    if indexing_policy is not None:
+        resource["indexing_policy"] = indexing_policy
 
     db_mgmt_client.sql_resources.begin_create_update_sql_container(
         resource_group_name=RESOURCE_GROUP_NAME,
@@ -36,14 +83,24 @@ async def create_container_if_not_exists(db_mgmt_client, container, partition_ke
         container_name=container,
         create_update_sql_container_parameters={
             "location": RESOURCE_LOCATION,
-            "resource": {
-                "id": container,
-                "partition_key": {
-                    "paths": [
-                        partition_key
-                    ],
-                    "kind": "Hash"
-                }
-            }
+            "resource": resource
         }
     )
+
+
+async def get_container_index_transformation_progress(container_name: str) -> IndexTransformationProgress:
+    headers = {}
+    container = await Database().get_container_proxy(container_name)
+    properties = await container.read(populate_quota_info=True, response_hook=lambda response_headers, _: headers.update(response_headers))
+
+    progress = headers.get(INDEX_TRANSFORMATION_PROGRESS_HEADER)
+    indexing_policy = properties.get("indexingPolicy", {})
+    return IndexTransformationProgress(
+        container=container_name,
+        progress=int(progress) if progress is not None else None,
+        indexingMode=indexing_policy.get("indexingMode"),
+        compositeIndexes=len(indexing_policy.get("compositeIndexes", [])))
+
+
+async def get_index_transformation_progress() -> List[IndexTransformationProgress]:
+    return list(await asyncio.gather(*[get_container_index_transformation_progress(container) for container in CONTAINERS]))
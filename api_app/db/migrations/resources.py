@@ -0,0 +1,36 @@
+from typing import Optional
+
+from db.repositories.resources import ResourceRepository
+from models.domain.resource import ResourceType
+
+
+def resource_path(resource: dict) -> Optional[str]:
+    """
+    The path of a resource in the resource hierarchy, as set by the repositories when the resource is created.
+    """
+    resource_type = resource.get("resourceType")
+    if resource_type == ResourceType.Workspace:
+        return f'/workspaces/{resource["id"]}'
+    if resource_type == ResourceType.WorkspaceService:
+        return f'/workspaces/{resource["workspaceId"]}/workspace-services/{resource["id"]}'
+    if resource_type == ResourceType.UserResource:
+        return f'/workspaces/{resource["workspaceId"]}/workspace-services/{resource["parentWorkspaceServiceId"]}/user-resources/{resource["id"]}'
+    if resource_type == ResourceType.SharedService:
+        return f'/shared-services/{resource["id"]}'
+    return None
+
+
+class ResourceMigration(ResourceRepository):
+    async def backfill_resource_paths(self) -> int:
+        """
+        Sets the resource path of resources stored without one, so they are found by the subtree (prefix) lookups of
+        get_resource_dependency_list. Returns the number of resources updated.
+        """
+        num_updated = 0
+        for resource in await self.query('SELECT * FROM c WHERE NOT IS_DEFINED(c.resourcePath) OR c.resourcePath = ""'):
+            path = resource_path(resource)
+            if path is not None:
+                resource["resourcePath"] = path
+                await self.update_item_dict(resource)
+                num_updated += 1
+        return num_updated
@@ -1,13 +1,16 @@
+import asyncio
 import copy
+import heapq
 import uuid
 
 from datetime import datetime, timezone, UTC
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from pydantic import UUID4
 from azure.cosmos.exceptions import CosmosResourceNotFoundError, CosmosAccessConditionFailedError
 from fastapi import HTTPException, status
 from pydantic import parse_obj_as
 from db.repositories.workspaces import WorkspaceRepository
+from models.domain.workspace import WorkspaceAuthView
 from services.authentication import get_aad_service
 from models.domain.authentication import User
 from db.errors import EntityDoesNotExist
@@ -17,15 +20,25 @@ from models.schemas.airlock_request import AirlockRequestInCreate, AirlockReview
 from core import config
 from resources import strings
 from db.repositories.base import BaseRepository
+from db.repositories.registry import RepositoryRegistry
 from services.logging import logger
 
 
+AIRLOCK_MANAGER_WORKSPACES_PER_QUERY = 100
+
+
+def _order_key(airlock_request: AirlockRequest, order_by: str) -> Tuple:
+    value = airlock_request
+    for field in order_by.split("."):
+        value = value.get(field) if isinstance(value, dict) else getattr(value, field, None)
+    # Cosmos sorts missing values first
+    return (value is not None, value)
+
+
 class AirlockRequestRepository(BaseRepository):
     @classmethod
     async def create(cls):
-        cls = AirlockRequestRepository()
-        await super().create(config.STATE_STORE_AIRLOCK_REQUESTS_CONTAINER)
-        return cls
+        return await super().create(config.STATE_STORE_AIRLOCK_REQUESTS_CONTAINER)
 
     @staticmethod
     def get_resource_base_spec_params():
@@ -123,7 +136,7 @@ class AirlockRequestRepository(BaseRepository):
 
         return airlock_request
 
-    async def get_airlock_requests(self, workspace_id: Optional[str] = None, creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
+    def filtered_airlock_requests_query(self, workspace_id: Optional[str] = None, workspace_ids: Optional[List[str]] = None, creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> Tuple[str, List[dict]]:
         query = self.airlock_requests_query()
 
         # optional filters
@@ -132,6 +145,10 @@ class AirlockRequestRepository(BaseRepository):
         if workspace_id:
             conditions.append('c.workspaceId=@workspace_id')
             parameters.append({"name": "@workspace_id", "value": workspace_id})
+        if workspace_ids is not None:
+            # a single array parameter, so the number of workspaces isn't bound by the query's parameter limit
+            conditions.append('ARRAY_CONTAINS(@workspace_ids, c.workspaceId)')
+            parameters.append({"name": "@workspace_ids", "value": list(workspace_ids)})
         if creator_user_id:
             conditions.append('c.createdBy.id=@user_id')
             parameters.append({"name": "@user_id", "value": creator_user_id})
@@ -150,9 +167,23 @@ class AirlockRequestRepository(BaseRepository):
             query += ' ORDER BY c.' + order_by
             query += ' ASC' if order_ascending else ' DESC'
 
+        return query, parameters
+
+    async def get_airlock_requests(self, workspace_id: Optional[str] = None, creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
+        query, parameters = self.filtered_airlock_requests_query(workspace_id=workspace_id, creator_user_id=creator_user_id, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
         airlock_requests = await self.query(query=query, parameters=parameters)
         return parse_obj_as(List[AirlockRequest], airlock_requests)
 
+    async def get_airlock_requests_page(self, workspace_id: Optional[str] = None, creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[AirlockRequest], Optional[str]]:
+        query, parameters = self.filtered_airlock_requests_query(workspace_id=workspace_id, creator_user_id=creator_user_id, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+        airlock_requests, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        return parse_obj_as(List[AirlockRequest], airlock_requests), continuation
+
+    async def get_airlock_requests_iter(self, workspace_id: Optional[str] = None, creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> AsyncIterator[AirlockRequest]:
+        query, parameters = self.filtered_airlock_requests_query(workspace_id=workspace_id, creator_user_id=creator_user_id, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+        async for airlock_request in self.query_iter(query=query, parameters=parameters):
+            yield parse_obj_as(AirlockRequest, airlock_request)
+
     async def get_airlock_request_by_id(self, airlock_request_id: UUID4) -> AirlockRequest:
         try:
             airlock_requests = await self.read_item_by_id(str(airlock_request_id))
@@ -160,26 +191,53 @@ class AirlockRequestRepository(BaseRepository):
             raise EntityDoesNotExist
         return parse_obj_as(AirlockRequest, airlock_requests)
 
-    async def get_airlock_requests_for_airlock_manager(self, user_id: str, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
-        workspace_repo = await WorkspaceRepository.create()
+    async def get_airlock_manager_workspace_ids(self, user_id: str) -> List[str]:
+        workspace_repo = await RepositoryRegistry.get(WorkspaceRepository)
         access_service = get_aad_service()
 
-        workspaces = await workspace_repo.get_active_workspaces()
-        user_role_assignments = access_service.get_identity_role_assignments(user_id)
+        workspaces = await workspace_repo.get_active_workspace_views(WorkspaceAuthView)
+        user_role_assignments = await access_service.get_identity_role_assignments(user_id)
 
         valid_roles = {ra.role_id for ra in user_role_assignments}
 
-        workspace_ids = [
+        return [
             workspace.id
             for workspace in workspaces
             if workspace.properties["app_role_id_workspace_airlock_manager"] in valid_roles
         ]
-        requests = []
 
-        for workspace_id in workspace_ids:
-            requests += await self.get_airlock_requests(workspace_id=workspace_id, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+    async def get_airlock_requests_for_workspaces(self, workspace_ids: List[str], type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
+        query, parameters = self.filtered_airlock_requests_query(workspace_ids=workspace_ids, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+        airlock_requests = await self.query(query=query, parameters=parameters)
+        return parse_obj_as(List[AirlockRequest], airlock_requests)
 
-        return requests
+    async def get_airlock_requests_for_airlock_manager(self, user_id: str, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
+        """
+        Returns the requests of every workspace the user is an airlock manager of. The workspaces are queried in chunks
+        (to keep the queries small) concurrently, and the sorted results of the chunks are merged.
+        """
+        workspace_ids = await self.get_airlock_manager_workspace_ids(user_id)
+        chunks = [workspace_ids[i:i + AIRLOCK_MANAGER_WORKSPACES_PER_QUERY] for i in range(0, len(workspace_ids), AIRLOCK_MANAGER_WORKSPACES_PER_QUERY)]
+        results = await asyncio.gather(*[
+            self.get_airlock_requests_for_workspaces(workspace_ids=chunk, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+            for chunk in chunks])
+
+        if not order_by:
+            return [request for requests in results for request in requests]
+        return list(heapq.merge(*results, key=lambda request: _order_key(request, order_by), reverse=not order_ascending))
+
+    async def get_airlock_requests_for_airlock_manager_page(self, user_id: str, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None, order_by: Optional[str] = None, order_ascending=True, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[AirlockRequest], Optional[str]]:
+        """
+        Pages through the requests of every workspace the user is an airlock manager of with a single (unchunked)
+        query, as a continuation token can only resume one query.
+        """
+        workspace_ids = await self.get_airlock_manager_workspace_ids(user_id)
+        if not workspace_ids:
+            return [], None
+
+        query, parameters = self.filtered_airlock_requests_query(workspace_ids=workspace_ids, type=type, status=status, order_by=order_by, order_ascending=order_ascending)
+        airlock_requests, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        return parse_obj_as(List[AirlockRequest], airlock_requests), continuation
 
     async def update_airlock_request(
             self,
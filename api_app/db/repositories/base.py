@@ -1,30 +1,81 @@
-from typing import Optional
+from typing import AsyncIterator, List, Optional, Tuple, Type, TypeVar
 from azure.cosmos.aio import ContainerProxy
 from azure.core import MatchConditions
-from pydantic import BaseModel
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from pydantic import BaseModel, parse_obj_as
 
 from api.dependencies.database import Database
-from db.errors import UnableToAccessDatabase
+from db.errors import InvalidContinuationToken, UnableToAccessDatabase
+from models.domain.resource import ResourceView
+
+TView = TypeVar("TView", bound=ResourceView)
 
 
 class BaseRepository:
+    _container: ContainerProxy
+    _container_name: Optional[str] = None
+    partition_key_field = "id"
+
     @classmethod
     async def create(cls, container_name: Optional[str] = None):
+        repository = cls()
         try:
-            cls._container: ContainerProxy = await Database().get_container_proxy(container_name)
+            repository._container = await Database().get_container_proxy(container_name)
+            repository._container_name = container_name
         except Exception:
             raise UnableToAccessDatabase
 
-        return cls
+        return repository
 
     @property
     def container(self) -> ContainerProxy:
         return self._container
 
+    @property
+    def container_name(self) -> Optional[str]:
+        return self._container_name
+
     async def query(self, query: str, parameters: Optional[dict] = None):
         items = self.container.query_items(query=query, parameters=parameters)
         return [i async for i in items]
 
+    async def query_view(self, view: Type[TView], query: str, parameters: Optional[dict] = None) -> List[TView]:
+        """
+        Runs a `SELECT * FROM c ...` query projected to the fields of a lightweight view, so only those are read.
+        """
+        if not query.startswith("SELECT * "):
+            raise ValueError("Only SELECT * queries can be projected to a view")
+        items = await self.query(query=f"SELECT {view.projection()} " + query[len("SELECT * "):], parameters=parameters)
+        return parse_obj_as(List[view], items)
+
+    async def query_iter(self, query: str, parameters: Optional[dict] = None) -> AsyncIterator[dict]:
+        """
+        Yields the query results as they are read from Cosmos, one page at a time, instead of collecting them all first.
+        """
+        async for item in self.container.query_items(query=query, parameters=parameters):
+            yield item
+
+    async def query_page(self, query: str, parameters: Optional[dict] = None, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        Returns a single page of query results with the continuation token of the next page (None on the last page).
+        Without a page size or continuation token, all the results are returned as one page.
+        """
+        if page_size is None and continuation is None:
+            return await self.query(query=query, parameters=parameters), None
+
+        try:
+            pages = self.container.query_items(query=query, parameters=parameters, max_item_count=page_size).by_page(continuation)
+            items = []
+            async for page in pages:
+                items = [i async for i in page]
+                break
+        except (CosmosHttpResponseError, ValueError, TypeError) as e:
+            # Cosmos rejects a malformed or expired token with a bad request, the SDK fails to parse some of them itself
+            if continuation is None or (isinstance(e, CosmosHttpResponseError) and e.status_code != 400):
+                raise
+            raise InvalidContinuationToken from e
+        return items, pages.continuation_token
+
     async def read_item_by_id(self, item_id: str) -> dict:
         return await self.container.read_item(item=item_id, partition_key=item_id)
 
@@ -44,6 +95,10 @@ class BaseRepository:
     async def update_item_dict(self, item_dict: dict):
         await self.container.upsert_item(body=item_dict)
 
+    async def patch_item(self, item_id: str, patch_operations: List[dict], partition_key: Optional[str] = None, etag: Optional[str] = None):
+        conditions = {"etag": etag, "match_condition": MatchConditions.IfNotModified} if etag else {}
+        await self.container.patch_item(item=item_id, partition_key=partition_key or item_id, patch_operations=patch_operations, **conditions)
+
     async def delete_item(self, item_id: str):
         await self.container.delete_item(item=item_id, partition_key=item_id)
 
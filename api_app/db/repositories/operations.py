@@ -1,7 +1,8 @@
 from datetime import datetime, UTC
 import uuid
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from pydantic import parse_obj_as
 from db.repositories.resource_templates import ResourceTemplateRepository
 from resources import strings
@@ -14,14 +15,18 @@ from db.repositories.base import BaseRepository
 
 from db.errors import EntityDoesNotExist
 from models.domain.operation import Operation, OperationStep, Status
+from services.cache import LRUCache
+
+ACTIVE_OPERATION_STATUSES = [Status.AwaitingAction, Status.InvokingAction, Status.AwaitingDeployment, Status.Deploying, Status.AwaitingDeletion, Status.Deleting, Status.AwaitingUpdate, Status.Updating, Status.PipelineRunning]
+
+# resources known to have a successful install/upgrade operation, which gates every get_deployed_*_by_id_from_path
+deployed_resources = LRUCache("deployed_resources", config.DEPLOYED_RESOURCE_CACHE_MAX_SIZE)
 
 
 class OperationRepository(BaseRepository):
     @classmethod
     async def create(cls):
-        cls = OperationRepository()
-        await super().create(config.STATE_STORE_OPERATIONS_CONTAINER)
-        return cls
+        return await super().create(config.STATE_STORE_OPERATIONS_CONTAINER)
 
     @staticmethod
     def operations_query():
@@ -174,23 +179,66 @@ class OperationRepository(BaseRepository):
         return operation
 
     async def get_operation_by_id(self, operation_id: str) -> Operation:
-        query = self.operations_query() + f' c.id = "{operation_id}"'
-        operation = await self.query(query=query)
-        if not operation:
+        try:
+            operation = await self.read_item_by_id(str(operation_id))
+        except CosmosResourceNotFoundError:
             raise EntityDoesNotExist
-        return parse_obj_as(Operation, operation[0])
+        return parse_obj_as(Operation, operation)
+
+    def my_operations_query(self, user_id: str) -> Tuple[str, List[dict]]:
+        statuses = ", ".join(f"@status_{i}" for i in range(len(ACTIVE_OPERATION_STATUSES)))
+        query = self.operations_query() + f' c.user.id = @userId AND c.status IN ({statuses}) ORDER BY c.createdWhen ASC'
+        parameters = [{"name": "@userId", "value": user_id}] + [{"name": f"@status_{i}", "value": status} for i, status in enumerate(ACTIVE_OPERATION_STATUSES)]
+        return query, parameters
+
+    def resource_operations_query(self, resource_id: str) -> Tuple[str, List[dict]]:
+        return self.operations_query() + ' c.resourceId = @resourceId', [{"name": "@resourceId", "value": str(resource_id)}]
 
     async def get_my_operations(self, user_id: str) -> List[Operation]:
-        query = self.operations_query() + f' c.user.id = "{user_id}" AND c.status IN ("{Status.AwaitingAction}", "{Status.InvokingAction}", "{Status.AwaitingDeployment}", "{Status.Deploying}", "{Status.AwaitingDeletion}", "{Status.Deleting}", "{Status.AwaitingUpdate}", "{Status.Updating}", "{Status.PipelineRunning}") ORDER BY c.createdWhen ASC'
-        operations = await self.query(query=query)
+        query, parameters = self.my_operations_query(user_id)
+        operations = await self.query(query=query, parameters=parameters)
         return parse_obj_as(List[Operation], operations)
 
+    async def get_my_operations_page(self, user_id: str, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[Operation], Optional[str]]:
+        query, parameters = self.my_operations_query(user_id)
+        operations, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        return parse_obj_as(List[Operation], operations), continuation
+
+    async def get_my_operations_iter(self, user_id: str) -> AsyncIterator[Operation]:
+        query, parameters = self.my_operations_query(user_id)
+        async for operation in self.query_iter(query=query, parameters=parameters):
+            yield parse_obj_as(Operation, operation)
+
     async def get_operations_by_resource_id(self, resource_id: str) -> List[Operation]:
-        query = self.operations_query() + f' c.resourceId = "{resource_id}"'
-        operations = await self.query(query=query)
+        query, parameters = self.resource_operations_query(resource_id)
+        operations = await self.query(query=query, parameters=parameters)
         return parse_obj_as(List[Operation], operations)
 
+    async def get_operations_by_resource_id_page(self, resource_id: str, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[Operation], Optional[str]]:
+        query, parameters = self.resource_operations_query(resource_id)
+        operations, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        return parse_obj_as(List[Operation], operations), continuation
+
+    async def get_operations_by_resource_id_iter(self, resource_id: str) -> AsyncIterator[Operation]:
+        query, parameters = self.resource_operations_query(resource_id)
+        async for operation in self.query_iter(query=query, parameters=parameters):
+            yield parse_obj_as(Operation, operation)
+
     async def resource_has_deployed_operation(self, resource_id: str) -> bool:
-        query = self.operations_query() + f' c.resourceId = "{resource_id}" AND ((c.action = "{RequestAction.Install}" AND c.status = "{Status.Deployed}") OR (c.action = "{RequestAction.Upgrade}" AND c.status = "{Status.Updated}"))'
-        operations = await self.query(query=query)
-        return len(operations) > 0
+        # once a resource has been deployed that can't be undone, so only the first positive check is read from the db
+        resource_id = str(resource_id)
+        if deployed_resources.get(resource_id):
+            return True
+
+        query = 'SELECT TOP 1 VALUE 1 FROM c WHERE c.resourceId = @resourceId AND ((c.action = @installAction AND c.status = @deployedStatus) OR (c.action = @upgradeAction AND c.status = @updatedStatus))'
+        parameters = [
+            {"name": "@resourceId", "value": resource_id},
+            {"name": "@installAction", "value": RequestAction.Install},
+            {"name": "@deployedStatus", "value": Status.Deployed},
+            {"name": "@upgradeAction", "value": RequestAction.Upgrade},
+            {"name": "@updatedStatus", "value": Status.Updated}
+        ]
+        has_deployed_operation = len(await self.query(query=query, parameters=parameters)) > 0
+        if has_deployed_operation:
+            deployed_resources.set(resource_id, True)
+        return has_deployed_operation
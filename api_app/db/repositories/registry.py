@@ -0,0 +1,32 @@
+from typing import Dict, Iterable, Type, TypeVar
+
+from db.repositories.base import BaseRepository
+
+RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
+
+
+class RepositoryRegistry:
+    """
+    Process-wide cache of ready-to-use repositories.
+
+    Repositories hold no per-request state apart from their (cached) container proxy,
+    so a single instance of each repository type is shared by every request.
+    """
+    _repositories: Dict[Type[BaseRepository], BaseRepository] = {}
+
+    @classmethod
+    async def get(cls, repo_type: Type[RepositoryType]) -> RepositoryType:
+        repository = cls._repositories.get(repo_type)
+        if repository is None:
+            repository = await repo_type.create()
+            cls._repositories[repo_type] = repository
+        return repository
+
+    @classmethod
+    async def initialize(cls, repo_types: Iterable[Type[BaseRepository]]):
+        for repo_type in repo_types:
+            await cls.get(repo_type)
+
+    @classmethod
+    def clear(cls):
+        cls._repositories.clear()
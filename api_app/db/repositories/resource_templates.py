@@ -1,24 +1,28 @@
+import asyncio
+import copy
 import uuid
-from typing import List, Optional, Union
+from datetime import datetime, UTC
+from typing import Dict, List, Optional, Union
 
+import semantic_version
 from pydantic import parse_obj_as
 
 from core import config
 from db.errors import DuplicateEntity, EntityDoesNotExist, EntityVersionExist, InvalidInput
 from db.repositories.base import BaseRepository
+from db.repositories.template_cache import current_template_key, enriched_templates, template_cache, template_identity, template_version_key
 from models.domain.resource import ResourceType
 from models.domain.resource_template import ResourceTemplate
 from models.domain.user_resource_template import UserResourceTemplate
 from models.schemas.resource_template import ResourceTemplateInCreate, ResourceTemplateInformation
+from services.logging import logger
 from services.schema_service import enrich_shared_service_template, enrich_workspace_template, enrich_workspace_service_template, enrich_user_resource_template
 
 
 class ResourceTemplateRepository(BaseRepository):
     @classmethod
     async def create(cls):
-        cls = ResourceTemplateRepository()
-        await super().create(config.STATE_STORE_RESOURCE_TEMPLATES_CONTAINER)
-        return cls
+        return await super().create(config.STATE_STORE_RESOURCE_TEMPLATES_CONTAINER)
 
     @staticmethod
     def _template_by_name_query(name: str, resource_type: ResourceType) -> str:
@@ -31,6 +35,25 @@ class ResourceTemplateRepository(BaseRepository):
 
     @staticmethod
     def enrich_template(template: ResourceTemplate, is_update: bool = False) -> dict:
+        return copy.deepcopy(ResourceTemplateRepository.get_shared_enriched_template(template, is_update))
+
+    @staticmethod
+    def get_shared_enriched_template(template: ResourceTemplate, is_update: bool = False) -> dict:
+        """
+        Returns the enriched template from the enriched template cache (enriching it on a miss).
+        The returned dict is shared, so it must not be modified - use enrich_template to get a copy.
+        """
+        identity = template_identity(template)
+        key = identity + (is_update,) if identity is not None else None
+        enriched_template = enriched_templates.get(key) if key is not None else None
+        if enriched_template is None:
+            enriched_template = ResourceTemplateRepository._enrich_template(template, is_update)
+            if key is not None:
+                enriched_templates.set(key, enriched_template)
+        return enriched_template
+
+    @staticmethod
+    def _enrich_template(template: ResourceTemplate, is_update: bool = False) -> dict:
         if template.resourceType == ResourceType.Workspace:
             return enrich_workspace_template(template, is_update=is_update)
         elif template.resourceType == ResourceType.WorkspaceService:
@@ -66,6 +89,11 @@ class ResourceTemplateRepository(BaseRepository):
         """
         Returns full template for the current version of the 'template_name' template
         """
+        cache_key = current_template_key(template_name, resource_type, parent_service_name if resource_type == ResourceType.UserResource else None)
+        cached_template = template_cache.get(cache_key)
+        if cached_template is not None:
+            return cached_template
+
         query, parameters = self._template_by_name_query(template_name, resource_type)
         query += ' AND c.current = true'
         if resource_type == ResourceType.UserResource:
@@ -77,9 +105,11 @@ class ResourceTemplateRepository(BaseRepository):
         if len(templates) > 1:
             raise DuplicateEntity
         if resource_type == ResourceType.UserResource:
-            return parse_obj_as(UserResourceTemplate, templates[0])
+            template = parse_obj_as(UserResourceTemplate, templates[0])
         else:
-            return parse_obj_as(ResourceTemplate, templates[0])
+            template = parse_obj_as(ResourceTemplate, templates[0])
+        template_cache.set(cache_key, template)
+        return template
 
     async def get_template_by_name_and_version(self, name: str, version: str, resource_type: ResourceType, parent_service_name: Optional[str] = None) -> Union[ResourceTemplate, UserResourceTemplate]:
         """
@@ -99,20 +129,47 @@ class ResourceTemplateRepository(BaseRepository):
             else:
                 raise Exception("When getting a UserResource template, you must pass in a 'parent_service_name'")
 
+        cache_key = template_version_key(name, version, resource_type, parent_service_name if resource_type == ResourceType.UserResource else None)
+        cached_template = template_cache.get(cache_key)
+        if cached_template is not None:
+            return cached_template
+
         # Execute the query and handle results
         templates = await self.query(query=query, parameters=parameters)
         if len(templates) != 1:
             raise EntityDoesNotExist
         if resource_type == ResourceType.UserResource:
-            return parse_obj_as(UserResourceTemplate, templates[0])
+            template = parse_obj_as(UserResourceTemplate, templates[0])
         else:
-            return parse_obj_as(ResourceTemplate, templates[0])
+            template = parse_obj_as(ResourceTemplate, templates[0])
+        template_cache.set(cache_key, template)
+        return template
 
     async def get_all_template_versions(self, template_name: str) -> List[str]:
-        query = 'SELECT VALUE c.version FROM c where c.name = @template_name'
-        parameters = [{"name": "@template_name", "value": template_name}]
-        versions = await self.query(query=query, parameters=parameters)
-        return versions
+        version_index = await self.get_template_version_index()
+        return list(version_index.get(template_name, []))
+
+    async def get_template_version_index(self) -> Dict[str, List[str]]:
+        """
+        Returns the registered versions of every template by template name, sorted by semantic version.
+        The index is built with a single query and cached until a template is registered.
+        """
+        version_index = template_cache.version_index
+        if version_index is not None:
+            return version_index
+
+        version_index = {}
+        for template in await self.query(query='SELECT c.name, c.version FROM c'):
+            version_index.setdefault(template["name"], []).append(template["version"])
+        for versions in version_index.values():
+            try:
+                versions.sort(key=semantic_version.Version)
+            except ValueError:
+                # leave templates with a non semver version unsorted rather than failing every listing
+                pass
+
+        template_cache.version_index = version_index
+        return version_index
 
     async def create_template(self, template_input: ResourceTemplateInCreate, resource_type: ResourceType, parent_service_name: str = "") -> Union[ResourceTemplate, UserResourceTemplate]:
         """
@@ -150,6 +207,7 @@ class ResourceTemplateRepository(BaseRepository):
             template = parse_obj_as(ResourceTemplate, template)
 
         await self.save_item(template)
+        template_cache.invalidate(template.name)
         return template
 
     async def create_and_validate_template(self, template_input: ResourceTemplateInCreate, resource_type: ResourceType, workspace_service_template_name: str = "") -> dict:
@@ -168,12 +226,41 @@ class ResourceTemplateRepository(BaseRepository):
                 if template_input.current:
                     template.current = False
                     await self.update_item(template)
+                    template_cache.invalidate(template.name)
             except EntityDoesNotExist:
                 # first registration
                 template_input.current = True  # For first time registration, template is always marked current
             created_template = await self.create_template(template_input, resource_type, workspace_service_template_name)
             return self.enrich_template(created_template)
 
+    async def watch_template_changes(self):
+        """
+        Follows the change feed of the templates container and drops cached templates that were
+        registered (or had their current version changed) by another API replica
+        """
+        started = datetime.now(UTC)
+        continuation = None
+        while True:
+            try:
+                continuation = await self._invalidate_changed_templates(continuation, started)
+            except Exception:
+                logger.exception("Failed to read the resource templates change feed")
+            await asyncio.sleep(config.TEMPLATE_CACHE_CHANGE_FEED_POLL_SECONDS)
+
+    async def _invalidate_changed_templates(self, continuation: Optional[str], start_time: datetime) -> Optional[str]:
+        if continuation:
+            changes = self.container.query_items_change_feed(continuation=continuation)
+        else:
+            # there is no continuation token until the feed has returned a change, read from when watching started
+            changes = self.container.query_items_change_feed(start_time=start_time)
+
+        pages = changes.by_page()
+        async for page in pages:
+            async for template in page:
+                template_cache.invalidate(template["name"])
+        # the pager's continuation token holds the change feed state to resume from
+        return pages.continuation_token or continuation
+
     def _validate_pipeline_has_unique_step_ids(self, pipeline):
         if pipeline is None:
             return
@@ -9,8 +9,12 @@ from core import config
 from db.errors import VersionDowngradeDenied, EntityDoesNotExist, MajorVersionUpdateDenied, TargetTemplateVersionDoesNotExist, UserNotAuthorizedToUseTemplate
 from db.repositories.resources_history import ResourceHistoryRepository
 from db.repositories.base import BaseRepository
+from db.repositories.registry import RepositoryRegistry
 from db.repositories.resource_templates import ResourceTemplateRepository
-from jsonschema import ValidationError, validate
+from db.repositories.template_cache import get_template_validator
+from db.unit_of_work import UnitOfWork
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
 from models.domain.authentication import User
 from models.domain.resource import Resource, ResourceType
 from models.domain.resource_template import ResourceTemplate
@@ -26,9 +30,7 @@ from pydantic import UUID4, parse_obj_as
 class ResourceRepository(BaseRepository):
     @classmethod
     async def create(cls):
-        cls = ResourceRepository()
-        await super().create(config.STATE_STORE_RESOURCES_CONTAINER)
-        return cls
+        return await super().create(config.STATE_STORE_RESOURCES_CONTAINER)
 
     def _active_resources_by_type_query(self, resource_type: ResourceType):
         query = 'SELECT * FROM c WHERE c.deploymentStatus != @deletedStatus AND c.resourceType = @resourceType'
@@ -38,22 +40,18 @@ class ResourceRepository(BaseRepository):
         ]
         return query, parameters
 
-    def _active_resources_by_id_query(self, resource_id: str):
-        query = 'SELECT * FROM c WHERE c.deploymentStatus != @deletedStatus AND c.id = @resourceId'
-        parameters = [
-            {'name': '@deletedStatus', 'value': Status.Deleted},
-            {'name': '@resourceId', 'value': resource_id}
-        ]
-        return query, parameters
-
     @staticmethod
-    def _validate_resource_parameters(resource_input, resource_template):
-        validate(instance=resource_input["properties"], schema=resource_template)
+    def _validate_resource_parameters(resource_input, resource_template, schema_kind: str = "create"):
+        validator = get_template_validator(resource_template, schema_kind)
+        error = best_match(validator.iter_errors(resource_input["properties"]))
+        if error is not None:
+            raise error
 
     async def _get_enriched_template(self, template_name: str, resource_type: ResourceType, parent_template_name: str = "") -> dict:
-        template_repo = await ResourceTemplateRepository.create()
+        # the enriched template is shared with the enriched template cache, so it must not be modified
+        template_repo = await RepositoryRegistry.get(ResourceTemplateRepository)
         template = await template_repo.get_current_template(template_name, resource_type, parent_template_name)
-        return template_repo.enrich_template(template)
+        return template_repo.get_shared_enriched_template(template)
 
     @staticmethod
     def get_resource_base_spec_params():
@@ -66,6 +64,20 @@ class ResourceRepository(BaseRepository):
             raise EntityDoesNotExist
         return resource
 
+    async def get_active_resource_dict_by_id(self, resource_id: UUID4, resource_type: ResourceType, **expected_fields) -> dict:
+        """
+        Point reads a resource by id (the container is partitioned on /id) and checks the remaining predicates
+        in memory, so lookups by id don't need a cross-partition query.
+        """
+        resource = await self.get_resource_dict_by_id(resource_id)
+
+        if resource.get("resourceType") != resource_type or resource.get("deploymentStatus") == Status.Deleted:
+            raise EntityDoesNotExist
+        for field, value in expected_fields.items():
+            if resource.get(field) != str(value):
+                raise EntityDoesNotExist
+        return resource
+
     async def get_resource_by_id(self, resource_id: UUID4) -> Resource:
         resource = await self.get_resource_dict_by_id(resource_id)
 
@@ -109,10 +121,12 @@ class ResourceRepository(BaseRepository):
 
         self._validate_resource_parameters(resource_input.dict(), template)
 
-        return parse_obj_as(ResourceTemplate, template)
+        return parse_obj_as(ResourceTemplate, copy.deepcopy(template))
 
     async def patch_resource(self, resource: Resource, resource_patch: ResourcePatch, resource_template: ResourceTemplate, etag: str, resource_template_repo: ResourceTemplateRepository, resource_history_repo: ResourceHistoryRepository, user: User, resource_action: str, force_version_update: bool = False) -> Tuple[Resource, ResourceTemplate]:
-        await resource_history_repo.create_resource_history_item(resource)
+        # the history item and the patched resource are written together once the patch has been validated
+        unit_of_work = UnitOfWork()
+        unit_of_work.create(resource_history_repo, resource_history_repo.build_resource_history_item(resource))
         # now update the resource props
         resource.resourceVersion = resource.resourceVersion + 1
         resource.user = user
@@ -131,7 +145,8 @@ class ResourceRepository(BaseRepository):
             # if we're here then we're valid - update the props + persist
             resource.properties.update(resource_patch.properties)
 
-        await self.update_item_with_etag(resource, etag)
+        unit_of_work.replace(self, resource, etag)
+        await unit_of_work.commit()
         return resource, resource_template
 
     async def get_resource_dependency_list(self, resource: Resource) -> List:
@@ -139,10 +154,11 @@ class ResourceRepository(BaseRepository):
         parent_resource_path = resource.resourcePath
         dependent_resources_list = []
 
-        # Get all related resources
-        related_resources_query = "SELECT * FROM c WHERE CONTAINS(c.resourcePath, @resourcePath) AND c.deploymentStatus != @deletedStatus"
+        # Get the resource and its subtree, the resource paths nest so this is a prefix (index range) lookup
+        related_resources_query = "SELECT * FROM c WHERE (c.resourcePath = @resourcePath OR STARTSWITH(c.resourcePath, @childResourcePath)) AND c.deploymentStatus != @deletedStatus"
         parameters = [
             {'name': '@resourcePath', 'value': parent_resource_path},
+            {'name': '@childResourcePath', 'value': parent_resource_path.rstrip("/") + "/"},
             {'name': '@deletedStatus', 'value': Status.Deleted}
         ]
         related_resources = await self.query(query=related_resources_query, parameters=parameters)
@@ -158,8 +174,7 @@ class ResourceRepository(BaseRepository):
         parent_service_template_name = None
         if resource.resourceType == ResourceType.UserResource:
             try:
-                resource_repo = await ResourceRepository.create()
-                parent_service = await resource_repo.get_resource_by_id(resource.parentWorkspaceServiceId)
+                parent_service = await self.get_resource_by_id(resource.parentWorkspaceServiceId)
                 parent_service_template_name = parent_service.templateName
             except EntityDoesNotExist:
                 raise ValueError(f'Parent workspace service {resource.parentWorkspaceServiceId} not found')
@@ -184,18 +199,19 @@ class ResourceRepository(BaseRepository):
             raise TargetTemplateVersionDoesNotExist(f"Template '{resource_template.name}' not found for resource type '{resource_template.resourceType}' with target template version '{resource_patch.templateVersion}'")
 
     def validate_patch(self, resource_patch: ResourcePatch, resource_template_repo: ResourceTemplateRepository, resource_template: ResourceTemplate, resource_action: str):
-        # get the enriched (combined) template
-        enriched_template = resource_template_repo.enrich_template(resource_template, is_update=True)
+        # get the enriched (combined) template, shared with the enriched template cache so it isn't modified below
+        enriched_template = resource_template_repo.get_shared_enriched_template(resource_template, is_update=True)
 
         # validate the PATCH data against a cut down version of the full template.
-        update_template = copy.deepcopy(enriched_template)
+        update_template = dict(enriched_template)
         update_template["required"] = []
         update_template["properties"] = {}
         for prop_name, prop in enriched_template["properties"].items():
             if (resource_action == RESOURCE_ACTION_INSTALL or prop.get("updateable", False) is True):
                 update_template["properties"][prop_name] = prop
 
-        self._validate_resource_parameters(resource_patch.dict(), update_template)
+        schema_kind = "install_patch" if resource_action == RESOURCE_ACTION_INSTALL else "patch"
+        self._validate_resource_parameters(resource_patch.dict(), update_template, schema_kind)
 
     def get_timestamp(self) -> float:
         return datetime.now(UTC).timestamp()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Tuple
 import uuid
 from pydantic import parse_obj_as
 
@@ -10,11 +10,11 @@ from services.logging import logger
 
 
 class ResourceHistoryRepository(BaseRepository):
+    partition_key_field = "resourceId"
+
     @classmethod
     async def create(cls):
-        cls = ResourceHistoryRepository()
-        await super().create(config.STATE_STORE_RESOURCES_HISTORY_CONTAINER)
-        return cls
+        return await super().create(config.STATE_STORE_RESOURCES_HISTORY_CONTAINER)
 
     @staticmethod
     def is_valid_uuid(resourceId):
@@ -43,11 +43,19 @@ class ResourceHistoryRepository(BaseRepository):
             resource_history_items = []
         return parse_obj_as(List[ResourceHistoryItem], resource_history_items)
 
-    async def create_resource_history_item(self, resource: Resource) -> ResourceHistoryItem:
-        logger.info(f"Creating a new history item for resource {resource.id}")
-        resource_history_item_id = str(uuid.uuid4())
-        resource_history_item = ResourceHistoryItem(
-            id=resource_history_item_id,
+    async def get_resource_history_by_resource_id_page(self, resource_id: str, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[ResourceHistoryItem], Optional[str]]:
+        query, parameters = self.resource_history_query(resource_id)
+        try:
+            resource_history_items, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        except EntityDoesNotExist:
+            logger.info(f"No history for resource {resource_id}")
+            resource_history_items, continuation = [], None
+        return parse_obj_as(List[ResourceHistoryItem], resource_history_items), continuation
+
+    @staticmethod
+    def build_resource_history_item(resource: Resource) -> ResourceHistoryItem:
+        return ResourceHistoryItem(
+            id=str(uuid.uuid4()),
             resourceId=resource.id,
             isEnabled=resource.isEnabled,
             properties=resource.properties,
@@ -56,6 +64,10 @@ class ResourceHistoryRepository(BaseRepository):
             user=resource.user,
             templateVersion=resource.templateVersion
         )
+
+    async def create_resource_history_item(self, resource: Resource) -> ResourceHistoryItem:
+        logger.info(f"Creating a new history item for resource {resource.id}")
+        resource_history_item = self.build_resource_history_item(resource)
         logger.info(f"Saving history item for {resource.id}")
         try:
             await self.save_item(resource_history_item)
@@ -9,7 +9,7 @@ from models.domain.authentication import User
 from db.repositories.resource_templates import ResourceTemplateRepository
 from db.repositories.resources_history import ResourceHistoryRepository
 from db.repositories.resources import ResourceRepository
-from db.errors import DuplicateEntity, EntityDoesNotExist
+from db.errors import DuplicateEntity
 from models.domain.shared_service import SharedService
 from models.schemas.resource import ResourcePatch
 from models.schemas.shared_service_template import SharedServiceTemplateInCreate
@@ -18,21 +18,6 @@ from models.domain.operation import Status
 
 
 class SharedServiceRepository(ResourceRepository):
-    @classmethod
-    async def create(cls):
-        cls = SharedServiceRepository()
-        await super().create()
-        return cls
-
-    @staticmethod
-    def shared_service_query(shared_service_id: str):
-        query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.id = @sharedServiceId'
-        parameters = [
-            {'name': '@resourceType', 'value': ResourceType.SharedService},
-            {'name': '@sharedServiceId', 'value': shared_service_id}
-        ]
-        return query, parameters
-
     @staticmethod
     def active_shared_services_query():
         query = 'SELECT * FROM c WHERE c.deploymentStatus != @deletedStatus AND c.resourceType = @resourceType'
@@ -54,13 +39,8 @@ class SharedServiceRepository(ResourceRepository):
         return query, parameters
 
     async def get_shared_service_by_id(self, shared_service_id: str):
-        query, parameters = self.shared_service_query(str(shared_service_id))
-        query += ' AND c.deploymentStatus != @deletedStatus'
-        parameters.append({'name': '@deletedStatus', 'value': Status.Deleted})
-        shared_services = await self.query(query=query, parameters=parameters)
-        if not shared_services:
-            raise EntityDoesNotExist
-        return parse_obj_as(SharedService, shared_services[0])
+        shared_service = await self.get_active_resource_dict_by_id(shared_service_id, ResourceType.SharedService)
+        return parse_obj_as(SharedService, shared_service)
 
     async def get_active_shared_services(self) -> List[SharedService]:
         """
@@ -0,0 +1,102 @@
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+from jsonschema.validators import validator_for
+
+from core import config
+from models.domain.resource_template import ResourceTemplate
+from models.domain.user_resource_template import UserResourceTemplate
+from services.cache import LRUCache, cache_hits, cache_misses
+
+
+def current_template_key(name: str, resource_type: str, parent_service_name: Optional[str]) -> Tuple:
+    return ("current", name, resource_type, parent_service_name or "")
+
+
+def template_version_key(name: str, version: str, resource_type: str, parent_service_name: Optional[str]) -> Tuple:
+    return ("version", name, resource_type, parent_service_name or "", version)
+
+
+class TemplateCache(LRUCache):
+    """
+    Bounded LRU cache of resource templates.
+
+    A registered template version never changes apart from its `current` flag, which moves when a new version is
+    registered, so every entry for a template name is dropped whenever a version of that template is registered.
+    Templates are copied in and out of the cache so callers can't change the cached instance.
+
+    The index of all template versions also expires after version_index_ttl_seconds, so it is rebuilt even if a
+    registration by another replica was missed.
+    """
+
+    def __init__(self, max_size: int, version_index_ttl_seconds: float):
+        super().__init__("templates", max_size)
+        self._version_index: Optional[Dict[str, List[str]]] = None
+        self._version_index_ttl_seconds = version_index_ttl_seconds
+        self._version_index_expiry = 0.0
+
+    @property
+    def version_index(self) -> Optional[Dict[str, List[str]]]:
+        if self._version_index is not None and self._version_index_expiry <= time.monotonic():
+            self._version_index = None
+        if self._version_index is None:
+            cache_misses.add(1, {"cache": "template_version_index"})
+        else:
+            cache_hits.add(1, {"cache": "template_version_index"})
+        return self._version_index
+
+    @version_index.setter
+    def version_index(self, version_index: Dict[str, List[str]]):
+        if self._max_size > 0 and self._version_index_ttl_seconds > 0:
+            self._version_index = version_index
+            self._version_index_expiry = time.monotonic() + self._version_index_ttl_seconds
+
+    def get(self, key: Tuple) -> Optional[Union[ResourceTemplate, UserResourceTemplate]]:
+        template = super().get(key)
+        return template.copy(deep=True) if template is not None else None
+
+    def set(self, key: Tuple, template: Union[ResourceTemplate, UserResourceTemplate]):
+        super().set(key, template.copy(deep=True))
+
+    def invalidate(self, template_name: str):
+        for key in [key for key in self._items if key[1] == template_name]:
+            del self._items[key]
+        self._version_index = None
+
+    def clear(self):
+        super().clear()
+        self._version_index = None
+
+
+def template_identity(template: Union[ResourceTemplate, dict]) -> Optional[Tuple]:
+    """
+    Identifies a stored template version (and whether it is the current one), or None for templates that haven't
+    been stored. Anything derived from a template's identity can be cached, as stored template versions don't change.
+    """
+    if not isinstance(template, dict):
+        template = template.__dict__
+    if not template.get("id"):
+        return None
+    return (template["id"], template.get("name"), template.get("version"), template.get("resourceType"), template.get("current"))
+
+
+def get_template_validator(schema: dict, schema_kind: str):
+    """
+    Returns a compiled validator for an (enriched) template schema. The schema is only checked against its meta-schema
+    the first time a validator for the template version is compiled.
+    """
+    identity = template_identity(schema)
+    key = identity + (schema_kind,) if identity is not None else None
+    validator = template_validators.get(key) if key is not None else None
+    if validator is None:
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        validator = validator_class(schema)
+        if key is not None:
+            template_validators.set(key, validator)
+    return validator
+
+
+template_cache = TemplateCache(config.TEMPLATE_CACHE_MAX_SIZE, config.TEMPLATE_VERSION_INDEX_TTL_SECONDS)
+enriched_templates = LRUCache("enriched_templates", config.TEMPLATE_CACHE_MAX_SIZE)
+template_validators = LRUCache("template_validators", config.TEMPLATE_CACHE_MAX_SIZE)
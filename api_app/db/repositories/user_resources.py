@@ -7,7 +7,6 @@ from models.domain.resource_template import ResourceTemplate
 from models.domain.authentication import User
 
 import resources.strings as strings
-from db.errors import EntityDoesNotExist
 from db.repositories.resource_templates import ResourceTemplateRepository
 from db.repositories.resources import ResourceRepository
 from models.domain.operation import Status
@@ -18,22 +17,6 @@ from models.schemas.user_resource import UserResourceInCreate
 
 
 class UserResourceRepository(ResourceRepository):
-    @classmethod
-    async def create(cls):
-        cls = UserResourceRepository()
-        await super().create()
-        return cls
-
-    @staticmethod
-    def user_resources_query(workspace_id: str, service_id: str):
-        query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.parentWorkspaceServiceId = @serviceId AND c.workspaceId = @workspaceId'
-        parameters = [
-            {'name': '@resourceType', 'value': ResourceType.UserResource},
-            {'name': '@serviceId', 'value': service_id},
-            {'name': '@workspaceId', 'value': workspace_id}
-        ]
-        return query, parameters
-
     @staticmethod
     def active_user_resources_query(workspace_id: str, service_id: str):
         query = 'SELECT * FROM c WHERE c.deploymentStatus != @deletedStatus AND c.resourceType = @resourceType AND c.parentWorkspaceServiceId = @serviceId AND c.workspaceId = @workspaceId'
@@ -76,14 +59,8 @@ class UserResourceRepository(ResourceRepository):
         return parse_obj_as(List[UserResource], user_resources)
 
     async def get_user_resource_by_id(self, workspace_id: str, service_id: str, resource_id: str) -> UserResource:
-        query, parameters = self.user_resources_query(str(workspace_id), str(service_id))
-        query += ' AND c.id = @resourceId AND c.deploymentStatus != @deletedStatus'
-        parameters.append({'name': '@resourceId', 'value': str(resource_id)})
-        parameters.append({'name': '@deletedStatus', 'value': Status.Deleted})
-        user_resources = await self.query(query=query, parameters=parameters)
-        if not user_resources:
-            raise EntityDoesNotExist
-        return parse_obj_as(UserResource, user_resources[0])
+        user_resource = await self.get_active_resource_dict_by_id(resource_id, ResourceType.UserResource, workspaceId=workspace_id, parentWorkspaceServiceId=service_id)
+        return parse_obj_as(UserResource, user_resource)
 
     def get_user_resource_spec_params(self):
         return self.get_resource_base_spec_params()
@@ -14,26 +14,11 @@ from db.repositories.operations import OperationRepository
 from models.domain.workspace_service import WorkspaceService
 from models.schemas.resource import ResourcePatch
 from models.schemas.workspace_service import WorkspaceServiceInCreate
-from db.errors import ResourceIsNotDeployed, EntityDoesNotExist
+from db.errors import ResourceIsNotDeployed
 from models.domain.resource import ResourceType
 
 
 class WorkspaceServiceRepository(ResourceRepository):
-    @classmethod
-    async def create(cls):
-        cls = WorkspaceServiceRepository()
-        await super().create()
-        return cls
-
-    @staticmethod
-    def workspace_services_query(workspace_id: str):
-        query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.workspaceId = @workspaceId'
-        parameters = [
-            {'name': '@resourceType', 'value': ResourceType.WorkspaceService},
-            {'name': '@workspaceId', 'value': workspace_id}
-        ]
-        return query, parameters
-
     @staticmethod
     def active_workspace_services_query(workspace_id: str):
         query = 'SELECT * FROM c WHERE c.deploymentStatus != @deletedStatus AND c.resourceType = @resourceType AND c.workspaceId = @workspaceId'
@@ -61,14 +46,8 @@ class WorkspaceServiceRepository(ResourceRepository):
         return workspace_service
 
     async def get_workspace_service_by_id(self, workspace_id: str, service_id: str) -> WorkspaceService:
-        query, parameters = self.workspace_services_query(str(workspace_id))
-        query += ' AND c.id = @serviceId AND c.deploymentStatus != @deletedStatus'
-        parameters.append({'name': '@serviceId', 'value': str(service_id)})
-        parameters.append({'name': '@deletedStatus', 'value': Status.Deleted})
-        workspace_services = await self.query(query=query, parameters=parameters)
-        if not workspace_services:
-            raise EntityDoesNotExist
-        return parse_obj_as(WorkspaceService, workspace_services[0])
+        workspace_service = await self.get_active_resource_dict_by_id(service_id, ResourceType.WorkspaceService, workspaceId=workspace_id)
+        return parse_obj_as(WorkspaceService, workspace_service)
 
     def get_workspace_service_spec_params(self):
         return self.get_resource_base_spec_params()
@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Tuple
+from typing import AsyncIterator, List, Optional, Tuple, Type
 import asyncio
 from azure.mgmt.storage.aio import StorageManagementClient
 
@@ -11,13 +11,14 @@ from models.domain.authentication import User
 import resources.strings as strings
 from core import config, credentials
 from azure.core.exceptions import HttpResponseError
-from db.errors import EntityDoesNotExist, InvalidInput, ResourceIsNotDeployed, StorageAccountNameGenerationTimeout, StorageAccountNameCheckFailed
+from db.errors import InvalidInput, ResourceIsNotDeployed, StorageAccountNameGenerationTimeout, StorageAccountNameCheckFailed
 from db.repositories.resource_templates import ResourceTemplateRepository
+from db.repositories.base import TView
 from db.repositories.resources import ResourceRepository
 from models.domain.operation import Status
 from db.repositories.operations import OperationRepository
 from models.domain.resource import ResourceType
-from models.domain.workspace import Workspace
+from models.domain.workspace import Workspace, WorkspaceNetworkView
 from models.schemas.resource import ResourcePatch
 from models.schemas.workspace import WorkspaceInCreate
 from services.cidr_service import generate_new_cidr, is_network_available
@@ -32,12 +33,6 @@ class WorkspaceRepository(ResourceRepository):
     # We allow the users some predefined TShirt sizes for the address space
     predefined_address_spaces = {"small": 24, "medium": 22, "large": 16}
 
-    @classmethod
-    async def create(cls):
-        cls = WorkspaceRepository()
-        await super().create()
-        return cls
-
     @staticmethod
     def workspaces_query_string():
         query = 'SELECT * FROM c WHERE c.resourceType = @resourceType'
@@ -65,6 +60,20 @@ class WorkspaceRepository(ResourceRepository):
         workspaces = await self.query(query=query, parameters=parameters)
         return parse_obj_as(List[Workspace], workspaces)
 
+    async def get_active_workspace_views(self, view: Type[TView]) -> List[TView]:
+        query, parameters = WorkspaceRepository.active_workspaces_query_string()
+        return await self.query_view(view, query=query, parameters=parameters)
+
+    async def get_active_workspaces_iter(self) -> AsyncIterator[Workspace]:
+        query, parameters = WorkspaceRepository.active_workspaces_query_string()
+        async for workspace in self.query_iter(query=query, parameters=parameters):
+            yield parse_obj_as(Workspace, workspace)
+
+    async def get_active_workspaces_page(self, page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[Workspace], Optional[str]]:
+        query, parameters = WorkspaceRepository.active_workspaces_query_string()
+        workspaces, continuation = await self.query_page(query=query, parameters=parameters, page_size=page_size, continuation=continuation)
+        return parse_obj_as(List[Workspace], workspaces), continuation
+
     async def get_deployed_workspace_by_id(self, workspace_id: str, operations_repo: OperationRepository) -> Workspace:
         workspace = await self.get_workspace_by_id(workspace_id)
 
@@ -74,14 +83,8 @@ class WorkspaceRepository(ResourceRepository):
         return workspace
 
     async def get_workspace_by_id(self, workspace_id: str) -> Workspace:
-        query, parameters = self.workspaces_query_string()
-        query += ' AND c.id = @workspaceId AND c.deploymentStatus != @deletedStatus'
-        parameters.append({'name': '@workspaceId', 'value': str(workspace_id)})
-        parameters.append({'name': '@deletedStatus', 'value': Status.Deleted})
-        workspaces = await self.query(query=query, parameters=parameters)
-        if not workspaces:
-            raise EntityDoesNotExist
-        return parse_obj_as(Workspace, workspaces[0])
+        workspace = await self.get_active_resource_dict_by_id(workspace_id, ResourceType.Workspace)
+        return parse_obj_as(Workspace, workspace)
 
     # Remove this method once not using last 4 digits for naming - https://github.com/microsoft/AzureTRE/issues/3666
     async def is_workspace_storage_account_available(self, credential, workspace_id: str) -> bool:
@@ -178,11 +181,11 @@ class WorkspaceRepository(ResourceRepository):
         if (address_space is None):
             raise InvalidInput("Missing 'address_space' from properties.")
 
-        allocated_networks = [x.properties["address_space"] for x in await self.get_active_workspaces()]
+        allocated_networks = [x.properties["address_space"] for x in await self.get_active_workspace_views(WorkspaceNetworkView)]
         return is_network_available(allocated_networks, address_space)
 
     async def get_new_address_space(self, cidr_netmask: int = 24):
-        workspaces = await self.get_active_workspaces()
+        workspaces = await self.get_active_workspace_views(WorkspaceNetworkView)
         networks = [[x.properties.get("address_space")] for x in workspaces]
         networks = networks + [x.properties.get("address_spaces", []) for x in workspaces]
         networks = [i for s in networks for i in s if i is not None]
@@ -0,0 +1,110 @@
+import asyncio
+from copy import deepcopy
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosBatchOperationError
+from pydantic import BaseModel
+
+from db.repositories.base import BaseRepository
+
+ETAG_MISMATCH = 412
+# Cosmos applies at most this many operations in a single partial document update
+MAX_PATCH_OPERATIONS = 10
+
+
+class Write(NamedTuple):
+    operation: str
+    repository: BaseRepository
+    item_id: str
+    item: Union[BaseModel, dict, List[dict]]
+    etag: Optional[str]
+
+    @property
+    def body(self) -> dict:
+        return self.item.dict() if isinstance(self.item, BaseModel) else self.item
+
+    def batch_operations(self) -> List[tuple]:
+        options = {"if_match_etag": self.etag} if self.etag else {}
+        if self.operation == "patch":
+            return [("patch", (self.item_id, self.item[i:i + MAX_PATCH_OPERATIONS]), options) for i in range(0, len(self.item), MAX_PATCH_OPERATIONS)]
+        if self.operation == "replace":
+            return [("replace", (self.item_id, self.body), options)]
+        return [(self.operation, (self.body,))]
+
+
+class UnitOfWork:
+    """
+    Collects the writes of an operation so they are committed together.
+
+    A write to a document that is already part of the unit replaces the earlier writes of the document, apart from
+    partial updates (patches), which are applied after them. Writes to the same partition of a container are committed
+    as a single Cosmos transactional batch, and the partitions are committed concurrently. Items are copied when they
+    are added, so later changes to the instance aren't written.
+    """
+
+    def __init__(self):
+        self._partitions: Dict[Tuple[Optional[str], Any], Dict[str, List[Write]]] = {}
+
+    def create(self, repository: BaseRepository, item: Union[BaseModel, dict]):
+        self._add(Write("create", repository, self._id(item), deepcopy(item), None), self._partition_key(repository, item))
+
+    def upsert(self, repository: BaseRepository, item: Union[BaseModel, dict]):
+        self._add(Write("upsert", repository, self._id(item), deepcopy(item), None), self._partition_key(repository, item))
+
+    def replace(self, repository: BaseRepository, item: Union[BaseModel, dict], etag: str):
+        self._add(Write("replace", repository, self._id(item), deepcopy(item), etag), self._partition_key(repository, item))
+
+    def patch(self, repository: BaseRepository, item_id: str, patch_operations: List[dict], partition_key: Optional[str] = None, etag: Optional[str] = None):
+        self._add(Write("patch", repository, str(item_id), deepcopy(patch_operations), etag), partition_key or str(item_id))
+
+    @staticmethod
+    def _id(item: Union[BaseModel, dict]) -> str:
+        return str(item.id if isinstance(item, BaseModel) else item["id"])
+
+    @staticmethod
+    def _partition_key(repository: BaseRepository, item: Union[BaseModel, dict]):
+        return (item.dict() if isinstance(item, BaseModel) else item)[repository.partition_key_field]
+
+    def _add(self, write: Write, partition_key):
+        documents = self._partitions.setdefault((write.repository.container_name, partition_key), {})
+        if write.operation == "patch":
+            documents.setdefault(write.item_id, []).append(write)
+        else:
+            documents[write.item_id] = [write]
+
+    def __len__(self):
+        return sum(len(writes) for documents in self._partitions.values() for writes in documents.values())
+
+    async def commit(self):
+        partitions, self._partitions = self._partitions, {}
+        await asyncio.gather(*[
+            self._commit_partition(partition_key, [write for writes in documents.values() for write in writes])
+            for (_, partition_key), documents in partitions.items()
+        ])
+
+    @staticmethod
+    async def _commit_partition(partition_key, writes: List[Write]):
+        batch = [operation for write in writes for operation in write.batch_operations()]
+        if len(batch) == 1:
+            await UnitOfWork._commit_write(writes[0], partition_key)
+            return
+
+        try:
+            await writes[0].repository.container.execute_item_batch(batch_operations=batch, partition_key=partition_key)
+        except CosmosBatchOperationError as e:
+            # surface etag mismatches the same way as when the write isn't batched
+            if e.error_index is not None and e.operation_responses[e.error_index].get("statusCode") == ETAG_MISMATCH:
+                raise CosmosAccessConditionFailedError(status_code=ETAG_MISMATCH, message=e.http_error_message)
+            raise
+
+    @staticmethod
+    async def _commit_write(write: Write, partition_key):
+        repository, item = write.repository, write.item
+        if write.operation == "patch":
+            await repository.patch_item(write.item_id, item, partition_key=partition_key, etag=write.etag)
+        elif write.operation == "replace":
+            await repository.update_item_with_etag(item, write.etag)
+        elif write.operation == "create":
+            await (repository.save_item(item) if isinstance(item, BaseModel) else repository.container.create_item(body=item))
+        else:
+            await (repository.update_item(item) if isinstance(item, BaseModel) else repository.update_item_dict(item))
@@ -1,13 +1,15 @@
 import asyncio
+from typing import Dict, List, Optional, Tuple
 
 from azure.core.exceptions import HttpResponseError, ServiceRequestError
 from azure.eventgrid import EventGridEvent
 from azure.eventgrid.aio import EventGridPublisherClient
-from core import credentials
+from core import config, credentials
 from services.logging import logger
 
 _MAX_RETRIES = 3
 _BASE_DELAY_SECONDS = 1.0
+_MAX_BATCH_SIZE = 100
 
 
 def _is_retryable(exc: HttpResponseError) -> bool:
@@ -15,14 +17,11 @@ def _is_retryable(exc: HttpResponseError) -> bool:
     return exc.status_code == 429 or (exc.status_code is not None and exc.status_code >= 500)
 
 
-async def publish_event(event: EventGridEvent, topic_endpoint: str) -> None:
+async def _send_with_retries(client: EventGridPublisherClient, events: List[EventGridEvent]) -> None:
     last_exc: Exception | None = None
     for attempt in range(_MAX_RETRIES):
         try:
-            async with credentials.get_credential_async_context() as credential:
-                client = EventGridPublisherClient(topic_endpoint, credential)
-                async with client:
-                    await client.send([event])
+            await client.send(events)
             return
         except HttpResponseError as exc:
             if not _is_retryable(exc):
@@ -44,3 +43,96 @@ async def publish_event(event: EventGridEvent, topic_endpoint: str) -> None:
             await asyncio.sleep(delay)
 
     raise last_exc  # type: ignore[misc]
+
+
+class TopicPublisher():
+    """
+    Owns a long-lived publisher client for a single Event Grid topic.
+
+    When a batch window is configured, events published within the window are coalesced
+    into a single send; each caller still waits for (and sees the outcome of) its own event.
+    """
+
+    def __init__(self, topic_endpoint: str, credential, batch_window_seconds: float = 0):
+        self._client = EventGridPublisherClient(topic_endpoint, credential)
+        self._batch_window_seconds = batch_window_seconds
+        self._pending: List[Tuple[EventGridEvent, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def publish(self, event: EventGridEvent) -> None:
+        if self._batch_window_seconds <= 0:
+            await _send_with_retries(self._client, [event])
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((event, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._batch_window_seconds)
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+
+        for i in range(0, len(pending), _MAX_BATCH_SIZE):
+            batch = pending[i:i + _MAX_BATCH_SIZE]
+            try:
+                await _send_with_retries(self._client, [event for event, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._client.close()
+
+
+_credential = None
+_publishers: Dict[str, TopicPublisher] = {}
+
+
+async def _get_publisher(topic_endpoint: str) -> TopicPublisher:
+    global _credential
+    if _credential is None:
+        credential = await credentials.get_credential_async()
+        if _credential is None:
+            _credential = credential
+        else:
+            # another coroutine created the shared credential while we were awaiting
+            await credential.close()
+
+    publisher = _publishers.get(topic_endpoint)
+    if publisher is None:
+        publisher = TopicPublisher(topic_endpoint, _credential, config.EVENT_GRID_PUBLISH_BATCH_WINDOW_MS / 1000)
+        _publishers[topic_endpoint] = publisher
+    return publisher
+
+
+async def publish_event(event: EventGridEvent, topic_endpoint: str) -> None:
+    publisher = await _get_publisher(topic_endpoint)
+    await publisher.publish(event)
+
+
+async def close_publishers() -> None:
+    """
+    Closes the cached publisher clients and their credential. Clients are recreated on the next publish.
+    """
+    global _credential
+    publishers = list(_publishers.values())
+    _publishers.clear()
+    for publisher in publishers:
+        try:
+            await publisher.close()
+        except Exception:
+            logger.exception("Error closing Event Grid publisher client")
+
+    if _credential is not None:
+        credential, _credential = _credential, None
+        await credential.close()
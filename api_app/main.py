@@ -15,11 +15,26 @@ from api.routes.api import router as api_router
 from api.errors.http_error import http_error_handler
 from api.errors.validation_error import http422_error_handler
 from api.errors.generic_error import generic_error_handler
+from api.errors.continuation_error import invalid_continuation_token_error_handler
 from core import config
+from db.errors import InvalidContinuationToken
 from db.events import bootstrap_database
+from db.repositories.registry import RepositoryRegistry
+from db.repositories.airlock_requests import AirlockRequestRepository
+from db.repositories.operations import OperationRepository
+from db.repositories.resource_templates import ResourceTemplateRepository
+from db.repositories.resources import ResourceRepository
+from db.repositories.resources_history import ResourceHistoryRepository
+from db.repositories.shared_services import SharedServiceRepository
+from db.repositories.user_resources import UserResourceRepository
+from db.repositories.workspace_services import WorkspaceServiceRepository
+from db.repositories.workspaces import WorkspaceRepository
 from services.logging import initialize_logging, logger
 from service_bus.deployment_status_updater import DeploymentStatusUpdater
 from service_bus.airlock_request_status_update import AirlockStatusUpdater
+from service_bus.sender_pool import get_sender_pool, close_sender_pool
+from event_grid.helpers import close_publishers
+from services.graph_client import close_graph_client
 
 
 @asynccontextmanager
@@ -28,16 +43,40 @@ async def lifespan(app: FastAPI):
         await asyncio.sleep(5)
         logger.warning("Database connection could not be established")
 
+    # repositories are created once and shared by all requests
+    await RepositoryRegistry.initialize([
+        AirlockRequestRepository,
+        OperationRepository,
+        ResourceTemplateRepository,
+        ResourceRepository,
+        ResourceHistoryRepository,
+        SharedServiceRepository,
+        UserResourceRepository,
+        WorkspaceServiceRepository,
+        WorkspaceRepository
+    ])
+
+    # a single pooled sender is shared by everything that writes to Service Bus queues
+    get_sender_pool()
+
     deploymentStatusUpdater = DeploymentStatusUpdater()
     await deploymentStatusUpdater.init_repos()
 
     airlockStatusUpdater = AirlockStatusUpdater()
     await airlockStatusUpdater.init_repos()
 
+    # other replicas may register templates, keep the in-process template cache in sync with the templates container
+    template_repo = await RepositoryRegistry.get(ResourceTemplateRepository)
+    asyncio.create_task(template_repo.watch_template_changes())
+
     asyncio.create_task(deploymentStatusUpdater.receive_messages())
     asyncio.create_task(airlockStatusUpdater.receive_messages())
     yield
 
+    await close_sender_pool()
+    await close_publishers()
+    await close_graph_client()
+
 
 def get_application() -> FastAPI:
     application = FastAPI(
@@ -64,6 +103,7 @@ def get_application() -> FastAPI:
 
     application.add_exception_handler(HTTPException, http_error_handler)
     application.add_exception_handler(RequestValidationError, http422_error_handler)
+    application.add_exception_handler(InvalidContinuationToken, invalid_continuation_token_error_handler)
 
     application.include_router(api_router)
     return application
@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import Optional, Union, List
+from typing import ClassVar, Optional, Union, List
 from pydantic import BaseModel, Field, validator
 from models.domain.azuretremodel import AzureTREModel
 from models.domain.request_action import RequestAction
@@ -30,6 +30,23 @@ class ResourceHistoryItem(AzureTREModel):
     templateVersion: Optional[str] = Field(title="Resource template version", description="The version of the resource template (bundle) to deploy")
 
 
+class ResourceView(AzureTREModel):
+    """
+    Lightweight view of a resource document, for scans that only read a few of its fields.
+    Queries for a view only return the view's fields and the projected_properties of the properties bag.
+    """
+    projected_properties: ClassVar[List[str]] = []
+
+    id: str = Field(title="Id", description="GUID identifying the resource request")
+    properties: dict = Field({}, title="Projected resource template parameters")
+
+    @classmethod
+    def projection(cls) -> str:
+        fields = [f"c.{field.alias}" for name, field in cls.__fields__.items() if name != "properties"]
+        properties = ", ".join(f'"{name}": c.properties["{name}"]' for name in cls.projected_properties)
+        return ", ".join(fields + [f"{{{properties}}} AS properties"])
+
+
 class AvailableUpgrade(BaseModel):
     version: str
     forceUpdateRequired: bool
@@ -1,7 +1,7 @@
 from enum import Enum
 from pydantic import Field
 from models.domain.azuretremodel import AzureTREModel
-from models.domain.resource import Resource, ResourceType
+from models.domain.resource import Resource, ResourceType, ResourceView
 
 
 class WorkspaceRole(Enum):
@@ -19,5 +19,27 @@ class Workspace(Resource):
     resourceType: ResourceType = ResourceType.Workspace
 
 
+class WorkspaceSummary(ResourceView):
+    """
+    Workspace fields needed to name a workspace and find its subscription
+    """
+    templateName: str = Field(title="Resource template name", description="The resource template (bundle) to deploy")
+    projected_properties = ["display_name", "workspace_subscription_id"]
+
+
+class WorkspaceNetworkView(ResourceView):
+    """
+    Workspace fields needed to allocate address spaces
+    """
+    projected_properties = ["address_space", "address_spaces"]
+
+
+class WorkspaceAuthView(ResourceView):
+    """
+    Workspace fields needed to check a user's workspace roles
+    """
+    projected_properties = ["sp_id", "client_id", "scope_id", "app_role_id_workspace_owner", "app_role_id_workspace_researcher", "app_role_id_workspace_airlock_manager"]
+
+
 class WorkspaceAuth(AzureTREModel):
     scopeId: str = Field("", title="Scope ID", description="The Workspace App Scope Id to use for auth")
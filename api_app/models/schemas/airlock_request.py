@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from models.domain.operation import Operation
 from models.schemas.operation import get_sample_operation
@@ -78,6 +78,7 @@ class AirlockRequestWithAllowedUserActions(BaseModel):
 
 class AirlockRequestWithAllowedUserActionsInList(BaseModel):
     airlockRequests: List[AirlockRequestWithAllowedUserActions] = Field([], title="Airlock Requests")
+    continuation: Optional[str] = Field(None, title="Continuation token", description="Token to pass as the continuation parameter to get the next page, not set on the last page")
 
     class Config:
         schema_extra = {
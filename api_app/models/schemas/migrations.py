@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -13,3 +13,17 @@ class Migration(BaseModel):
 
 class MigrationOutList(BaseModel):
     migrations: List[Migration]
+
+
+class IndexTransformationProgress(BaseModel):
+    """
+    Progress of the background index transformation of a container, 100 once its indexing policy is fully applied
+    """
+    container: str
+    progress: Optional[int]
+    indexingMode: Optional[str]
+    compositeIndexes: int = 0
+
+
+class IndexTransformationProgressList(BaseModel):
+    containers: List[IndexTransformationProgress]
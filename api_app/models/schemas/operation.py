@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from models.domain.operation import Operation
 
@@ -43,6 +43,7 @@ class OperationInResponse(BaseModel):
 
 class OperationInList(BaseModel):
     operations: List[Operation] = Field([], title="Operations")
+    continuation: Optional[str] = Field(None, title="Continuation token", description="Token to pass as the continuation parameter to get the next page, not set on the last page")
 
     class Config:
         schema_extra = {
@@ -43,6 +43,7 @@ def get_sample_resource_history(resource_id: str) -> dict:
 
 class ResourceHistoryInList(BaseModel):
     resource_history: List[ResourceHistoryItem] = Field([], title="Resource history")
+    continuation: Optional[str] = Field(None, title="Continuation token", description="Token to pass as the continuation parameter to get the next page, not set on the last page")
 
     class Config:
         schema_extra = {
@@ -1,5 +1,5 @@
 from enum import StrEnum
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -59,6 +59,7 @@ class WorkspaceAuthInResponse(BaseModel):
 
 class WorkspacesInList(BaseModel):
     workspaces: List[Workspace]
+    continuation: Optional[str] = Field(None, title="Continuation token", description="Token to pass as the continuation parameter to get the next page, not set on the last page")
 
     class Config:
         schema_extra = {
@@ -5,6 +5,7 @@ API_GET_HEALTH_STATUS = "Get health status"
 API_GET_PING = "Simple endpoint to test calling the API"
 API_GET_METADATA = "Get public API metadata (e.g. to support the UI and CLI)"
 API_MIGRATE_DATABASE = "Migrate documents in the database"
+API_GET_INDEX_TRANSFORMATION_PROGRESS = "Get the index transformation progress of the database containers"
 
 API_GET_MY_OPERATIONS = "Get Operations that the current user has initiated"
 API_GET_ALL_WORKSPACES = "Get all workspaces"
@@ -129,6 +130,7 @@ INVALID_TOKEN = "Invalid token"
 
 UNABLE_TO_REPLACE_CURRENT_TEMPLATE = "Unable to replace the existing 'current' template with this name"
 UNABLE_TO_PROCESS_REQUEST = "Unable to process request"
+INVALID_CONTINUATION_TOKEN = "The continuation token is malformed or has expired, request the list again without it"
 
 USER_RESOURCE_DOES_NOT_EXIST = "User Resource does not exist"
 USER_RESOURCES_NEED_TO_BE_DELETED_BEFORE_WORKSPACE = "All user resources need to be deleted before you can delete the workspace service"
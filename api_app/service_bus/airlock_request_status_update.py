@@ -1,14 +1,17 @@
 import asyncio
 import json
 import time
+from collections import defaultdict
+from typing import Dict, Optional
 
 from azure.servicebus.aio import ServiceBusClient, AutoLockRenewer
 from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusConnectionError
 from fastapi import HTTPException
 from pydantic import ValidationError, parse_obj_as
 
-from api.dependencies.airlock import get_airlock_request_by_id_from_path
+from api.dependencies.airlock import get_airlock_request_by_id
 from services.airlock import update_and_publish_event_airlock_request
+from service_bus.metrics import record_message_lag, record_message_processing_duration
 from services.logging import logger, tracer
 from db.repositories.workspaces import WorkspaceRepository
 from models.domain.airlock_request import AirlockRequestStatus
@@ -18,47 +21,44 @@ from core import config, credentials
 from resources import strings
 
 
+def get_airlock_request_id(msg) -> Optional[str]:
+    try:
+        return json.loads(str(msg))["data"]["request_id"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+def next_idle_wait(idle_wait: float) -> float:
+    # wait exponentially longer for messages while the queue is idle, up to the configured maximum
+    return min(max(idle_wait * 2, 1), config.AIRLOCK_STEP_RESULT_MAX_IDLE_WAIT)
+
+
 class AirlockStatusUpdater():
 
     def __init__(self):
-        pass
+        # sequence number of the step result of each airlock request abandoned in the last batch
+        self._abandoned_sequence_numbers: Dict[str, int] = {}
 
     async def init_repos(self):
         self.airlock_request_repo = await AirlockRequestRepository.create()
         self.workspace_repo = await WorkspaceRepository.create()
 
     async def receive_messages(self):
-        with tracer.start_as_current_span("airlock_receive_messages"):
-            last_heartbeat_time = 0
-            polling_count = 0
+        """
+        Continuously drains the step result queue with one long-lived Service Bus client and a prefetching receiver.
+        The client is only rebuilt if it fails.
 
+        At most a batch of step results is prefetched, so the prefetched ones are all in the next batch. Their locks
+        aren't renewed until then, so processing a batch has to take less than the queue's lock duration.
+        """
+        with tracer.start_as_current_span("airlock_receive_messages"):
             while True:
                 try:
-                    current_time = time.time()
-                    polling_count += 1
-                    # Log a heartbeat message every 60 seconds to show the service is still working
-                    if current_time - last_heartbeat_time >= 60:
-                        logger.info(f"Queue reader heartbeat: Polled {config.SERVICE_BUS_STEP_RESULT_QUEUE} queue {polling_count} times in the last minute")
-                        last_heartbeat_time = current_time
-                        polling_count = 0
-
                     async with credentials.get_credential_async_context() as credential:
-                        service_bus_client = ServiceBusClient(config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE, credential)
-                        receiver = service_bus_client.get_queue_receiver(queue_name=config.SERVICE_BUS_STEP_RESULT_QUEUE)
-                        logger.debug(f"Looking for new messages on {config.SERVICE_BUS_STEP_RESULT_QUEUE} queue...")
-                        async with receiver:
-                            received_msgs = await receiver.receive_messages(max_message_count=10, max_wait_time=1)
-                            for msg in received_msgs:
-                                async with AutoLockRenewer() as renewer:
-                                    renewer.register(receiver, msg, max_lock_renewal_duration=60)
-                                    complete_message = await self.process_message(msg)
-                                    if complete_message:
-                                        await receiver.complete_message(msg)
-                                    else:
-                                        # could have been any kind of transient issue, we'll abandon back to the queue, and retry
-                                        await receiver.abandon_message(msg)
-
-                        await asyncio.sleep(10)
+                        async with ServiceBusClient(config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE, credential) as service_bus_client:
+                            receiver = service_bus_client.get_queue_receiver(queue_name=config.SERVICE_BUS_STEP_RESULT_QUEUE, prefetch_count=min(config.AIRLOCK_STEP_RESULT_PREFETCH_COUNT, config.AIRLOCK_STEP_RESULT_BATCH_SIZE))
+                            async with receiver:
+                                await self.drain_queue(receiver)
 
                 except OperationTimeoutError:
                     # Timeout occurred whilst connecting to a session - this is expected and indicates no non-empty sessions are available
@@ -71,6 +71,76 @@ class AirlockStatusUpdater():
                 except Exception as e:
                     # Catch all other exceptions, log them via .exception to get the stack trace, and reconnect
                     logger.exception(f"Unknown exception. Will retry - {e}")
+                    await asyncio.sleep(1)
+
+    async def drain_queue(self, receiver):
+        last_heartbeat_time = 0
+        polling_count = 0
+        idle_wait = 1
+
+        while True:
+            current_time = time.time()
+            polling_count += 1
+            # Log a heartbeat message every 60 seconds to show the service is still working
+            if current_time - last_heartbeat_time >= 60:
+                logger.info(f"Queue reader heartbeat: Polled {config.SERVICE_BUS_STEP_RESULT_QUEUE} queue {polling_count} times in the last minute")
+                last_heartbeat_time = current_time
+                polling_count = 0
+
+            logger.debug(f"Looking for new messages on {config.SERVICE_BUS_STEP_RESULT_QUEUE} queue...")
+            # long poll: an idle queue is polled less often, but a message arriving during the wait is received straight away
+            received_msgs = await receiver.receive_messages(max_message_count=config.AIRLOCK_STEP_RESULT_BATCH_SIZE, max_wait_time=idle_wait)
+            if received_msgs:
+                idle_wait = 1
+                await self.process_messages(receiver, received_msgs)
+            else:
+                idle_wait = next_idle_wait(idle_wait)
+
+    async def process_messages(self, receiver, msgs):
+        """
+        Processes a batch of step results concurrently across airlock requests. The step results of an airlock request
+        are processed in the order they were received, and once one of them fails the later ones are abandoned so
+        they are retried after it. Later step results that were already prefetched when one was abandoned are in the
+        next batch, they are abandoned too unless the failed step result has been received again.
+        """
+        msgs_by_request = defaultdict(list)
+        for msg in msgs:
+            # messages that can't be parsed don't belong to a request, process them on their own
+            msgs_by_request[get_airlock_request_id(msg) or id(msg)].append(msg)
+
+        abandoned_sequence_numbers, self._abandoned_sequence_numbers = self._abandoned_sequence_numbers, {}
+        async with AutoLockRenewer() as renewer:
+            for msg in msgs:
+                renewer.register(receiver, msg, max_lock_renewal_duration=60)
+            results = await asyncio.gather(*[
+                self.process_request_messages(receiver, request_id, request_msgs, abandoned_sequence_numbers.get(request_id))
+                for request_id, request_msgs in msgs_by_request.items()
+            ], return_exceptions=True)
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed settling step result messages - {result}")
+
+    async def process_request_messages(self, receiver, request_id, msgs, abandoned_sequence_number: Optional[int] = None):
+        if abandoned_sequence_number is not None and msgs[0].sequence_number > abandoned_sequence_number:
+            # the request's abandoned step result hasn't been received again yet, these have to wait for it
+            for msg in msgs:
+                await receiver.abandon_message(msg)
+            return
+
+        for index, msg in enumerate(msgs):
+            record_message_lag(msg, config.SERVICE_BUS_STEP_RESULT_QUEUE)
+            start_time = time.perf_counter()
+            complete_message = await self.process_message(msg)
+            record_message_processing_duration((time.perf_counter() - start_time) * 1000, config.SERVICE_BUS_STEP_RESULT_QUEUE)
+            if complete_message:
+                await receiver.complete_message(msg)
+            else:
+                # could have been any kind of transient issue, we'll abandon back to the queue, and retry
+                self._abandoned_sequence_numbers[request_id] = msg.sequence_number
+                for abandoned_msg in msgs[index:]:
+                    await receiver.abandon_message(abandoned_msg)
+                return
 
     async def process_message(self, msg):
         with tracer.start_as_current_span("process_message") as current_span:
@@ -108,7 +178,7 @@ class AirlockStatusUpdater():
             status_message = step_result_data.status_message
             request_files = step_result_data.request_files
             # Find the airlock request by id
-            airlock_request = await get_airlock_request_by_id_from_path(airlock_request_id=airlock_request_id, airlock_request_repo=self.airlock_request_repo)
+            airlock_request = await get_airlock_request_by_id(airlock_request_id, self.airlock_request_repo)
             # Validate that the airlock request status is the same as current status
             if airlock_request.status == current_status:
                 workspace = await self.workspace_repo.get_workspace_by_id(airlock_request.workspaceId)
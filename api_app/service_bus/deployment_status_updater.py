@@ -1,7 +1,7 @@
 import asyncio
 import json
-import uuid
 import time
+from typing import List
 
 from pydantic import ValidationError, parse_obj_as
 
@@ -16,10 +16,13 @@ from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusConnect
 from azure.servicebus.aio import ServiceBusClient, AutoLockRenewer
 from db.repositories.operations import OperationRepository
 from core import config, credentials
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from db.errors import EntityDoesNotExist
 from db.repositories.resources import ResourceRepository
+from db.unit_of_work import UnitOfWork
 from models.domain.operation import DeploymentStatusUpdateMessage, Operation, OperationStep, Status
 from resources import strings
+from service_bus.metrics import record_message_lag, record_message_processing_duration
 from services.logging import logger, tracer
 
 
@@ -37,49 +40,75 @@ class DeploymentStatusUpdater():
         asyncio.run(self.receive_messages())
 
     async def receive_messages(self):
+        """
+        Receives deployment status updates with a pool of concurrent session receivers sharing one long-lived Service
+        Bus client. Each receiver locks a session and processes its messages in order, so the updates of a resource
+        are still applied in order while different sessions are processed concurrently. The number of receivers
+        bounds the number of messages in flight.
+        """
         with tracer.start_as_current_span("deployment_status_receive_messages"):
-            last_heartbeat_time = 0
-            polling_count = 0
-
             while True:
                 try:
-                    current_time = time.time()
-                    polling_count += 1
-                    # Log a heartbeat message every 60 seconds to show the service is still working
-                    if current_time - last_heartbeat_time >= 60:
-                        logger.info(f"Queue reader heartbeat: Polled {config.SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE} queue {polling_count} times in the last minute")
-                        last_heartbeat_time = current_time
-                        polling_count = 0
-
                     async with credentials.get_credential_async_context() as credential:
-                        service_bus_client = ServiceBusClient(config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE, credential)
-
-                        logger.debug(f"Looking for new messages on {config.SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE} queue...")
-                        # max_wait_time=1 -> don't hold the session open after processing of the message has finished
-                        async with service_bus_client.get_queue_receiver(queue_name=config.SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE, max_wait_time=1, session_id=NEXT_AVAILABLE_SESSION) as receiver:
-                            logger.info(f"Got a session containing messages: {receiver.session.session_id}")
-                            async with AutoLockRenewer() as renewer:
-                                renewer.register(receiver, receiver.session, max_lock_renewal_duration=60)
-                                async for msg in receiver:
-                                    complete_message = await self.process_message(msg)
-                                    if complete_message:
-                                        await receiver.complete_message(msg)
-                                    else:
-                                        # could have been any kind of transient issue, we'll abandon back to the queue, and retry
-                                        await receiver.abandon_message(msg)
-                            logger.info(f"Closing session: {receiver.session.session_id}")
-
-                except OperationTimeoutError:
-                    # Timeout occurred whilst connecting to a session - this is expected and indicates no non-empty sessions are available
-                    logger.debug("No sessions for this process. Will look again...")
-
-                except ServiceBusConnectionError:
+                        async with ServiceBusClient(config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE, credential) as service_bus_client:
+                            # a receiver failing cancels the others, so the client is rebuilt for all of them
+                            async with asyncio.TaskGroup() as receivers:
+                                for receiver_number in range(config.DEPLOYMENT_STATUS_UPDATE_SESSION_RECEIVERS):
+                                    receivers.create_task(self.receive_sessions(service_bus_client, receiver_number))
+
+                except* ServiceBusConnectionError:
                     # Occasionally there will be a transient / network-level error in connecting to SB.
-                    logger.info("Unknown Service Bus connection error. Will retry...")
+                    logger.info("Unknown Service Bus connection error. Will reconnect...")
 
-                except Exception as e:
+                except* Exception as e:
                     # Catch all other exceptions, log them via .exception to get the stack trace, and reconnect
-                    logger.exception(f"Unknown exception. Will retry - {e}")
+                    logger.exception(f"Unknown exception. Will reconnect - {e}")
+
+                await asyncio.sleep(1)
+
+    async def receive_sessions(self, service_bus_client: ServiceBusClient, receiver_number: int):
+        """
+        Processes the next available session, over and over. Connection-level and unknown errors are raised, so
+        receive_messages reconnects.
+        """
+        last_heartbeat_time = 0
+        polling_count = 0
+
+        while True:
+            try:
+                current_time = time.time()
+                polling_count += 1
+                # Log a heartbeat message every 60 seconds to show the service is still working
+                if current_time - last_heartbeat_time >= 60:
+                    logger.info(f"Queue reader heartbeat: Receiver {receiver_number} polled {config.SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE} queue {polling_count} times in the last minute")
+                    last_heartbeat_time = current_time
+                    polling_count = 0
+
+                await self.receive_session(service_bus_client)
+
+            except OperationTimeoutError:
+                # Timeout occurred whilst connecting to a session - this is expected and indicates no non-empty sessions are available
+                logger.debug("No sessions for this process. Will look again...")
+
+    async def receive_session(self, service_bus_client: ServiceBusClient):
+        queue = config.SERVICE_BUS_DEPLOYMENT_STATUS_UPDATE_QUEUE
+        logger.debug(f"Looking for new messages on {queue} queue...")
+        # max_wait_time=1 -> don't hold the session open after processing of the message has finished
+        async with service_bus_client.get_queue_receiver(queue_name=queue, max_wait_time=1, session_id=NEXT_AVAILABLE_SESSION) as receiver:
+            logger.info(f"Got a session containing messages: {receiver.session.session_id}")
+            async with AutoLockRenewer() as renewer:
+                renewer.register(receiver, receiver.session, max_lock_renewal_duration=60)
+                async for msg in receiver:
+                    record_message_lag(msg, queue)
+                    start_time = time.perf_counter()
+                    complete_message = await self.process_message(msg)
+                    record_message_processing_duration((time.perf_counter() - start_time) * 1000, queue)
+                    if complete_message:
+                        await receiver.complete_message(msg)
+                    else:
+                        # could have been any kind of transient issue, we'll abandon back to the queue, and retry
+                        await receiver.abandon_message(msg)
+            logger.info(f"Closing session: {receiver.session.session_id}")
 
     async def process_message(self, msg):
         complete_message = False
@@ -138,25 +167,17 @@ class DeploymentStatusUpdater():
             # update the overall headline operation status
             await self.update_overall_operation_status(operation, step_to_update, is_last_step)
 
-            # save the operation
-            await self.operations_repo.update_item(operation)
+            # save the operation, and copy the step status (and outputs) to the resource item for convenience. The
+            # resource is updated with a partial document update, so it doesn't need to be read first and writes
+            # to its other fields made in the meantime aren't lost
+            unit_of_work = UnitOfWork()
+            unit_of_work.upsert(self.operations_repo, operation)
+            unit_of_work.patch(self.resource_repo, step_to_update.resourceId, self.create_resource_patch_operations(step_to_update, message))
+            await unit_of_work.commit()
 
-            # copy the step status to the resource item, for convenience
-            resource_id = uuid.UUID(step_to_update.resourceId)
-
-            resource = await self.resource_repo.get_resource_by_id(resource_id)
-            resource.deploymentStatus = step_to_update.status
-            await self.resource_repo.update_item(resource)
-
-            # if the step failed, or this queue message is an intermediary ("now deploying..."), return here.
             if not step_to_update.is_success():
                 return True
 
-            # update the resource doc to persist any outputs
-            resource = await self.resource_repo.get_resource_dict_by_id(resource_id)
-            resource_to_persist = self.create_updated_resource_document(resource, message)
-            await self.resource_repo.update_item_dict(resource_to_persist)
-
             # more steps in the op to do?
             if is_last_step is False:
                 assert current_step_index < (len(operation.steps) - 1)
@@ -190,7 +211,7 @@ class DeploymentStatusUpdater():
 
             result = True
 
-        except EntityDoesNotExist:
+        except (EntityDoesNotExist, CosmosResourceNotFoundError):
             # Marking as true as this message will never succeed anyways and should be removed from the queue.
             result = True
             logger.exception(strings.DEPLOYMENT_STATUS_ID_NOT_FOUND.format(message.id))
@@ -223,9 +244,7 @@ class DeploymentStatusUpdater():
                     break
 
             if main_step:
-                primary_resource = await self.resource_repo.get_resource_by_id(uuid.UUID(main_step.resourceId))
-                primary_resource.deploymentStatus = operation.status
-                await self.resource_repo.update_item(primary_resource)
+                await self.resource_repo.patch_item(main_step.resourceId, [{"op": "set", "path": "/deploymentStatus", "value": operation.status}])
 
         if step.is_success() and is_last_step:
             operation.status = self.get_success_status_for_action(operation.action)
@@ -255,18 +274,23 @@ class DeploymentStatusUpdater():
 
         return status
 
-    def create_updated_resource_document(self, resource: dict, message: DeploymentStatusUpdateMessage):
+    def create_resource_patch_operations(self, step: OperationStep, message: DeploymentStatusUpdateMessage) -> List[dict]:
         """
-        Merge the outputs with the resource document to persist
+        Patch operations setting the status of the step on the resource, and merging any outputs into its properties
         """
+        patch_operations = [{"op": "set", "path": "/deploymentStatus", "value": step.status}]
 
+        # if the step failed, or this queue message is an intermediary ("now deploying..."), only the status is set.
         # although outputs are likely to be relevant when resources are moving to "deployed" status,
         # lets not limit when we update them and have the resource process make that decision.
         # need to convert porter outputs to dict so boolean values are converted to bools, not strings
-        output_dict = self.convert_outputs_to_dict(message.outputs)
-        resource["properties"].update(output_dict)
+        if step.is_success():
+            for name, value in self.convert_outputs_to_dict(message.outputs).items():
+                # output names are a single segment of the JSON pointer path
+                path_segment = name.replace("~", "~0").replace("/", "~1")
+                patch_operations.append({"op": "set", "path": f"/properties/{path_segment}", "value": value})
 
-        return resource
+        return patch_operations
 
     def convert_outputs_to_dict(self, outputs_list: [Output]):
         """
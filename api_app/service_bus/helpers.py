@@ -1,5 +1,4 @@
 from azure.servicebus import ServiceBusMessage
-from azure.servicebus.aio import ServiceBusClient
 from pydantic import parse_obj_as
 from resources import strings
 from db.repositories.resources_history import ResourceHistoryRepository
@@ -11,28 +10,22 @@ from db.repositories.resource_templates import ResourceTemplateRepository
 from models.domain.authentication import User
 from models.schemas.resource import ResourcePatch
 from db.repositories.resources import ResourceRepository
-from core import config, credentials
+from core import config
+from service_bus.sender_pool import get_sender_pool
 from services.logging import logger
 from azure.cosmos.exceptions import CosmosAccessConditionFailedError
 
 
 async def _send_message(message: ServiceBusMessage, queue: str):
     """
-    Sends the given message to the given queue in the Service Bus.
+    Sends the given message to the given queue in the Service Bus, using the process-wide sender pool.
 
     :param message: The message to send.
     :type message: ServiceBusMessage
     :param queue: The Service Bus queue to send the message to.
     :type queue: str
     """
-    async with credentials.get_credential_async_context() as credential:
-        service_bus_client = ServiceBusClient(config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE, credential)
-
-        async with service_bus_client:
-            sender = service_bus_client.get_queue_sender(queue_name=queue)
-
-            async with sender:
-                await sender.send_messages(message)
+    await get_sender_pool().send(message, queue)
 
 
 async def send_deployment_message(content, correlation_id, session_id, action):
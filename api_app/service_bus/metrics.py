@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from services.logging import meter
+
+message_lag_histogram = meter.create_histogram(
+    name="service_bus_message_lag",
+    unit="ms",
+    description="Time a message waited in a Service Bus queue before it was received"
+)
+message_processing_duration_histogram = meter.create_histogram(
+    name="service_bus_message_processing_duration",
+    unit="ms",
+    description="Time taken to process a message received from a Service Bus queue"
+)
+
+
+def record_message_lag(msg, queue: str):
+    enqueued_time = getattr(msg, "enqueued_time_utc", None)
+    if isinstance(enqueued_time, datetime):
+        lag_ms = (datetime.now(timezone.utc) - enqueued_time).total_seconds() * 1000
+        message_lag_histogram.record(max(lag_ms, 0), {"queue": queue})
+
+
+def record_message_processing_duration(duration_ms: float, queue: str):
+    message_processing_duration_histogram.record(duration_ms, {"queue": queue})
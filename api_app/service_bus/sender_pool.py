@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.aio import ServiceBusClient, ServiceBusSender
+from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusCommunicationError, ServiceBusConnectionError
+
+from core import config, credentials
+from services.logging import logger, meter
+
+
+send_duration_histogram = meter.create_histogram(
+    name="service_bus_send_duration",
+    unit="ms",
+    description="Time taken to send a message to a Service Bus queue"
+)
+
+_RECONNECT_ERRORS = (ServiceBusConnectionError, ServiceBusCommunicationError, OperationTimeoutError)
+
+
+class ServiceBusSenderPool():
+    """
+    Keeps a single long-lived Service Bus client and one sender per queue, so sending a message
+    does not pay for a new AMQP connection and CBS authentication every time.
+
+    Senders are not coroutine-safe, so sends to the same queue are serialised with a per-queue lock.
+    If a send fails because the connection dropped, the client is rebuilt and the send retried once.
+    """
+
+    def __init__(self, fully_qualified_namespace: Optional[str] = None):
+        self._fully_qualified_namespace = fully_qualified_namespace or config.SERVICE_BUS_FULLY_QUALIFIED_NAMESPACE
+        self._credential = None
+        self._client: Optional[ServiceBusClient] = None
+        self._senders: Dict[str, ServiceBusSender] = {}
+        self._queue_locks: Dict[str, asyncio.Lock] = {}
+        self._client_lock = asyncio.Lock()
+
+    async def _get_client(self) -> ServiceBusClient:
+        if self._client is None:
+            logger.debug(f"Opening Service Bus client for {self._fully_qualified_namespace}")
+            self._credential = await credentials.get_credential_async()
+            self._client = ServiceBusClient(self._fully_qualified_namespace, self._credential)
+        return self._client
+
+    async def _get_sender(self, queue: str) -> ServiceBusSender:
+        async with self._client_lock:
+            sender = self._senders.get(queue)
+            if sender is None:
+                client = await self._get_client()
+                sender = client.get_queue_sender(queue_name=queue)
+                self._senders[queue] = sender
+            return sender
+
+    def _get_queue_lock(self, queue: str) -> asyncio.Lock:
+        if queue not in self._queue_locks:
+            self._queue_locks[queue] = asyncio.Lock()
+        return self._queue_locks[queue]
+
+    async def send(self, message: ServiceBusMessage, queue: str):
+        """
+        Sends the given message to the given queue, reusing the pooled sender for that queue.
+
+        :param message: The message to send.
+        :type message: ServiceBusMessage
+        :param queue: The Service Bus queue to send the message to.
+        :type queue: str
+        """
+        start_time = time.perf_counter()
+        try:
+            async with self._get_queue_lock(queue):
+                sender = await self._get_sender(queue)
+                try:
+                    await sender.send_messages(message)
+                except _RECONNECT_ERRORS as e:
+                    logger.warning(f"Sending to {queue} queue failed, reconnecting to Service Bus and retrying - {e}")
+                    await self.close()
+                    sender = await self._get_sender(queue)
+                    await sender.send_messages(message)
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            send_duration_histogram.record(elapsed_ms, {"queue": queue})
+
+    async def close(self):
+        """
+        Closes all pooled senders, the client and the credential. The pool reconnects lazily on the next send.
+        """
+        async with self._client_lock:
+            senders, self._senders = self._senders, {}
+            client, self._client = self._client, None
+            credential, self._credential = self._credential, None
+
+            for queue, sender in senders.items():
+                try:
+                    await sender.close()
+                except Exception:
+                    logger.exception(f"Error closing Service Bus sender for {queue} queue")
+
+            if client is not None:
+                try:
+                    await client.close()
+                except Exception:
+                    logger.exception("Error closing Service Bus client")
+
+            if credential is not None:
+                await credential.close()
+
+
+_sender_pool: Optional[ServiceBusSenderPool] = None
+
+
+def get_sender_pool() -> ServiceBusSenderPool:
+    """
+    Returns the process-wide sender pool, creating it on first use.
+    """
+    global _sender_pool
+    if _sender_pool is None:
+        _sender_pool = ServiceBusSenderPool()
+    return _sender_pool
+
+
+async def close_sender_pool():
+    global _sender_pool
+    if _sender_pool is not None:
+        await _sender_pool.close()
+        _sender_pool = None
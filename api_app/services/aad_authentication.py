@@ -1,23 +1,48 @@
+import asyncio
+import copy
+import threading
 from collections import defaultdict
 from enum import Enum
-from typing import List
+from typing import List, Optional
 
-import requests
 from msal import ConfidentialClientApplication
 from semantic_version import Version
 
 from core import config
+from services.cache import TTLCache
 from models.domain.authentication import User, RoleAssignment
 from models.domain.workspace import Workspace, WorkspaceRole
 from models.domain.workspace_users import AssignableUser, AssignedUser, AssignmentType, Role
 from resources import strings
-from services.logging import logger
+from services.graph_client import get_graph_client
+from services.logging import logger, meter
 
 
 MICROSOFT_GRAPH_URL = config.MICROSOFT_GRAPH_URL.strip("/")
-GRAPH_REQUEST_TIMEOUT = 10
 USER_MANAGEMENT_MINIMUM_BASE_TEMPLATE_VERSION = "2.1.0"
 
+graph_token_acquisitions = meter.create_counter(
+    name="graph_token_acquisitions",
+    description="Microsoft Graph access tokens acquired, by whether they came from the token cache or Entra ID"
+)
+
+_msal_app: Optional[ConfidentialClientApplication] = None
+_msal_app_lock = threading.Lock()
+
+# role name -> user emails of a workspace, and the app role assignments of an identity
+workspace_role_emails = TTLCache("workspace_role_emails", config.GRAPH_ROLE_ASSIGNMENT_CACHE_MAX_SIZE, config.GRAPH_ROLE_ASSIGNMENT_CACHE_TTL_SECONDS)
+identity_role_assignments = TTLCache("identity_role_assignments", config.GRAPH_ROLE_ASSIGNMENT_CACHE_MAX_SIZE, config.GRAPH_ROLE_ASSIGNMENT_CACHE_TTL_SECONDS)
+
+
+def get_msal_app() -> ConfidentialClientApplication:
+    """
+    Returns the process-wide MSAL application, so every Graph call shares its in-memory token cache.
+    """
+    global _msal_app
+    if _msal_app is None:
+        _msal_app = ConfidentialClientApplication(client_id=config.API_CLIENT_ID, client_credential=config.API_CLIENT_SECRET, authority=f"{config.AAD_AUTHORITY_URL}/{config.AAD_TENANT_ID}")
+    return _msal_app
+
 
 class AuthConfigValidationError(Exception):
     """Raised when the input auth information is invalid."""
@@ -50,18 +75,19 @@ class AzureADAuthorization:
     @staticmethod
     def _get_msgraph_token() -> str:
         scopes = [f"{MICROSOFT_GRAPH_URL}/.default"]
-        app = ConfidentialClientApplication(client_id=config.API_CLIENT_ID, client_credential=config.API_CLIENT_SECRET, authority=f"{config.AAD_AUTHORITY_URL}/{config.AAD_TENANT_ID}")
-        try:
-            result = app.acquire_token_silent(scopes=scopes, account=None)
-        except Exception:
-            result = None
-        if not result:
-            logger.debug('No suitable token exists in cache, getting a new one from AAD')
-            result = app.acquire_token_for_client(scopes=scopes)
+        with _msal_app_lock:
+            # the token is served from the shared app's token cache, MSAL only asks Entra ID for a new one when the
+            # cached token is missing or close to expiring
+            result = get_msal_app().acquire_token_for_client(scopes=scopes)
         if "access_token" not in result:
             raise Exception(f"API app registration access token cannot be retrieved. {result.get('error')}: {result.get('error_description')}")
+        graph_token_acquisitions.add(1, {"source": result.get("token_source", "identity_provider")})
         return result["access_token"]
 
+    async def _acquire_msgraph_token(self) -> str:
+        # MSAL is synchronous, don't block the event loop while it talks to Entra ID
+        return await asyncio.to_thread(self._get_msgraph_token)
+
     @staticmethod
     def _get_auth_header(msgraph_token: str) -> dict:
         return {'Authorization': 'Bearer ' + msgraph_token}
@@ -86,33 +112,22 @@ class AzureADAuthorization:
     def _get_group_members_endpoint(group_object_id) -> str:
         return "/groups/" + group_object_id + "/transitiveMembers?$select=displayName,mail,id,userPrincipalName"
 
-    def _get_app_sp_graph_data(self, client_id: str) -> dict:
+    async def _get_app_sp_graph_data(self, client_id: str) -> dict:
         sp_endpoint = self._get_service_principal_endpoint(client_id)
-        graph_data = self._ms_graph_query(sp_endpoint, "GET")
+        graph_data = await self._ms_graph_query(sp_endpoint, "GET")
         return graph_data
 
-    def _get_user_role_assignments(self, client_id):
+    async def _get_user_role_assignments(self, client_id):
         sp_roles_endpoint = self._get_service_principal_assigned_roles_endpoint(client_id)
-        return self._ms_graph_query(sp_roles_endpoint, "GET")
+        return await self._ms_graph_query(sp_roles_endpoint, "GET")
 
-    def _get_user_details(self, roles_graph_data, msgraph_token):
+    async def _get_user_details(self, roles_graph_data, msgraph_token):
         batch_endpoint = self._get_batch_endpoint()
         batch_request_body = self._get_batch_users_by_role_assignments_body(roles_graph_data)
         headers = self._get_auth_header(msgraph_token)
         headers["Content-type"] = "application/json"
-        max_number_request = 20
-        requests_from_batch = batch_request_body["requests"]
-        # We split the original batch request body in sub-lits with at most max_number_request elements
-        batch_request_body_list = [requests_from_batch[i:i + max_number_request] for i in range(0, len(requests_from_batch), max_number_request)]
-        users_graph_data = {"responses": []}
-
-        # For each sub-list it's required to call the batch endpoint for retrieveing user/group information
-        for request_body_element in batch_request_body_list:
-            batch_request_body_tmp = {"requests": request_body_element}
-            users_graph_data_tmp = requests.post(batch_endpoint, json=batch_request_body_tmp, headers=headers, timeout=GRAPH_REQUEST_TIMEOUT).json()
-            users_graph_data["responses"] = users_graph_data["responses"] + users_graph_data_tmp["responses"]
-
-        return users_graph_data
+        # the graph client splits the user/group lookups in batches the batch endpoint accepts, and sends them concurrently
+        return await get_graph_client().batch(batch_endpoint, batch_request_body["requests"], headers=headers)
 
     def _get_roles_for_principal(self, user_id, roles_graph_data, app_id_to_role_name) -> List[Role]:
         roles = []
@@ -160,18 +175,26 @@ class AzureADAuthorization:
 
         return users
 
-    def get_workspace_users(self, workspace: Workspace) -> List[AssignedUser]:
-        msgraph_token = self._get_msgraph_token()
-        sp_graph_data = self._get_app_sp_graph_data(workspace.properties["client_id"])
+    async def get_workspace_users(self, workspace: Workspace) -> List[AssignedUser]:
+        msgraph_token, sp_graph_data, roles_graph_data = await asyncio.gather(
+            self._acquire_msgraph_token(),
+            self._get_app_sp_graph_data(workspace.properties["client_id"]),
+            self._get_user_role_assignments(workspace.properties["sp_id"]))
         app_id_to_role_name = {app_role["id"]: (app_role["value"]) for app_role in sp_graph_data["value"][0]["appRoles"]}
-        roles_graph_data = self._get_user_role_assignments(workspace.properties["sp_id"])
-        users_graph_data = self._get_user_details(roles_graph_data, msgraph_token)
+        users_graph_data = await self._get_user_details(roles_graph_data, msgraph_token)
         users_inc_groups = self._get_users_inc_groups_from_response(users_graph_data, roles_graph_data, app_id_to_role_name)
 
         return users_inc_groups
 
-    def get_workspace_user_emails_by_role_assignment(self, workspace: Workspace):
-        users = self.get_workspace_users(workspace)
+    async def get_workspace_user_emails_by_role_assignment(self, workspace: Workspace):
+        workspace_role_assignments_details = workspace_role_emails.get(workspace.id)
+        if workspace_role_assignments_details is None:
+            workspace_role_assignments_details = await self._get_workspace_user_emails_by_role_assignment(workspace)
+            workspace_role_emails.set(workspace.id, workspace_role_assignments_details)
+        return copy.deepcopy(workspace_role_assignments_details)
+
+    async def _get_workspace_user_emails_by_role_assignment(self, workspace: Workspace):
+        users = await self.get_workspace_users(workspace)
         workspace_role_assignments_details = {}
         for user in users:
             if user.email:
@@ -181,9 +204,9 @@ class AzureADAuthorization:
                     workspace_role_assignments_details[role.displayName].append(user.email)
         return workspace_role_assignments_details
 
-    def get_assignable_users(self, filter: str = "", maxResultCount: int = 5) -> List[AssignableUser]:
+    async def get_assignable_users(self, filter: str = "", maxResultCount: int = 5) -> List[AssignableUser]:
         users_endpoint = f"{MICROSOFT_GRAPH_URL}/v1.0/users?$filter=startswith(displayName,'{filter}')&$top={maxResultCount}"
-        graph_data = self._ms_graph_query(users_endpoint, "GET")
+        graph_data = await self._ms_graph_query(users_endpoint, "GET")
         result = []
 
         for user_data in graph_data["value"]:
@@ -193,9 +216,9 @@ class AzureADAuthorization:
 
         return result
 
-    def get_workspace_roles(self, workspace: Workspace) -> List[Role]:
+    async def get_workspace_roles(self, workspace: Workspace) -> List[Role]:
         app_roles_endpoint = f"{MICROSOFT_GRAPH_URL}/v1.0/servicePrincipals/{workspace.properties['sp_id']}/appRoles"
-        graph_data = self._ms_graph_query(app_roles_endpoint, "GET")
+        graph_data = await self._ms_graph_query(app_roles_endpoint, "GET")
 
         roles = []
 
@@ -210,9 +233,9 @@ class AzureADAuthorization:
 
         return roles
 
-    def assign_workspace_user(self, user_id: str, workspace: Workspace, role_id: str) -> None:
+    async def assign_workspace_user(self, user_id: str, workspace: Workspace, role_id: str) -> None:
         # User already has the role, do nothing
-        if self._is_user_in_role(user_id, role_id):
+        if await self._is_user_in_role(user_id, role_id):
             return
         if compare_versions(workspace.templateVersion, USER_MANAGEMENT_MINIMUM_BASE_TEMPLATE_VERSION) < 0:
             logger.error(f"Unable to assign user {user_id} to group with role {role_id}, Workspace needs to be version 2.2.0 or greater")
@@ -220,11 +243,12 @@ class AzureADAuthorization:
         if not self._is_workspace_role_group_in_use(workspace):
             logger.error(f"Unable to assign user {user_id} to group with role {role_id}, Entra ID groups are not in use on this workspace")
             raise UserRoleAssignmentError(f"Unable to assign user {user_id} to group with role {role_id}, Entra ID groups are not in use on this workspace")
-        return self._assign_workspace_user_to_application_group(user_id, workspace, role_id)
+        await self._assign_workspace_user_to_application_group(user_id, workspace, role_id)
+        self._invalidate_role_assignments(user_id, workspace)
 
-    def _is_user_in_role(self, user_id: str, role_id: str) -> bool:
+    async def _is_user_in_role(self, user_id: str, role_id: str) -> bool:
         user_app_role_query = f"{MICROSOFT_GRAPH_URL}/v1.0/users/{user_id}/appRoleAssignments"
-        user_app_roles = self._ms_graph_query(user_app_role_query, "GET")
+        user_app_roles = await self._ms_graph_query(user_app_role_query, "GET")
         return any(r for r in user_app_roles["value"] if r["appRoleId"] == role_id)
 
     def _is_workspace_role_group_in_use(self, workspace: Workspace) -> bool:
@@ -250,64 +274,70 @@ class AzureADAuthorization:
 
         return (f"{tre_id}-ws-{workspace_id} {group_name}", f"app_role_id_{app_role_id_suffix}")
 
-    def _assign_workspace_user_to_application_group(self, user_id: str, workspace: Workspace, role_id: str):
-        roles_graph_data = self._get_user_role_assignments(workspace.properties["sp_id"])
+    async def _assign_workspace_user_to_application_group(self, user_id: str, workspace: Workspace, role_id: str):
+        roles_graph_data = await self._get_user_role_assignments(workspace.properties["sp_id"])
         group_details = self._get_workspace_group_name(workspace, role_id)
         group_name = group_details[0]
         workspace_app_role_field = group_details[1]
 
         for group in [item for item in roles_graph_data["value"] if item["principalType"] == PrincipalType.Group.value]:
             if group.get("principalDisplayName") == group_name and group.get("appRoleId") == workspace.properties[workspace_app_role_field]:
-                self._add_user_to_group(user_id, group["principalId"])
+                await self._add_user_to_group(user_id, group["principalId"])
                 return
 
         raise UserRoleAssignmentError(f"Unable to assign user to group with role: {role_id}")
 
-    def _remove_workspace_user_from_application_group(self, user_id: str, workspace: Workspace, role_id: str):
-        roles_graph_data = self._get_user_role_assignments(workspace.properties["sp_id"])
+    async def _remove_workspace_user_from_application_group(self, user_id: str, workspace: Workspace, role_id: str):
+        roles_graph_data = await self._get_user_role_assignments(workspace.properties["sp_id"])
         group_details = self._get_workspace_group_name(workspace, role_id)
         group_name = group_details[0]
         workspace_app_role_field = group_details[1]
 
         for group in [item for item in roles_graph_data["value"] if item["principalType"] == PrincipalType.Group.value]:
             if group.get("principalDisplayName") == group_name and group.get("appRoleId") == workspace.properties[workspace_app_role_field]:
-                self._remove_user_from_group(user_id, group["principalId"])
+                await self._remove_user_from_group(user_id, group["principalId"])
                 return
         raise UserRoleAssignmentError(f"Unable to assign user to group with role: {role_id}")
 
-    def _add_user_to_group(self, user_id: str, group_id: str):
+    async def _add_user_to_group(self, user_id: str, group_id: str):
         url = f"{MICROSOFT_GRAPH_URL}/v1.0/groups/{group_id}/members/$ref"
         body = {
             "@odata.id": f"{MICROSOFT_GRAPH_URL}/v1.0/users/{user_id}"
         }
 
-        response = self._ms_graph_query(url, "POST", json=body)
+        response = await self._ms_graph_query(url, "POST", json=body)
         return response
 
-    def _remove_user_from_group(self, user_id: str, group_id: str):
+    async def _remove_user_from_group(self, user_id: str, group_id: str):
         url = f"{MICROSOFT_GRAPH_URL}/v1.0/groups/{group_id}/members/{user_id}/$ref"
 
-        response = self._ms_graph_query(url, "DELETE")
+        response = await self._ms_graph_query(url, "DELETE")
         return response
 
-    def _get_role_assignment_for_user(self, user_id: str, role_id: str) -> dict:
-        user_role_assignments = self._get_role_assignment_graph_data_for_user(user_id)
+    async def _get_role_assignment_for_user(self, user_id: str, role_id: str) -> dict:
+        user_role_assignments = await self._get_role_assignment_graph_data_for_user(user_id)
         for role in user_role_assignments["value"]:
             if role["appRoleId"] == role_id:
                 return role
 
-    def remove_workspace_role_user_assignment(self,
-                                              user_id: str,
-                                              role_id: str,
-                                              workspace: Workspace
-                                              ) -> None:
+    async def remove_workspace_role_user_assignment(self,
+                                                    user_id: str,
+                                                    role_id: str,
+                                                    workspace: Workspace
+                                                    ) -> None:
         if compare_versions(workspace.templateVersion, USER_MANAGEMENT_MINIMUM_BASE_TEMPLATE_VERSION) < 0:
             logger.error(f"Unable to remove user {user_id} from group with role {role_id}, Workspace needs to be version 2.2.0 or greater")
             raise UserRoleAssignmentError(f"Unable to remove user {user_id} from group with role {role_id}, Workspace needs to be version 2.2.0 or greater")
         if not self._is_workspace_role_group_in_use(workspace):
             logger.error(f"Unable to remove user {user_id} from group with role {role_id}, Entra ID groups are not in use on this workspace")
             raise UserRoleAssignmentError(f"Unable to remove user {user_id} from group with role {role_id}, Entra ID groups are not in use on this workspace")
-        return self._remove_workspace_user_from_application_group(user_id, workspace, role_id)
+        await self._remove_workspace_user_from_application_group(user_id, workspace, role_id)
+        self._invalidate_role_assignments(user_id, workspace)
+
+    @staticmethod
+    def _invalidate_role_assignments(user_id: str, workspace: Workspace):
+        workspace_role_emails.invalidate(workspace.id)
+        identity_role_assignments.invalidate(user_id)
 
     def _get_batch_users_by_role_assignments_body(self, roles_graph_data):
         request_body = {"requests": []}
@@ -332,8 +362,8 @@ class AzureADAuthorization:
     # This method is called when you create a workspace and you already have an AAD App Registration
     # to link it to. You pass in the client_id and go and get the extra information you need from AAD
     # If the auth_type is `Automatic`, then these values will be written by Terraform.
-    def _get_app_auth_info(self, client_id: str) -> dict:
-        graph_data = self._get_app_sp_graph_data(client_id)
+    async def _get_app_auth_info(self, client_id: str) -> dict:
+        graph_data = await self._get_app_sp_graph_data(client_id)
         if 'value' not in graph_data or len(graph_data['value']) == 0:
             logger.debug(graph_data)
             raise AuthConfigValidationError(f"{strings.ACCESS_UNABLE_TO_GET_INFO_FOR_APP} {client_id}")
@@ -348,18 +378,16 @@ class AzureADAuthorization:
 
         return authInfo
 
-    def _ms_graph_query(self, url: str, http_method: str, json=None) -> dict:
-        msgraph_token = self._get_msgraph_token()
+    async def _ms_graph_query(self, url: str, http_method: str, json=None) -> dict:
+        msgraph_token = await self._acquire_msgraph_token()
         auth_headers = self._get_auth_header(msgraph_token)
+        graph_client = get_graph_client()
         graph_data = {}
         while True:
             if not url:
                 break
             logger.debug(f"Making request to: {url}")
-            if json:
-                response = requests.request(method=http_method, url=url, json=json, headers=auth_headers, timeout=GRAPH_REQUEST_TIMEOUT)
-            else:
-                response = requests.request(method=http_method, url=url, headers=auth_headers, timeout=GRAPH_REQUEST_TIMEOUT)
+            response = await graph_client.request(http_method, url, headers=auth_headers, json=json or None)
             url = ""
             if response.status_code == 200:
                 json_response = response.json()
@@ -371,20 +399,20 @@ class AzureADAuthorization:
                 logger.error(f"Full response: {response}")
         return graph_data
 
-    def _get_role_assignment_graph_data_for_user(self, user_id: str) -> dict:
+    async def _get_role_assignment_graph_data_for_user(self, user_id: str) -> dict:
         user_endpoint = f"{MICROSOFT_GRAPH_URL}/v1.0/users/{user_id}/appRoleAssignments"
-        graph_data = self._ms_graph_query(user_endpoint, "GET")
+        graph_data = await self._ms_graph_query(user_endpoint, "GET")
         return graph_data
 
-    def _get_role_assignment_graph_data_for_service_principal(self, principal_id: str) -> dict:
+    async def _get_role_assignment_graph_data_for_service_principal(self, principal_id: str) -> dict:
         svc_principal_endpoint = f"{MICROSOFT_GRAPH_URL}/v1.0/servicePrincipals/{principal_id}/appRoleAssignments"
-        graph_data = self._ms_graph_query(svc_principal_endpoint, "GET")
+        graph_data = await self._ms_graph_query(svc_principal_endpoint, "GET")
         return graph_data
 
-    def _get_identity_type(self, id: str) -> str:
+    async def _get_identity_type(self, id: str) -> str:
         objects_endpoint = f"{MICROSOFT_GRAPH_URL}/v1.0/directoryObjects/getByIds"
         request_body = {"ids": [id], "types": ["user", "servicePrincipal"]}
-        graph_data = self._ms_graph_query(objects_endpoint, "POST", json=request_body)
+        graph_data = await self._ms_graph_query(objects_endpoint, "POST", json=request_body)
 
         logger.debug(graph_data)
 
@@ -399,7 +427,7 @@ class AzureADAuthorization:
 
         return object_info["@odata.type"]
 
-    def extract_workspace_auth_information(self, data: dict) -> dict:
+    async def extract_workspace_auth_information(self, data: dict) -> dict:
         if ("auth_type" not in data) or (data["auth_type"] != "Automatic" and "client_id" not in data):
             raise AuthConfigValidationError(strings.ACCESS_PLEASE_SUPPLY_CLIENT_ID)
 
@@ -407,7 +435,7 @@ class AzureADAuthorization:
         # The user may want us to create the AAD workspace app and therefore they
         # don't know the client_id yet.
         if data["auth_type"] != "Automatic":
-            auth_info = self._get_app_auth_info(data["client_id"])
+            auth_info = await self._get_app_auth_info(data["client_id"])
 
             # Check we've get all our required roles
             for role in self.WORKSPACE_ROLES_DICT.items():
@@ -416,12 +444,19 @@ class AzureADAuthorization:
 
         return auth_info
 
-    def get_identity_role_assignments(self, user_id: str) -> List[RoleAssignment]:
-        identity_type = self._get_identity_type(user_id)
+    async def get_identity_role_assignments(self, user_id: str) -> List[RoleAssignment]:
+        role_assignments = identity_role_assignments.get(user_id)
+        if role_assignments is None:
+            role_assignments = await self._get_identity_role_assignments(user_id)
+            identity_role_assignments.set(user_id, role_assignments)
+        return list(role_assignments)
+
+    async def _get_identity_role_assignments(self, user_id: str) -> List[RoleAssignment]:
+        identity_type = await self._get_identity_type(user_id)
         if identity_type == "#microsoft.graph.user":
-            graph_data = self._get_role_assignment_graph_data_for_user(user_id)
+            graph_data = await self._get_role_assignment_graph_data_for_user(user_id)
         elif identity_type == "#microsoft.graph.servicePrincipal":
-            graph_data = self._get_role_assignment_graph_data_for_service_principal(user_id)
+            graph_data = await self._get_role_assignment_graph_data_for_service_principal(user_id)
         else:
             raise AuthConfigValidationError(f"{strings.ACCESS_UNHANDLED_ACCOUNT_TYPE} {identity_type}")
 
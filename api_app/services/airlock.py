@@ -14,10 +14,11 @@ from models.domain.workspace_service import WorkspaceService
 from models.schemas.airlock_request import AirlockReviewInCreate
 from models.schemas.airlock_request import AirlockRequestWithAllowedUserActions
 from models.schemas.resource import ResourcePatch
-from typing import Tuple, List, Optional
+from typing import AsyncIterator, Tuple, List, Optional
 from models.schemas.user_resource import UserResourceInCreate
 from services.azure_resource_status import get_azure_resource_status
 from services.authentication import get_aad_service
+from services.cascade import run_cascade
 
 from resources import strings, constants
 
@@ -274,7 +275,7 @@ async def save_and_publish_event_airlock_request(airlock_request: AirlockRequest
 
     try:
         access_service = get_aad_service()
-        role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(workspace)
+        role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(workspace)
     except Exception:
         logger.exception("Failed to retrieve workspace role assignments from Microsoft Graph")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=strings.GRAPH_ROLE_ASSIGNMENT_ERROR)
@@ -335,7 +336,7 @@ async def update_and_publish_event_airlock_request(
 
     try:
         access_service = get_aad_service()
-        role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(workspace)
+        role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(workspace)
     except Exception:
         logger.exception("Failed to retrieve workspace role assignments from Microsoft Graph")
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=strings.GRAPH_ROLE_ASSIGNMENT_ERROR)
@@ -365,9 +366,11 @@ def check_email_exists(role_assignment_details: defaultdict(list)):
 
 async def get_airlock_requests_by_user_and_workspace(user: User, workspace: Workspace, airlock_request_repo: AirlockRequestRepository,
                                                      creator_user_id: Optional[str] = None, type: Optional[AirlockRequestType] = None, status: Optional[AirlockRequestStatus] = None,
-                                                     order_by: Optional[str] = None, order_ascending=True) -> List[AirlockRequest]:
-    return await airlock_request_repo.get_airlock_requests(workspace_id=workspace.id, creator_user_id=creator_user_id, type=type, status=status,
-                                                           order_by=order_by, order_ascending=order_ascending)
+                                                     order_by: Optional[str] = None, order_ascending=True,
+                                                     page_size: Optional[int] = None, continuation: Optional[str] = None) -> Tuple[List[AirlockRequest], Optional[str]]:
+    return await airlock_request_repo.get_airlock_requests_page(workspace_id=workspace.id, creator_user_id=creator_user_id, type=type, status=status,
+                                                                order_by=order_by, order_ascending=order_ascending,
+                                                                page_size=page_size, continuation=continuation)
 
 
 def get_allowed_actions(request: AirlockRequest, user: User, airlock_request_repo: AirlockRequestRepository) -> AirlockRequestWithAllowedUserActions:
@@ -401,6 +404,12 @@ def enrich_requests_with_allowed_actions(requests: List[AirlockRequest], user: U
     return enriched_requests
 
 
+async def iter_requests_with_allowed_actions(requests: AsyncIterator[AirlockRequest], user: User, airlock_request_repo: AirlockRequestRepository) -> AsyncIterator[AirlockRequestWithAllowedUserActions]:
+    async for request in requests:
+        allowed_actions = get_allowed_actions(request, user, airlock_request_repo)
+        yield AirlockRequestWithAllowedUserActions(airlockRequest=request, allowedUserActions=allowed_actions)
+
+
 async def delete_review_user_resource(
         user_resource: UserResource,
         user_resource_repo: UserResourceRepository,
@@ -453,15 +462,15 @@ async def delete_all_review_user_resources(
         operations_repo: OperationRepository,
         resource_history_repo: ResourceHistoryRepository,
         user: User) -> List[Operation]:
-    operations: List[Operation] = []
-    for review_ur in airlock_request.reviewUserResources.values():
+    async def delete_user_resource(review_ur: AirlockReviewUserResource) -> Operation:
+        # read on every attempt, so an etag conflict is retried with the latest user resource
         user_resource = await user_resource_repo.get_user_resource_by_id(
             workspace_id=review_ur.workspaceId,
             service_id=review_ur.workspaceServiceId,
             resource_id=review_ur.userResourceId
         )
 
-        operation = await delete_review_user_resource(
+        return await delete_review_user_resource(
             user_resource=user_resource,
             user_resource_repo=user_resource_repo,
             workspace_service_repo=workspace_service_repo,
@@ -470,7 +479,8 @@ async def delete_all_review_user_resources(
             resource_history_repo=resource_history_repo,
             user=user
         )
-        operations.append(operation)
+
+    operations = await run_cascade(airlock_request.reviewUserResources.values(), delete_user_resource, key=lambda review_ur: review_ur.userResourceId)
 
     logger.info(f"Started {len(operations)} operations on deleting user resources")
     return operations
@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from services.logging import meter
+
+cache_hits = meter.create_counter(
+    name="cache_hits",
+    description="Lookups served from an in-process cache"
+)
+cache_misses = meter.create_counter(
+    name="cache_misses",
+    description="Lookups that missed an in-process cache"
+)
+
+
+class LRUCache():
+    """
+    Bounded least-recently-used cache, counting hits and misses under the cache's name.
+    """
+
+    def __init__(self, name: str, max_size: int):
+        self._name = name
+        self._max_size = max_size
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            cache_misses.add(1, {"cache": self._name})
+            return None
+
+        self._items.move_to_end(key)
+        cache_hits.add(1, {"cache": self._name})
+        return item
+
+    def set(self, key: Hashable, item: Any):
+        if self._max_size <= 0:
+            return
+
+        self._items[key] = item
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class TTLCache(LRUCache):
+    """
+    Bounded LRU cache whose entries expire a number of seconds after they were set.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float):
+        super().__init__(name, max_size)
+        self._ttl_seconds = ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._items.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._items[key]
+        entry = super().get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: Hashable, item: Any):
+        if self._ttl_seconds <= 0:
+            return
+        super().set(key, (time.monotonic() + self._ttl_seconds, item))
+
+    def invalidate(self, key: Hashable):
+        self._items.pop(key, None)
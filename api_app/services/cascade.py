@@ -0,0 +1,49 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+
+from core import config
+from services.logging import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class CascadeFailed(Exception):
+    """Raised when a cascaded change failed for some of the resources, once it has been attempted for all of them."""
+
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        super().__init__(f"The change failed for {len(errors)} dependent resources: " + "; ".join(f"{key}: {error}" for key, error in errors.items()))
+
+
+async def run_cascade(items: Iterable[T], action: Callable[[T], Awaitable[R]], key: Callable[[T], str], refresh: Optional[Callable[[T], Awaitable[T]]] = None, max_concurrency: Optional[int] = None, max_retries: Optional[int] = None) -> List[R]:
+    """
+    Runs an action for each of the resources affected by a cascaded change, at most max_concurrency at a time.
+
+    An action failing on an etag conflict is retried (with the item re-read by refresh, if given) up to max_retries
+    times. The action is attempted for every item even if some fail, the failures are then raised together as a
+    CascadeFailed keyed by the items' keys.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max_concurrency or config.CASCADE_MAX_CONCURRENCY)
+    max_retries = config.CASCADE_ETAG_CONFLICT_RETRIES if max_retries is None else max_retries
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                try:
+                    return await action(item)
+                except CosmosAccessConditionFailedError:
+                    if attempt == max_retries:
+                        raise
+                    logger.info(f"Etag conflict updating {key(item)}, retrying")
+                    if refresh is not None:
+                        item = await refresh(item)
+
+    results = await asyncio.gather(*[run(item) for item in items], return_exceptions=True)
+    errors = {key(item): result for item, result in zip(items, results) if isinstance(result, Exception)}
+    if errors:
+        raise CascadeFailed(errors)
+    return results
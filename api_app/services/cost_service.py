@@ -20,6 +20,7 @@ from db.repositories.workspaces import WorkspaceRepository
 from models.domain.costs import GranularityEnum, CostReport, WorkspaceCostReport, CostItem, WorkspaceServiceCostItem, \
     CostRow
 from models.domain.resource import Resource
+from models.domain.workspace import WorkspaceSummary
 from services.logging import logger
 
 
@@ -191,7 +192,7 @@ class CostService:
     async def __get_workspace_subscription_ids(self, workspace_repo: WorkspaceRepository) -> list:
         #  we currently have to query ALL workspace resources to get the subscription ids to calculate costs for
         #  this may be able to change if we store subscriptions in config as per this issue: https://github.com/microsoft/AzureTRE/issues/4528
-        workspaces = await workspace_repo.get_active_workspaces()
+        workspaces = await workspace_repo.get_active_workspace_views(WorkspaceSummary)
         subscription_ids = []
         for workspace in workspaces:
             #  check if the property exists and is not empty
@@ -297,14 +298,14 @@ class CostService:
         # convert to list of rows
         return df.values.tolist()
 
-    def __get_resource_name(self, resource: Resource):
+    def __get_resource_name(self, resource: Union[Resource, WorkspaceSummary]):
         key = "display_name"
         if key in resource.properties.keys():
             return resource.properties[key]
         else:
             return resource.templateName
 
-    def __extract_cost_item(self, resource: Resource, granularity: GranularityEnum, query_result_dict: dict, tag: str):
+    def __extract_cost_item(self, resource: Union[Resource, WorkspaceSummary], granularity: GranularityEnum, query_result_dict: dict, tag: str):
         return CostItem(
             id=resource.id,
             name=self.__get_resource_name(resource),
@@ -313,7 +314,7 @@ class CostService:
 
     async def __get_workspaces_costs(self, granularity, query_result_dict, workspace_repo):
         return [self.__extract_cost_item(workspace, granularity, query_result_dict, CostService.TRE_WORKSPACE_ID_TAG)
-                for workspace in await workspace_repo.get_active_workspaces()]
+                for workspace in await workspace_repo.get_active_workspace_views(WorkspaceSummary)]
 
     async def __get_shared_services_costs(self, granularity, query_result_dict, shared_services_repo):
         return [self.__extract_cost_item(shared_service, granularity, query_result_dict,
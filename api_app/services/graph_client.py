@@ -0,0 +1,79 @@
+import asyncio
+from typing import List, Optional
+
+import httpx
+
+from services.logging import logger
+
+
+GRAPH_REQUEST_TIMEOUT = 10
+# Microsoft Graph accepts at most 20 sub-requests in a single $batch request
+GRAPH_BATCH_MAX_REQUESTS = 20
+GRAPH_THROTTLED_RETRIES = 3
+GRAPH_DEFAULT_RETRY_AFTER_SECONDS = 1
+_THROTTLED_STATUS_CODES = (429, 503)
+
+
+def retry_after_seconds(response: httpx.Response) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", GRAPH_DEFAULT_RETRY_AFTER_SECONDS)), 0)
+    except ValueError:
+        return GRAPH_DEFAULT_RETRY_AFTER_SECONDS
+
+
+class GraphClient():
+    """
+    Async Microsoft Graph client keeping a pool of HTTP/2 keep-alive connections, so a Graph call neither blocks the
+    event loop nor pays for a new connection every time.
+
+    Throttled requests are retried after the delay Graph asks for in the Retry-After header.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._client = httpx.AsyncClient(http2=True, timeout=GRAPH_REQUEST_TIMEOUT, transport=transport)
+
+    async def request(self, method: str, url: str, headers: dict, json=None) -> httpx.Response:
+        for attempt in range(GRAPH_THROTTLED_RETRIES + 1):
+            response = await self._client.request(method, url, headers=headers, json=json)
+            if response.status_code not in _THROTTLED_STATUS_CODES or attempt == GRAPH_THROTTLED_RETRIES:
+                return response
+
+            delay = retry_after_seconds(response)
+            logger.warning(f"MS Graph request to {url} was throttled with status code {response.status_code}, retrying in {delay} seconds")
+            await asyncio.sleep(delay)
+
+    async def batch(self, url: str, requests: List[dict], headers: dict) -> dict:
+        """
+        Sends the sub-requests in $batch requests of at most GRAPH_BATCH_MAX_REQUESTS, concurrently, and returns the
+        responses of all of them.
+        """
+        batches = [requests[i:i + GRAPH_BATCH_MAX_REQUESTS] for i in range(0, len(requests), GRAPH_BATCH_MAX_REQUESTS)]
+        responses = await asyncio.gather(*[self.request("POST", url, headers=headers, json={"requests": batch}) for batch in batches])
+
+        batch_data = {"responses": []}
+        for response in responses:
+            batch_data["responses"] += response.json()["responses"]
+        return batch_data
+
+    async def close(self):
+        await self._client.aclose()
+
+
+_graph_client: Optional[GraphClient] = None
+
+
+def get_graph_client() -> GraphClient:
+    """
+    Returns the process-wide Graph client, creating it on first use.
+    """
+    global _graph_client
+    if _graph_client is None:
+        _graph_client = GraphClient()
+    return _graph_client
+
+
+async def close_graph_client():
+    global _graph_client
+    if _graph_client is not None:
+        client, _graph_client = _graph_client, None
+        await client.close()
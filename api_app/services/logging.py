@@ -1,6 +1,6 @@
 import logging
 from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry import trace
+from opentelemetry import trace, metrics
 from azure.monitor.opentelemetry import configure_azure_monitor
 
 from core.config import APPLICATIONINSIGHTS_CONNECTION_STRING, LOGGING_LEVEL
@@ -47,6 +47,7 @@ LOGGERS_FOR_ERRORS_ONLY = [
 
 logger = logging.getLogger("azuretre_api")
 tracer = trace.get_tracer("azuretre_api")
+meter = metrics.get_meter("azuretre_api")
 
 
 def configure_loggers():
@@ -1,6 +1,8 @@
+import copy
 import json
 from pathlib import Path
-from typing import List, Dict, Tuple
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Tuple
 
 
 def get_system_properties(id_field: str = "workspace_id"):
@@ -30,11 +32,24 @@ def merge_properties(all_properties: List[Dict]) -> Dict:
     return properties
 
 
+def _load_schema_fragments() -> Mapping[str, Tuple[List[str], Dict]]:
+    schemas_dir = Path(__file__).parent / ".." / "schemas"
+    fragments = {}
+    for schema_def in sorted(schemas_dir.glob("*.json")):
+        with open(schema_def) as schema_f:
+            schema = json.load(schema_f)
+            fragments[schema_def.name] = (schema["required"], schema["properties"])
+    return MappingProxyType(fragments)
+
+
+# the schema fragments don't change while the API runs, so they are read once rather than on every template enrichment
+_SCHEMA_FRAGMENTS = _load_schema_fragments()
+
+
 def read_schema(schema_file: str) -> Tuple[List[str], Dict]:
-    workspace_schema_def = Path(__file__).parent / ".." / "schemas" / schema_file
-    with open(workspace_schema_def) as schema_f:
-        schema = json.load(schema_f)
-        return schema["required"], schema["properties"]
+    # enrich_template modifies the properties it merges (e.g. marking them readOnly), so callers get their own copy
+    required, properties = _SCHEMA_FRAGMENTS[schema_file]
+    return copy.deepcopy(required), copy.deepcopy(properties)
 
 
 def enrich_template(original_template, extra_properties, is_update: bool = False, is_workspace_scope: bool = True) -> dict:
@@ -0,0 +1,75 @@
+"""Microbenchmark of TokenValidator.validate, with and without the validated token cache.
+
+Signs one RS256 (2048-bit) token and validates it repeatedly against a mocked
+JWKS client, so only the signature verification and claim checks are timed.
+
+Run from api_app:
+
+    python -m tests_ma.auth.benchmark_token_validator [--seconds 2]
+"""
+import argparse
+import time
+from unittest.mock import MagicMock
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from auth import token_validator
+from auth.token_validator import TokenValidator, TokenValidatorConfig
+
+
+AUDIENCE = "api://benchmark-app"
+ISSUER = "https://login.microsoftonline.com/tenant/v2.0"
+
+
+def _make_token_and_validator():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    token = jwt.encode(
+        {
+            "oid": "user-object-id",
+            "name": "Benchmark User",
+            "email": "benchmark@example.com",
+            "roles": ["TREUser"],
+            "aud": AUDIENCE,
+            "iss": ISSUER,
+            "exp": int(time.time()) + 3600,
+        },
+        private_key,
+        algorithm="RS256",
+    )
+
+    jwks_client = MagicMock()
+    jwks_client.get_signing_key_from_jwt.return_value = MagicMock(key=private_key.public_key())
+    config = TokenValidatorConfig(jwks_uri="https://unused/keys", audience=AUDIENCE, issuer=ISSUER)
+    return token, TokenValidator(config, jwks_client=jwks_client)
+
+
+def _validations_per_second(validate, seconds: float, clear_cache: bool) -> float:
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        if clear_cache:
+            token_validator.validated_tokens.clear()
+        validate()
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time spent on each case")
+    args = parser.parse_args()
+
+    token, validator = _make_token_and_validator()
+    validator.validate(token)
+
+    uncached = _validations_per_second(lambda: validator.validate(token), args.seconds, clear_cache=True)
+    cached = _validations_per_second(lambda: validator.validate(token), args.seconds, clear_cache=False)
+
+    print(f"uncached: {uncached:>12,.0f} validations/s")
+    print(f"cached:   {cached:>12,.0f} validations/s")
+
+
+if __name__ == "__main__":
+    main()
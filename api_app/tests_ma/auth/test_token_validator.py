@@ -1,4 +1,6 @@
 """Tests for auth.token_validator."""
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
 
@@ -273,3 +275,69 @@ class TestTokenValidatorValidate:
             result = validator.validate("token")
 
         assert result.is_workspace_token is True
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _signed_token(rsa_key, audience: str = AUDIENCE, expires_in: int = 3600) -> str:
+    import jwt as pyjwt
+
+    claims = dict(SAMPLE_CLAIMS, aud=audience, iss=ISSUER, exp=int(time.time()) + expires_in)
+    return pyjwt.encode(claims, rsa_key, algorithm="RS256")
+
+
+class TestTokenValidatorCache:
+    def _validator(self, rsa_key, audience: str = AUDIENCE) -> TokenValidator:
+        signing_key = MagicMock()
+        signing_key.key = rsa_key.public_key()
+        config = TokenValidatorConfig(jwks_uri=JWKS_URI, audience=audience, issuer=ISSUER)
+        return TokenValidator(config, jwks_client=_make_mock_jwks_client(signing_key))
+
+    def test_validated_token_is_served_from_cache(self, rsa_key):
+        validator = self._validator(rsa_key)
+        token = _signed_token(rsa_key)
+
+        first = validator.validate(token)
+        second = validator.validate(token)
+
+        assert first == second
+        validator._jwks_client.get_signing_key_from_jwt.assert_called_once()
+
+    def test_wrong_audience_is_cached_for_the_audience_only(self, rsa_key):
+        workspace_validator = self._validator(rsa_key, audience="ws-client-id")
+        core_validator = self._validator(rsa_key)
+        token = _signed_token(rsa_key)
+
+        for _ in range(2):
+            with pytest.raises(TokenInvalid):
+                workspace_validator.validate(token)
+
+        workspace_validator._jwks_client.get_signing_key_from_jwt.assert_called_once()
+        assert core_validator.validate(token).audience == AUDIENCE
+
+    def test_cached_token_is_validated_again_once_it_expires(self, rsa_key):
+        validator = self._validator(rsa_key)
+        token = _signed_token(rsa_key)
+        validator.validate(token)
+
+        with patch("auth.token_validator.time.time", return_value=time.time() + 3601):
+            validator.validate(token)
+
+        assert validator._jwks_client.get_signing_key_from_jwt.call_count == 2
+
+    def test_invalid_signature_is_not_cached(self, rsa_key):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        validator = self._validator(rsa_key)
+        token = _signed_token(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+
+        for _ in range(2):
+            with pytest.raises(TokenSignatureInvalid):
+                validator.validate(token)
+
+        assert validator._jwks_client.get_signing_key_from_jwt.call_count == 2
@@ -4,6 +4,12 @@ from mock import AsyncMock, patch
 from azure.cosmos.aio import CosmosClient, DatabaseProxy
 
 from api.dependencies.database import Database
+from db.repositories.registry import RepositoryRegistry
+from db.repositories.operations import deployed_resources
+from db.repositories.template_cache import enriched_templates, template_cache, template_validators
+from auth.token_validator import validated_tokens
+from event_grid import helpers as event_grid_helpers
+from services.aad_authentication import identity_role_assignments, workspace_role_emails
 from models.domain.request_action import RequestAction
 from models.domain.resource import Resource
 from models.domain.user_resource import UserResource
@@ -581,3 +587,31 @@ async def no_database():
             patch('api.dependencies.database.CosmosClient', return_value=AsyncMock(spec=CosmosClient)) as cosmos_client_mock:
         cosmos_client_mock.return_value.get_database_client.return_value = AsyncMock(spec=DatabaseProxy)
         yield Database()
+
+
+@pytest.fixture(autouse=True)
+def no_cached_event_grid_publishers():
+    # publisher clients are cached per topic for the whole process, so don't let a (mocked) client leak between tests
+    event_grid_helpers._publishers.clear()
+    event_grid_helpers._credential = None
+    yield
+    event_grid_helpers._publishers.clear()
+    event_grid_helpers._credential = None
+
+
+@pytest.fixture(autouse=True)
+def no_cached_repositories():
+    # repositories are shared for the whole process, so make sure tests always build (or mock) their own
+    RepositoryRegistry.clear()
+    yield
+    RepositoryRegistry.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_cached_templates():
+    # templates (and role assignments and tokens) are cached for the whole process, so a value returned by one test's mock mustn't be seen by another
+    for cache in (template_cache, enriched_templates, template_validators, deployed_resources, workspace_role_emails, identity_role_assignments, validated_tokens):
+        cache.clear()
+    yield
+    for cache in (template_cache, enriched_templates, template_validators, deployed_resources, workspace_role_emails, identity_role_assignments, validated_tokens):
+        cache.clear()
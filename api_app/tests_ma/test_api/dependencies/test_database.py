@@ -10,3 +10,10 @@ async def test_get_container_proxy():
     container_name = "test_container"
     container_proxy = await Database().get_container_proxy(container_name)
     assert isinstance(container_proxy, MagicMock)
+
+
+async def test_get_container_proxy_is_cached_per_container():
+    first = await Database().get_container_proxy("cached_container")
+    second = await Database().get_container_proxy("cached_container")
+
+    assert first is second
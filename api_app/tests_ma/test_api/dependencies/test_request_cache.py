@@ -0,0 +1,94 @@
+import pytest
+from fastapi import HTTPException
+from mock import AsyncMock, MagicMock
+from starlette.datastructures import State
+
+from db.errors import EntityDoesNotExist
+from api.dependencies.request_cache import RequestEntityCache, get_request_cache
+from api.dependencies.workspaces import get_deployed_workspace_by_id_from_path, get_workspace_by_id_from_path, get_workspace_service_by_id_from_path
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_ID = "933ad738-7265-4b5f-9eae-a1a62928772e"
+
+
+def _request():
+    request = MagicMock()
+    request.state = State()
+    return request
+
+
+async def test_get_request_cache_is_shared_for_the_request():
+    request = _request()
+
+    assert get_request_cache(request) is get_request_cache(request)
+    assert get_request_cache(request) is not get_request_cache(_request())
+
+
+async def test_get_or_read_only_reads_once():
+    cache = RequestEntityCache()
+    read = AsyncMock(return_value="entity")
+
+    first = await cache.get_or_read("container", WORKSPACE_ID, read)
+    second = await cache.get_or_read("container", WORKSPACE_ID, read)
+
+    assert first == second == "entity"
+    read.assert_awaited_once()
+    assert cache.cosmos_reads == 1
+    assert cache.hits == 1
+
+
+async def test_get_or_read_does_not_cache_failures():
+    cache = RequestEntityCache()
+    read = AsyncMock(side_effect=[HTTPException(status_code=404), "entity"])
+
+    with pytest.raises(HTTPException):
+        await cache.get_or_read("container", WORKSPACE_ID, read)
+
+    assert await cache.get_or_read("container", WORKSPACE_ID, read) == "entity"
+
+
+async def test_deployed_workspace_reuses_workspace_resolved_earlier_in_request():
+    request = _request()
+    workspace = MagicMock()
+    workspaces_repo = MagicMock()
+    workspaces_repo.get_workspace_by_id = AsyncMock(return_value=workspace)
+    workspaces_repo.get_deployed_workspace_by_id = AsyncMock()
+    operations_repo = MagicMock()
+    operations_repo.resource_has_deployed_operation = AsyncMock(return_value=True)
+
+    assert await get_workspace_by_id_from_path(request, WORKSPACE_ID, workspaces_repo) is workspace
+    assert await get_deployed_workspace_by_id_from_path(request, WORKSPACE_ID, workspaces_repo, operations_repo) is workspace
+
+    workspaces_repo.get_workspace_by_id.assert_awaited_once()
+    workspaces_repo.get_deployed_workspace_by_id.assert_not_awaited()
+    operations_repo.resource_has_deployed_operation.assert_awaited_once_with(resource_id=WORKSPACE_ID)
+
+
+async def test_deployed_workspace_raises_409_if_cached_workspace_is_not_deployed():
+    request = _request()
+    workspaces_repo = MagicMock()
+    workspaces_repo.get_workspace_by_id = AsyncMock(return_value=MagicMock())
+    operations_repo = MagicMock()
+    operations_repo.resource_has_deployed_operation = AsyncMock(return_value=False)
+
+    await get_workspace_by_id_from_path(request, WORKSPACE_ID, workspaces_repo)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_deployed_workspace_by_id_from_path(request, WORKSPACE_ID, workspaces_repo, operations_repo)
+
+    assert exc_info.value.status_code == 409
+
+
+async def test_workspace_resolved_earlier_in_request_is_not_returned_as_a_workspace_service_with_the_same_id():
+    request = _request()
+    workspaces_repo = MagicMock()
+    workspaces_repo.get_workspace_by_id = AsyncMock(return_value=MagicMock())
+    workspace_services_repo = MagicMock()
+    workspace_services_repo.get_workspace_service_by_id = AsyncMock(side_effect=EntityDoesNotExist)
+
+    await get_workspace_by_id_from_path(request, WORKSPACE_ID, workspaces_repo)
+    with pytest.raises(HTTPException) as exc_info:
+        await get_workspace_service_by_id_from_path(request, WORKSPACE_ID, WORKSPACE_ID, workspace_services_repo)
+
+    assert exc_info.value.status_code == 404
+    workspace_services_repo.get_workspace_service_by_id.assert_awaited_once_with(WORKSPACE_ID, WORKSPACE_ID)
@@ -1,10 +1,15 @@
+import json
+from typing import List
+
 import pytest
 from mock import patch
 from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
 
 from db.errors import UnableToAccessDatabase
 from db.repositories.base import BaseRepository
-from api.helpers import get_repository
+from api.helpers import STREAMED_ITEMS_PER_CHUNK, get_repository, stream_json_list
 
 pytestmark = pytest.mark.asyncio
 
@@ -15,3 +20,57 @@ async def test_get_repository_raises_http_exception_when_unable_to_access_databa
     with pytest.raises(HTTPException):
         get_repo = get_repository(BaseRepository)
         await get_repo()
+
+
+class Item(BaseModel):
+    id: str
+
+
+async def _items(count: int, error: Exception = None):
+    if error is not None:
+        raise error
+    for i in range(count):
+        yield Item(id=str(i))
+
+
+async def _read_chunks(response):
+    return [chunk async for chunk in response.body_iterator]
+
+
+@pytest.mark.parametrize("count", [0, 1, STREAMED_ITEMS_PER_CHUNK * 2 + 1])
+async def test_stream_json_list_streams_items_in_chunks(count):
+    response = await stream_json_list("items", _items(count))
+
+    chunks = await _read_chunks(response)
+
+    assert response.media_type == "application/json"
+    assert json.loads("".join(chunks)) == {"items": [{"id": str(i)} for i in range(count)]}
+    assert len(chunks) == count // STREAMED_ITEMS_PER_CHUNK + 1
+
+
+async def test_stream_json_list_raises_before_streaming_if_the_first_read_fails():
+    with pytest.raises(UnableToAccessDatabase):
+        await stream_json_list("items", _items(1, UnableToAccessDatabase()))
+
+
+class AliasedItem(BaseModel):
+    id: str
+    etag: str = Field(alias="_etag")
+
+
+class AliasedItemList(BaseModel):
+    items: List[AliasedItem]
+
+
+async def test_stream_json_list_encodes_items_like_the_response_model():
+    items = [AliasedItem(id=str(i), _etag=f"etag-{i}") for i in range(3)]
+
+    async def _aliased_items():
+        for item in items:
+            yield item
+
+    response = await stream_json_list("items", _aliased_items())
+    streamed = json.loads("".join(await _read_chunks(response)))
+
+    assert streamed == jsonable_encoder(AliasedItemList(items=items))
+    assert streamed["items"][0]["_etag"] == "etag-0"
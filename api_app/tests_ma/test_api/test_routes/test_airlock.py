@@ -2,7 +2,7 @@ import time
 import pytest
 import pytest_asyncio
 from mock import patch
-from fastapi import status
+from fastapi import HTTPException, status
 from azure.core.exceptions import HttpResponseError
 from azure.cosmos.exceptions import CosmosResourceNotFoundError
 
@@ -77,6 +77,16 @@ def sample_airlock_user_resource_object():
     )
 
 
+def sample_airlock_request_with_two_review_user_resources():
+    airlock_request = sample_airlock_request_object(review_user_resource=True)
+    airlock_request.reviewUserResources["other-user-guid"] = AirlockReviewUserResource(
+        workspaceId=WORKSPACE_ID,
+        workspaceServiceId=WORKSPACE_SERVICE_ID,
+        userResourceId="other-user-resource-id"
+    )
+    return airlock_request
+
+
 def sample_workspace(workspace_id=WORKSPACE_ID, workspace_properties: dict = {}) -> Workspace:
     workspace = Workspace(
         id=workspace_id,
@@ -140,11 +150,25 @@ class TestAirlockRoutesThatRequireOwnerOrResearcherRights():
         app.dependency_overrides = {}
 
     # [GET] /workspaces/{workspace_id}/requests}
-    @patch("api.routes.airlock.AirlockRequestRepository.get_airlock_requests", return_value=[])
+    @patch("api.routes.airlock.AirlockRequestRepository.get_airlock_requests_page", return_value=([], None))
     async def test_get_all_airlock_requests_by_workspace_returns_200(self, _, app, client):
         response = await client.get(app.url_path_for(strings.API_LIST_AIRLOCK_REQUESTS, workspace_id=WORKSPACE_ID))
         assert response.status_code == status.HTTP_200_OK
 
+    # [GET] /workspaces/{workspace_id}/requests}
+    @patch("api.routes.airlock.AirlockRequestRepository.get_airlock_requests_iter")
+    async def test_get_all_airlock_requests_by_workspace_streams_requests_with_allowed_actions(self, get_airlock_requests_iter_mock, app, client):
+        async def _airlock_requests():
+            yield sample_airlock_request_object()
+        get_airlock_requests_iter_mock.return_value = _airlock_requests()
+
+        response = await client.get(app.url_path_for(strings.API_LIST_AIRLOCK_REQUESTS, workspace_id=WORKSPACE_ID), params={"stream": True})
+
+        assert response.status_code == status.HTTP_200_OK
+        airlock_requests = response.json()["airlockRequests"]
+        assert [airlock_request["airlockRequest"]["id"] for airlock_request in airlock_requests] == [AIRLOCK_REQUEST_ID]
+        assert airlock_requests[0]["allowedUserActions"] == ["cancel", "submit"]
+
     # [POST] /workspaces/{workspace_id}/requests
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace(workspace_properties={}))
     @patch("api.routes.airlock.save_and_publish_event_airlock_request")
@@ -254,6 +278,23 @@ class TestAirlockRoutesThatRequireOwnerOrResearcherRights():
         response = await client.post(app.url_path_for(strings.API_CANCEL_AIRLOCK_REQUEST, workspace_id=WORKSPACE_ID, airlock_request_id=AIRLOCK_REQUEST_ID))
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    @patch("api.routes.airlock.AirlockRequestRepository.read_item_by_id", return_value=sample_airlock_request_object(review_user_resource=True))
+    @patch("services.airlock.update_and_publish_event_airlock_request", return_value=sample_airlock_request_object(status=AirlockRequestStatus.Cancelled))
+    @patch("api.routes.airlock.UserResourceRepository.get_user_resource_by_id")
+    @patch("services.airlock.delete_review_user_resource", side_effect=HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=strings.SERVICE_BUS_GENERAL_ERROR_MESSAGE))
+    async def test_post_cancel_airlock_request_with_review_user_resource_deletion_failing_returns_503(self, _, __, ___, ____, app, client):
+        response = await client.post(app.url_path_for(strings.API_CANCEL_AIRLOCK_REQUEST, workspace_id=WORKSPACE_ID, airlock_request_id=AIRLOCK_REQUEST_ID))
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    @patch("api.routes.airlock.AirlockRequestRepository.read_item_by_id", return_value=sample_airlock_request_with_two_review_user_resources())
+    @patch("services.airlock.update_and_publish_event_airlock_request", return_value=sample_airlock_request_object(status=AirlockRequestStatus.Cancelled))
+    @patch("api.routes.airlock.UserResourceRepository.get_user_resource_by_id")
+    @patch("services.airlock.delete_review_user_resource", side_effect=[HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE), EntityDoesNotExist])
+    async def test_post_cancel_airlock_request_with_review_user_resource_deletions_failing_differently_returns_the_worst_status(self, _, __, ___, ____, app, client):
+        response = await client.post(app.url_path_for(strings.API_CANCEL_AIRLOCK_REQUEST, workspace_id=WORKSPACE_ID, airlock_request_id=AIRLOCK_REQUEST_ID))
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert USER_RESOURCE_ID in response.text and "other-user-resource-id" in response.text
+
     @patch("api.routes.airlock.AirlockRequestRepository.read_item_by_id", side_effect=CosmosResourceNotFoundError)
     @patch("services.airlock.validate_user_allowed_to_access_storage_account")
     async def test_get_airlock_container_link_no_airlock_request_found_returns_404(self, _, __, app, client):
@@ -370,7 +411,7 @@ class TestAirlockRoutesThatRequireAirlockManagerRights():
     @patch("services.airlock.WorkspaceServiceRepository.get_workspace_service_by_id", return_value=WorkspaceService(id=WORKSPACE_SERVICE_ID, templateName="test", templateVersion="0.0.1", _etag="123"))
     @patch("services.airlock.UserResourceRepository.create_user_resource_item", return_value=(UserResource(id=USER_RESOURCE_ID, templateName="test", templateVersion="0.0.1", _etag="123"), "test"))
     @patch("services.airlock.AirlockRequestRepository.read_item_by_id", return_value=sample_airlock_request_object(status=AirlockRequestStatus.InReview))
-    @patch("api.dependencies.workspaces.WorkspaceRepository.get_deployed_workspace_by_id", return_value=sample_workspace(workspace_properties=sample_airlock_review_config()))
+    @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace(workspace_properties=sample_airlock_review_config()))
     async def test_post_create_review_user_resource_returns_200(self, _, __, ___, ____, _____, ______, _______, app, client):
         # Check the Airlock Request has been updated with VM information
         response = await client.post(app.url_path_for(strings.API_CREATE_AIRLOCK_REVIEW_USER_RESOURCE, workspace_id=WORKSPACE_ID, airlock_request_id=AIRLOCK_REQUEST_ID))
@@ -417,7 +458,7 @@ class TestAirlockRoutesThatRequireAirlockManagerRights():
     @patch("services.airlock.WorkspaceServiceRepository.get_workspace_service_by_id", return_value=WorkspaceService(id=WORKSPACE_SERVICE_ID, templateName="test", templateVersion="0.0.1", _etag="123"))
     @patch("services.airlock.UserResourceRepository.create_user_resource_item", return_value=(UserResource(id=USER_RESOURCE_ID, templateName="test", templateVersion="0.0.1", _etag="123"), "test"))
     @patch("services.airlock.AirlockRequestRepository.read_item_by_id", return_value=sample_airlock_request_object(status=AirlockRequestStatus.InReview, review_user_resource=True))
-    @patch("api.dependencies.workspaces.WorkspaceRepository.get_deployed_workspace_by_id", return_value=sample_workspace(workspace_properties=sample_airlock_review_config()))
+    @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace(workspace_properties=sample_airlock_review_config()))
     async def test_post_create_review_user_resource_with_existing_unhealthy_resource_deletes_previous_and_redeploys(self, _, __, ___, ____, _____, ______, _______, ________, deploy_resource_mock, delete_review_resource_mock, app, client):
         await client.post(app.url_path_for(strings.API_CREATE_AIRLOCK_REVIEW_USER_RESOURCE, workspace_id=WORKSPACE_ID, airlock_request_id=AIRLOCK_REQUEST_ID))
         assert delete_review_resource_mock.call_count == 1
@@ -3,6 +3,7 @@ from mock import patch
 
 from fastapi import status
 from auth.rbac import require_tre_admin, require_tre_user_or_admin
+from models.schemas.migrations import IndexTransformationProgress
 from resources import strings
 
 
@@ -26,6 +27,11 @@ class TestMigrationRoutesWithNonAdminRights:
         if response.status_code != status.HTTP_403_FORBIDDEN:
             raise AssertionError(f"Expected status code {status.HTTP_403_FORBIDDEN}, but got {response.status_code}")
 
+    # [GET] /migrations/indexing
+    async def test_get_indexing_progress_throws_unauthenticated_when_not_admin(self, client, app):
+        response = await client.get(app.url_path_for(strings.API_GET_INDEX_TRANSFORMATION_PROGRESS))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
 
 class TestMigrationRoutesThatRequireAdminRights:
     @pytest.fixture(autouse=True, scope='class')
@@ -36,10 +42,30 @@ class TestMigrationRoutesThatRequireAdminRights:
         app.dependency_overrides = {}
 
     # [POST] /migrations/
+    @patch("api.routes.migrations.ResourceMigration.backfill_resource_paths", return_value=2)
     @patch("api.routes.migrations.logger.info")
-    async def test_post_migrations_returns_202_on_successful(self, logging, client, app):
+    async def test_post_migrations_returns_202_on_successful(self, logging, backfill_resource_paths, client, app):
         response = await client.post(app.url_path_for(strings.API_MIGRATE_DATABASE))
 
         logging.assert_called()
+        backfill_resource_paths.assert_awaited_once()
+        assert response.json()["migrations"] == [{"issueNumber": "Backfill resource paths", "status": "Updated 2 resources"}]
         if response.status_code != status.HTTP_202_ACCEPTED:
             raise AssertionError(f"Expected status code {status.HTTP_202_ACCEPTED}, but got {response.status_code}")
+
+    # [POST] /migrations/
+    @patch("api.routes.migrations.ResourceMigration.backfill_resource_paths", side_effect=Exception("no db"))
+    async def test_post_migrations_returns_400_if_a_migration_fails(self, _, client, app):
+        response = await client.post(app.url_path_for(strings.API_MIGRATE_DATABASE))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # [GET] /migrations/indexing
+    @patch("api.routes.migrations.get_index_transformation_progress")
+    async def test_get_indexing_progress_returns_progress_of_containers(self, get_progress_mock, client, app):
+        get_progress_mock.return_value = [IndexTransformationProgress(container="Resources", progress=40, indexingMode="consistent", compositeIndexes=4)]
+
+        response = await client.get(app.url_path_for(strings.API_GET_INDEX_TRANSFORMATION_PROGRESS))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["containers"] == [{"container": "Resources", "progress": 40, "indexingMode": "consistent", "compositeIndexes": 4}]
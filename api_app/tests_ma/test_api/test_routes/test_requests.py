@@ -5,6 +5,7 @@ from mock import patch
 from models.domain.airlock_request import AirlockRequestStatus, AirlockRequestType
 from resources import strings
 from auth.rbac import require_tre_user_or_admin
+from api.dependencies.paging import DEFAULT_PAGE_SIZE
 
 
 pytestmark = pytest.mark.asyncio
@@ -63,6 +64,26 @@ class TestRequestsThatDontRequireAdminRigths:
         assert len(response.json()) == 1
         assert response.json()[0]["status"] == AirlockRequestStatus.InReview
 
+    @patch("api.routes.requests.AirlockRequestRepository.get_airlock_requests_page", return_value=([], "next-page"))
+    async def test_get_requests_page_returns_continuation_token_in_header(self, mock_get_airlock_requests_page, app, client):
+        response = await client.get(app.url_path_for(strings.API_LIST_REQUESTS), params={"page_size": 10})
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_get_airlock_requests_page.assert_called_once_with(
+            creator_user_id='user-guid-here', type=None, status=None, order_by=None, order_ascending=True, page_size=10, continuation=None
+        )
+        assert response.headers["x-ms-continuation"] == "next-page"
+
+    @patch("api.routes.requests.AirlockRequestRepository.get_airlock_requests_for_airlock_manager_page", return_value=([], None))
+    async def test_get_airlock_manager_requests_continuation_uses_default_page_size(self, mock_get_airlock_manager_page, app, client):
+        response = await client.get(app.url_path_for(strings.API_LIST_REQUESTS), params={"airlock_manager": True, "continuation": "this-page"})
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_get_airlock_manager_page.assert_called_once_with(
+            user_id='user-guid-here', type=None, status=None, order_by=None, order_ascending=True, page_size=DEFAULT_PAGE_SIZE, continuation="this-page"
+        )
+        assert "x-ms-continuation" not in response.headers
+
     @patch("api.routes.requests.AirlockRequestRepository.get_airlock_requests_for_airlock_manager")
     async def test_get_airlock_manager_requests_with_all_parameters(self, mock_get_airlock_manager, app, client):
         """Test that airlock manager requests are called with all expected parameters"""
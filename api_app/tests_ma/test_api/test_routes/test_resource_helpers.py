@@ -3,13 +3,15 @@ from unittest.mock import AsyncMock
 import uuid
 import pytest
 import pytest_asyncio
-from mock import patch
+from mock import MagicMock, patch
 import json
 
 from fastapi import HTTPException, status
 
-from api.routes.resource_helpers import save_and_deploy_resource, send_uninstall_message, mask_sensitive_properties, enrich_resource_with_available_upgrades
+from api.routes.resource_helpers import save_and_deploy_resource, send_uninstall_message, mask_sensitive_properties, enrich_resource_with_available_upgrades, \
+    enrich_resources_with_available_upgrades, cascaded_update_resource
 from db.repositories.resources_history import ResourceHistoryRepository
+from models.schemas.resource import ResourcePatch
 from tests_ma.test_api.conftest import create_test_user
 from resources import strings
 
@@ -110,6 +112,30 @@ def sample_resource_operation(resource_id: str, operation_id: str):
 
 
 class TestResourceHelpers:
+    @pytest.mark.asyncio
+    async def test_cascaded_update_resource_patches_children_level_by_level(self, resource_repo, resource_history_repo):
+        workspace = sample_resource()
+        service_path = f"/workspaces/{WORKSPACE_ID}/workspace-services/service"
+        dependency_list = [
+            {"id": "user-resource-1", "resourceType": ResourceType.UserResource, "resourcePath": f"{service_path}/user-resources/user-resource-1", "_etag": "etag"},
+            {"id": "user-resource-2", "resourceType": ResourceType.UserResource, "resourcePath": f"{service_path}/user-resources/user-resource-2", "_etag": "etag"},
+            {"id": "service", "resourceType": ResourceType.WorkspaceService, "resourcePath": service_path, "_etag": "etag"},
+            {"id": WORKSPACE_ID, "resourceType": ResourceType.Workspace, "resourcePath": f"/workspaces/{WORKSPACE_ID}", "_etag": "etag"}
+        ]
+        resource_repo.get_resource_dependency_list = AsyncMock(return_value=dependency_list)
+        patched = []
+
+        async def patch_resource(child_resource, *args):
+            patched.append(child_resource.id)
+
+        with patch("api.routes.resource_helpers.parse_obj_as", side_effect=lambda _, resource: MagicMock(id=resource["id"])), \
+                patch.object(resource_repo, "patch_resource", side_effect=patch_resource), \
+                patch.object(resource_repo, "get_resource_by_id", AsyncMock()):
+            await cascaded_update_resource(ResourcePatch(isEnabled=False), workspace, create_test_user(), False, AsyncMock(), resource_history_repo, resource_repo)
+
+        assert sorted(patched[:2]) == ["user-resource-1", "user-resource-2"]
+        assert patched[2:] == ["service"]
+
     @patch("api.routes.workspaces.ResourceTemplateRepository")
     @patch("api.routes.resource_helpers.send_resource_request_message")
     @pytest.mark.asyncio
@@ -322,6 +348,31 @@ class TestResourceHelpers:
         await enrich_resource_with_available_upgrades(resource, resource_template_repo)
         assert resource.availableUpgrades == []
 
+    @patch("api.routes.workspaces.ResourceTemplateRepository")
+    @pytest.mark.asyncio
+    async def test_enrich_resources_with_available_upgrades_uses_a_single_version_index_lookup(self, resource_template_repo):
+        resource_template_repo.get_template_version_index = AsyncMock(return_value={"tre-workspace-base": ['0.1.0', '0.1.2', '1.0.0']})
+        resource_template_repo.get_all_template_versions = AsyncMock()
+        resources = [sample_resource(), sample_resource()]
+        resources[1].templateName = "unknown"
+
+        await enrich_resources_with_available_upgrades(resources, resource_template_repo)
+
+        resource_template_repo.get_template_version_index.assert_awaited_once()
+        resource_template_repo.get_all_template_versions.assert_not_awaited()
+        assert resources[0].availableUpgrades == [AvailableUpgrade(version='0.1.2', forceUpdateRequired=False),
+                                                  AvailableUpgrade(version='1.0.0', forceUpdateRequired=True)]
+        assert resources[1].availableUpgrades == []
+
+    @patch("api.routes.workspaces.ResourceTemplateRepository")
+    @pytest.mark.asyncio
+    async def test_enrich_resources_with_available_upgrades_skips_the_index_for_empty_lists(self, resource_template_repo):
+        resource_template_repo.get_template_version_index = AsyncMock()
+
+        await enrich_resources_with_available_upgrades([], resource_template_repo)
+
+        resource_template_repo.get_template_version_index.assert_not_awaited()
+
     def test_sensitive_properties_get_masked(self, basic_resource_template):
         resource = sample_resource_with_secret()
 
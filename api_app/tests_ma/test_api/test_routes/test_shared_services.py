@@ -84,7 +84,7 @@ class TestSharedServiceRoutesThatDontRequireAdminRigths:
 
     # [GET] /shared-services
     @patch("api.routes.shared_services.SharedServiceRepository.get_active_shared_services", return_value=None)
-    @patch("api.routes.shared_services.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.shared_services.enrich_resources_with_available_upgrades", return_value=None)
     async def test_get_shared_services_returns_list_of_shared_services_for_user(self, _, get_active_shared_services_mock, app, client):
         shared_services = [sample_shared_service()]
         get_active_shared_services_mock.return_value = shared_services
@@ -127,7 +127,7 @@ class TestSharedServiceRoutesThatRequireAdminRights:
 
     # [GET] /shared-services
     @patch("api.routes.shared_services.SharedServiceRepository.get_active_shared_services", return_value=None)
-    @patch("api.routes.shared_services.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.shared_services.enrich_resources_with_available_upgrades", return_value=None)
     async def test_get_shared_services_returns_list_of_shared_services_for_admin_user(self, _, get_active_shared_services_mock, app, client):
         shared_services = [sample_shared_service()]
         get_active_shared_services_mock.return_value = shared_services
@@ -303,7 +303,7 @@ class TestSharedServiceRoutesThatRequireAdminRights:
         assert response.text == 'Attempt to downgrade from 0.1.0 to 0.0.1 denied. version downgrade is not allowed.'
 
     # [GET] /shared-services/{shared_service_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.shared_services.SharedServiceRepository.get_shared_service_by_id")
     async def test_get_shared_service_history_returns_shared_service_history_result(self, get_shared_service_mock, get_resource_history_mock, app, client):
         sample_guid = str(uuid.uuid4())
@@ -311,7 +311,7 @@ class TestSharedServiceRoutesThatRequireAdminRights:
         shared_service = sample_shared_service(shared_service_id=sample_guid)
         shared_service_history = sample_resource_history(history_length=sample_history_length, shared_service_id=sample_guid)
         get_shared_service_mock.return_value = shared_service
-        get_resource_history_mock.return_value = shared_service_history
+        get_resource_history_mock.return_value = (shared_service_history, None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, shared_service_id=SHARED_SERVICE_ID))
@@ -323,10 +323,10 @@ class TestSharedServiceRoutesThatRequireAdminRights:
             assert item["resourceId"] == shared_service.id
 
     # [GET] /shared-services/{shared_service_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.shared_services.SharedServiceRepository.get_shared_service_by_id", return_value=sample_shared_service())
     async def test_get_shared_service_history_returns_empty_list_when_no_history(self, _, get_resource_history_mock, app, client):
-        get_resource_history_mock.return_value = []
+        get_resource_history_mock.return_value = ([], None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, shared_service_id=SHARED_SERVICE_ID))
@@ -12,7 +12,7 @@ from tests_ma.test_api.conftest import create_admin_user, create_test_user, crea
 from models.domain.resource_template import ResourceTemplate
 from models.schemas.operation import OperationInResponse
 
-from db.errors import EntityDoesNotExist, StorageAccountNameGenerationTimeout, StorageAccountNameCheckFailed
+from db.errors import EntityDoesNotExist, InvalidContinuationToken, MajorVersionUpdateDenied, StorageAccountNameGenerationTimeout, StorageAccountNameCheckFailed
 from db.repositories.workspaces import WorkspaceRepository
 from db.repositories.workspace_services import WorkspaceServiceRepository
 from models.domain.authentication import RoleAssignment
@@ -256,19 +256,62 @@ class TestWorkspaceRoutesThatDontRequireAdminRights:
         app.dependency_overrides = {}
 
     # [GET] /workspaces
-    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces")
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_page")
     @patch("api.routes.workspaces.get_identity_role_assignments", return_value=[])
     async def test_get_workspaces_returns_empty_list_when_no_resources_exist(self, access_service_mock, get_workspaces_mock, app, client) -> None:
-        get_workspaces_mock.return_value = []
+        get_workspaces_mock.return_value = ([], None)
         access_service_mock.get_workspace_role.return_value = [WorkspaceRole.Owner]
 
         response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES))
-        assert response.json() == {"workspaces": []}
+        assert response.json() == {"workspaces": [], "continuation": None}
 
     # [GET] /workspaces
-    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces")
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_page", return_value=([], "next-page"))
+    @patch("api.routes.workspaces.get_identity_role_assignments", return_value=[])
+    async def test_get_workspaces_returns_continuation_token_of_next_page(self, _, get_workspaces_mock, app, client) -> None:
+        response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES), params={"page_size": 10, "continuation": "this-page"})
+
+        get_workspaces_mock.assert_called_once_with(page_size=10, continuation="this-page")
+        assert response.json() == {"workspaces": [], "continuation": "next-page"}
+
+    # [GET] /workspaces
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_page", side_effect=InvalidContinuationToken)
+    @patch("api.routes.workspaces.get_identity_role_assignments", return_value=[])
+    async def test_get_workspaces_returns_400_if_continuation_token_is_invalid(self, _, __, app, client) -> None:
+        response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES), params={"continuation": "expired-page"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.text == strings.INVALID_CONTINUATION_TOKEN
+
+    # [GET] /workspaces
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_iter")
+    @patch("api.routes.workspaces.ResourceTemplateRepository.get_template_version_index", return_value={"tre-workspace-base": ["0.1.0", "0.2.0"]})
+    @patch("api.routes.workspaces.get_identity_role_assignments", return_value=[RoleAssignment('ab123', 'ab124')])
+    async def test_get_workspaces_streams_workspaces_the_user_has_a_role_in(self, _, __, get_workspaces_iter_mock, app, client) -> None:
+        valid_ws = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info={'sp_id': 'ab123', 'app_role_id_workspace_owner': 'ab124', 'app_role_id_workspace_researcher': 'ab125', 'app_role_id_workspace_airlock_manager': 'ab130'})
+        invalid_ws = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info={'sp_id': 'ab127', 'app_role_id_workspace_owner': 'ab128', 'app_role_id_workspace_researcher': 'ab129', 'app_role_id_workspace_airlock_manager': 'ab130'})
+
+        async def _workspaces():
+            for workspace in [invalid_ws, valid_ws]:
+                yield workspace
+        get_workspaces_iter_mock.return_value = _workspaces()
+
+        response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES), params={"stream": True})
+
+        assert response.status_code == status.HTTP_200_OK
+        workspaces_from_response = response.json()["workspaces"]
+        assert [workspace["id"] for workspace in workspaces_from_response] == [valid_ws.id]
+        assert workspaces_from_response[0]["availableUpgrades"] == [{"version": "0.2.0", "forceUpdateRequired": False}]
+
+    # [GET] /workspaces
+    async def test_get_workspaces_with_invalid_page_size_returns_422(self, app, client) -> None:
+        response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES), params={"page_size": 0})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    # [GET] /workspaces
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_page")
     @patch("api.routes.workspaces.get_identity_role_assignments")
-    @patch("api.routes.workspaces.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.workspaces.enrich_resources_with_available_upgrades", return_value=None)
     async def test_get_workspaces_returns_correct_data_when_resources_exist(self, _, access_service_mock, get_workspaces_mock, app, client) -> None:
         auth_info_user_in_workspace_owner_role = {'sp_id': 'ab123', 'app_role_id_workspace_owner': 'ab124', 'app_role_id_workspace_researcher': 'ab125', 'app_role_id_workspace_airlock_manager': 'ab130'}
         auth_info_user_in_workspace_researcher_role = {'sp_id': 'ab123', 'app_role_id_workspace_owner': 'ab127', 'app_role_id_workspace_researcher': 'ab126', 'app_role_id_workspace_airlock_manager': 'ab130'}
@@ -278,7 +321,7 @@ class TestWorkspaceRoutesThatDontRequireAdminRights:
         valid_ws_2 = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info=auth_info_user_in_workspace_researcher_role)
         invalid_ws = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info=auth_info_user_not_in_workspace_role)
 
-        get_workspaces_mock.return_value = [valid_ws_1, valid_ws_2, invalid_ws]
+        get_workspaces_mock.return_value = ([valid_ws_1, valid_ws_2, invalid_ws], None)
         access_service_mock.return_value = [RoleAssignment('ab123', 'ab124'), RoleAssignment('ab123', 'ab126')]
 
         response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES))
@@ -365,8 +408,8 @@ class TestWorkspaceRoutesThatRequireAdminRights:
         app.dependency_overrides = {}
 
     # [GET] /workspaces
-    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces")
-    @patch("api.routes.workspaces.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.workspaces.WorkspaceRepository.get_active_workspaces_page")
+    @patch("api.routes.workspaces.enrich_resources_with_available_upgrades", return_value=None)
     async def test_get_workspaces_returns_correct_data_when_resources_exist(self, _, get_workspaces_mock, app, client) -> None:
         auth_info_user_in_workspace_owner_role = {'sp_id': 'ab123', 'roles': {'WorkspaceOwner': 'ab124', 'WorkspaceResearcher': 'ab125'}}
         auth_info_user_in_workspace_researcher_role = {'sp_id': 'ab123', 'roles': {'WorkspaceOwner': 'ab127', 'WorkspaceResearcher': 'ab126'}}
@@ -376,7 +419,7 @@ class TestWorkspaceRoutesThatRequireAdminRights:
         valid_ws_2 = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info=auth_info_user_in_workspace_researcher_role)
         valid_ws_3 = sample_workspace(workspace_id=str(uuid.uuid4()), auth_info=auth_info_user_not_in_workspace_role)
 
-        get_workspaces_mock.return_value = [valid_ws_1, valid_ws_2, valid_ws_3]
+        get_workspaces_mock.return_value = ([valid_ws_1, valid_ws_2, valid_ws_3], None)
 
         response = await client.get(app.url_path_for(strings.API_GET_ALL_WORKSPACES))
         workspaces_from_response = response.json()["workspaces"]
@@ -409,7 +452,7 @@ class TestWorkspaceRoutesThatRequireAdminRights:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
 
     # [GET] /workspaces/{workspace_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     @patch("api.routes.workspaces.get_identity_role_assignments")
     async def test_get_workspace_history_returns_workspace_history_result(self, access_service_mock, get_workspace_mock, get_resource_history_mock, app, client):
@@ -419,7 +462,7 @@ class TestWorkspaceRoutesThatRequireAdminRights:
 
         get_workspace_mock.return_value = sample_workspace(auth_info=auth_info_user_in_workspace_owner_role)
         access_service_mock.return_value = [RoleAssignment('ab123', 'ab124')]
-        get_resource_history_mock.return_value = workspace_history
+        get_resource_history_mock.return_value = (workspace_history, None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID))
@@ -431,14 +474,14 @@ class TestWorkspaceRoutesThatRequireAdminRights:
             assert item["resourceId"] == WORKSPACE_ID
 
     # [GET] /workspaces/{workspace_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     @patch("api.routes.workspaces.get_identity_role_assignments")
     async def test_get_workspace_history_returns_empty_list_when_no_history(self, access_service_mock, get_workspace_mock, get_resource_history_mock, app, client):
         auth_info_user_in_workspace_owner_role = {'sp_id': 'ab123', 'client_id': 'cl123', 'app_role_id_workspace_owner': 'ab124', 'app_role_id_workspace_researcher': 'ab125', 'app_role_id_workspace_airlock_manager': 'ab130'}
         get_workspace_mock.return_value = sample_workspace(auth_info=auth_info_user_in_workspace_owner_role)
         access_service_mock.return_value = [RoleAssignment('ab123', 'ab124')]
-        get_resource_history_mock.return_value = []
+        get_resource_history_mock.return_value = ([], None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID))
@@ -682,6 +725,27 @@ class TestWorkspaceRoutesThatRequireAdminRights:
         assert response.status_code == status.HTTP_409_CONFLICT
         assert response.text == strings.ETAG_CONFLICT
 
+    # [PATCH] /workspaces/{workspace_id}
+    @patch("api.routes.resource_helpers.ResourceRepository.get_resource_dependency_list", return_value=[sample_workspace_service().dict(by_alias=True), sample_workspace_service(workspace_service_id="other-service").dict(by_alias=True), sample_workspace().dict(by_alias=True)])
+    @patch("api.routes.resource_helpers.ResourceRepository.patch_resource", side_effect=MajorVersionUpdateDenied("major version upgrade is not allowed"))
+    @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace())
+    @patch("api.routes.workspaces.ResourceTemplateRepository.get_template_by_name_and_version", return_value=None)
+    async def test_patch_workspace_returns_400_if_disabling_workspace_services_is_denied(self, _, __, ___, ____, app, client):
+        response = await client.patch(app.url_path_for(strings.API_UPDATE_WORKSPACE, workspace_id=WORKSPACE_ID), json={"isEnabled": False}, headers={"etag": "some-etag-value"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert SERVICE_ID in response.text and "other-service" in response.text
+
+    # [PATCH] /workspaces/{workspace_id}
+    @patch("api.routes.resource_helpers.ResourceRepository.get_resource_dependency_list", return_value=[sample_workspace_service().dict(by_alias=True), sample_workspace_service(workspace_service_id="other-service").dict(by_alias=True), sample_workspace().dict(by_alias=True)])
+    @patch("api.routes.resource_helpers.ResourceRepository.patch_resource", side_effect=[MajorVersionUpdateDenied("major version upgrade is not allowed"), EntityDoesNotExist])
+    @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace())
+    @patch("api.routes.workspaces.ResourceTemplateRepository.get_template_by_name_and_version", return_value=None)
+    async def test_patch_workspace_returns_the_worst_status_if_disabling_workspace_services_fails_with_different_errors(self, _, __, ___, ____, app, client):
+        response = await client.patch(app.url_path_for(strings.API_UPDATE_WORKSPACE, workspace_id=WORKSPACE_ID), json={"isEnabled": False}, headers={"etag": "some-etag-value"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     # [DELETE] /workspaces/{workspace_id}
     @patch("api.routes.resource_helpers.ResourceRepository.get_resource_dependency_list", return_value=[sample_workspace().__dict__])
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
@@ -862,7 +926,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     # [GET] /workspaces/{workspace_id}/services/{service_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.WorkspaceServiceRepository.get_workspace_service_by_id")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     async def test_get_workspace_service_history_returns_workspace_service_history_result(self, get_workspace_mock, get_workspace_service_mock, get_resource_history_mock, app, client):
@@ -871,7 +935,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
 
         get_workspace_mock.return_value = sample_workspace()
         get_workspace_service_mock.return_value = sample_workspace_service(workspace_id=WORKSPACE_ID)
-        get_resource_history_mock.return_value = workspace_history
+        get_resource_history_mock.return_value = (workspace_history, None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID, service_id=SERVICE_ID))
@@ -883,13 +947,13 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
             assert item["resourceId"] == SERVICE_ID
 
     # [GET] /workspaces/{workspace_id}/services/{service_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.WorkspaceServiceRepository.get_workspace_service_by_id")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     async def test_get_workspace_service_history_returns_empty_list_when_no_history(self, get_workspace_mock, get_workspace_service_mock, get_resource_history_mock, app, client):
         get_workspace_mock.return_value = sample_workspace()
         get_workspace_service_mock.return_value = sample_workspace_service(workspace_id=WORKSPACE_ID)
-        get_resource_history_mock.return_value = []
+        get_resource_history_mock.return_value = ([], None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID, service_id=SERVICE_ID))
@@ -931,7 +995,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
         assert response.json()["operation"]["resourceId"] == workspace_service.id
 
     # GET /workspaces/{workspace_id}/workspace-services/{service_id}/user-resources
-    @patch("api.routes.workspaces.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.workspaces.enrich_resources_with_available_upgrades", return_value=None)
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     @patch("api.routes.workspaces.UserResourceRepository.get_user_resources_for_workspace_service")
     async def test_get_user_resources_returns_all_user_resources_for_workspace_service_if_owner(self, get_user_resources_mock, _, __, app, client):
@@ -961,7 +1025,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
         assert response.json()["userResource"]["id"] == user_resource.id
 
     # [GET] /workspaces/{workspace_id}/services/{service_id}/user-resources/{resource_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id")
     @patch("api.dependencies.workspaces.WorkspaceServiceRepository.get_workspace_service_by_id")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
@@ -972,7 +1036,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
         get_workspace_mock.return_value = sample_workspace()
         get_workspace_service_mock.return_value = sample_workspace_service()
         get_user_resource_mock.return_value = sample_user_resource_object()
-        get_resource_history_mock.return_value = workspace_history
+        get_resource_history_mock.return_value = (workspace_history, None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID, service_id=SERVICE_ID, resource_id=USER_RESOURCE_ID))
@@ -984,7 +1048,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
             assert item["resourceId"] == USER_RESOURCE_ID
 
     # [GET] /workspaces/{workspace_id}/services/{service_id}/user-resources/{resource_id}/history
-    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id")
+    @patch("api.routes.shared_services.ResourceHistoryRepository.get_resource_history_by_resource_id_page")
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id")
     @patch("api.dependencies.workspaces.WorkspaceServiceRepository.get_workspace_service_by_id")
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
@@ -994,7 +1058,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
         get_workspace_mock.return_value = workspace
         get_workspace_service_mock.return_value = sample_workspace_service()
         get_user_resource_mock.return_value = sample_user_resource_object()
-        get_resource_history_mock.return_value = []
+        get_resource_history_mock.return_value = ([], None)
 
         response = await client.get(
             app.url_path_for(strings.API_GET_RESOURCE_HISTORY, workspace_id=WORKSPACE_ID, service_id=SERVICE_ID, resource_id=USER_RESOURCE_ID))
@@ -1069,7 +1133,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.update_item_with_etag", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.get_timestamp", return_value=FAKE_UPDATE_TIMESTAMP)
-    @patch("db.repositories.resources.ResourceRepository.create", return_value=AsyncMock())
+    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=sample_workspace_service())
     async def test_patch_user_resource_with_upgrade_major_version_returns_bad_request(self, _, __, ___, ____, _____, ______, _______, ________, _________, __________, app, client):
         user_resource_service_patch = {"templateVersion": "2.0.0"}
         etag = "some-etag-value"
@@ -1095,9 +1159,8 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.update_item_with_etag", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.get_timestamp", return_value=FAKE_UPDATE_TIMESTAMP)
-    @patch("db.repositories.resources.ResourceRepository.create", return_value=AsyncMock())
-    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=AsyncMock())
-    async def test_patch_user_resource_with_upgrade_major_version_and_force_update_returns_patched_user_resource(self, _, __, ___, update_item_mock, ____, _____, ______, _______, ________, _________, resource_history_repo_save_item_mock, app, client):
+    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=sample_workspace_service())
+    async def test_patch_user_resource_with_upgrade_major_version_and_force_update_returns_patched_user_resource(self, _, __, update_item_mock, ____, _____, ______, _______, ________, _________, resource_history_repo_save_item_mock, app, client):
         user_resource_service_patch = {"templateVersion": "2.0.0"}
         etag = "some-etag-value"
 
@@ -1124,7 +1187,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.update_item_with_etag", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.get_timestamp", return_value=FAKE_UPDATE_TIMESTAMP)
-    @patch("db.repositories.resources.ResourceRepository.create", return_value=AsyncMock())
+    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=sample_workspace_service())
     async def test_patch_user_resource_with_downgrade_version_returns_bad_request(self, _, __, ___, ____, _____, ______, _______, ________, _________, __________, ___________, app, client):
         user_resource_service_patch = {"templateVersion": "0.0.1"}
         etag = "some-etag-value"
@@ -1150,9 +1213,8 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.update_item_with_etag", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.get_timestamp", return_value=FAKE_UPDATE_TIMESTAMP)
-    @patch("db.repositories.resources.ResourceRepository.create", return_value=AsyncMock())
-    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=AsyncMock())
-    async def test_patch_user_resource_with_upgrade_minor_version_patches_user_resource(self, __, ___, ____, update_item_mock, _____, ______, _______, ________, _________, __________, ___________, app, client):
+    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=sample_workspace_service())
+    async def test_patch_user_resource_with_upgrade_minor_version_patches_user_resource(self, __, ___, update_item_mock, _____, ______, _______, ________, _________, __________, ___________, app, client):
         user_resource_service_patch = {"templateVersion": "0.2.0"}
         etag = "some-etag-value"
 
@@ -1177,9 +1239,8 @@ class TestWorkspaceServiceRoutesThatRequireOwnerRights:
     @patch("api.dependencies.workspaces.UserResourceRepository.get_user_resource_by_id", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.update_item_with_etag", return_value=sample_user_resource_object())
     @patch("api.routes.workspaces.UserResourceRepository.get_timestamp", return_value=FAKE_UPDATE_TIMESTAMP)
-    @patch("db.repositories.resources.ResourceRepository.create", return_value=AsyncMock())
-    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=AsyncMock())
-    async def test_patch_user_resource_validates_against_template(self, _, __, ___, update_item_mock, ____, _____, ______, _______, ________, _________, __________, app, client):
+    @patch("db.repositories.resources.ResourceRepository.get_resource_by_id", return_value=sample_workspace_service())
+    async def test_patch_user_resource_validates_against_template(self, _, __, update_item_mock, ____, _____, ______, _______, ________, _________, __________, app, client):
         user_resource_service_patch = {'isEnabled': False, 'properties': {'vm_size': 'large'}}
         etag = "some-etag-value"
 
@@ -1414,7 +1475,7 @@ class TestWorkspaceServiceRoutesThatRequireOwnerOrResearcherRights:
         assert response.status_code == status.HTTP_200_OK
 
     # [GET] /workspaces/{workspace_id}/workspace-services
-    @patch("api.routes.workspaces.enrich_resource_with_available_upgrades", return_value=None)
+    @patch("api.routes.workspaces.enrich_resources_with_available_upgrades", return_value=None)
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace())
     @patch("api.routes.workspaces.WorkspaceServiceRepository.get_active_workspace_services_for_workspace",
            return_value=None)
@@ -1470,7 +1531,16 @@ class TestWorkspaceServiceRoutesThatRequireOwnerOrResearcherRights:
                              service_id=SERVICE_ID))
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
-    @patch("api.routes.workspaces.enrich_resource_with_available_upgrades", return_value=None)
+    # [GET] /workspaces/{workspace_id}/workspace-services/{service_id}
+    @patch("api.dependencies.workspaces.WorkspaceServiceRepository.read_item_by_id", return_value=sample_workspace().dict(by_alias=True))
+    @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id", return_value=sample_workspace())
+    async def test_get_workspace_service_raises_404_if_service_id_is_the_workspace_id(self, _, __, app, client):
+        response = await client.get(
+            app.url_path_for(strings.API_GET_WORKSPACE_SERVICE_BY_ID, workspace_id=WORKSPACE_ID,
+                             service_id=WORKSPACE_ID))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @patch("api.routes.workspaces.enrich_resources_with_available_upgrades", return_value=None)
     @patch("api.dependencies.workspaces.WorkspaceRepository.get_workspace_by_id")
     @patch("api.routes.workspaces.UserResourceRepository.get_user_resources_for_workspace_service")
     async def test_get_user_resources_returns_own_user_resources_for_researcher(self, get_user_resources_mock_awaited_mock, _, __, app, client, non_admin_user):
@@ -26,3 +26,46 @@ async def test_bootstrap_database_failure(cosmos_db_mgmt_client_mock, get_creden
     result = await events.bootstrap_database()
 
     assert result is False
+
+
+@patch("db.events.get_credential")
+@patch("db.events.CosmosDBManagementClient")
+async def test_bootstrap_database_reconciles_indexing_policies(cosmos_db_mgmt_client_mock, _):
+    db_mgmt_client = cosmos_db_mgmt_client_mock.return_value
+
+    await events.bootstrap_database()
+
+    calls = db_mgmt_client.sql_resources.begin_create_update_sql_container.call_args_list
+    resources = {call.kwargs["container_name"]: call.kwargs["create_update_sql_container_parameters"]["resource"] for call in calls}
+    assert set(resources) == set(events.CONTAINERS)
+    assert all(resource["indexing_policy"]["indexing_mode"] == "consistent" for resource in resources.values())
+    assert {"path": "/properties/*"} in resources["Resources"]["indexing_policy"]["excluded_paths"]
+
+
+async def test_indexing_policy_declares_composite_indexes_in_both_directions():
+    policy = events.indexing_policy(excluded_paths=["/history/*"], composite_indexes=[["/workspaceId", "/createdWhen"]])
+
+    assert policy["excluded_paths"] == [{"path": "/history/*"}, {"path": '/"_etag"/?'}]
+    assert policy["composite_indexes"] == [
+        [{"path": "/workspaceId", "order": "ascending"}, {"path": "/createdWhen", "order": "ascending"}],
+        [{"path": "/workspaceId", "order": "descending"}, {"path": "/createdWhen", "order": "descending"}]
+    ]
+
+
+@patch("db.events.Database.get_container_proxy")
+async def test_get_index_transformation_progress_reads_progress_header(get_container_proxy_mock):
+    async def read(populate_quota_info, response_hook):
+        assert populate_quota_info
+        response_hook({events.INDEX_TRANSFORMATION_PROGRESS_HEADER: "60"}, None)
+        return {"indexingPolicy": {"indexingMode": "consistent", "compositeIndexes": [[], []]}}
+
+    container = MagicMock()
+    container.read = read
+    get_container_proxy_mock.return_value = container
+
+    progress = await events.get_index_transformation_progress()
+
+    assert len(progress) == len(events.CONTAINERS)
+    assert progress[0].progress == 60
+    assert progress[0].indexingMode == "consistent"
+    assert progress[0].compositeIndexes == 2
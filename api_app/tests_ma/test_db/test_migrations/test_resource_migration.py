@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock
+import pytest
+import pytest_asyncio
+from mock import patch
+
+from db.migrations.resources import ResourceMigration, resource_path
+from models.domain.resource import ResourceType
+
+pytestmark = pytest.mark.asyncio
+
+WORKSPACE_ID = "933ad738-7265-4b5f-9eae-a1a62928772e"
+SERVICE_ID = "abcad738-7265-4b5f-9eae-a1a62928772e"
+USER_RESOURCE_ID = "a33ad738-7265-4b5f-9eae-a1a62928772a"
+
+
+@pytest_asyncio.fixture
+async def resource_migration():
+    with patch('api.dependencies.database.Database.get_container_proxy', return_value=None):
+        resource_migration = await ResourceMigration.create()
+        yield resource_migration
+
+
+async def test_resource_path_matches_the_paths_set_on_create():
+    assert resource_path({"id": WORKSPACE_ID, "resourceType": ResourceType.Workspace}) == f"/workspaces/{WORKSPACE_ID}"
+    assert resource_path({"id": SERVICE_ID, "workspaceId": WORKSPACE_ID, "resourceType": ResourceType.WorkspaceService}) == f"/workspaces/{WORKSPACE_ID}/workspace-services/{SERVICE_ID}"
+    assert resource_path({"id": USER_RESOURCE_ID, "workspaceId": WORKSPACE_ID, "parentWorkspaceServiceId": SERVICE_ID, "resourceType": ResourceType.UserResource}) == f"/workspaces/{WORKSPACE_ID}/workspace-services/{SERVICE_ID}/user-resources/{USER_RESOURCE_ID}"
+    assert resource_path({"id": SERVICE_ID, "resourceType": ResourceType.SharedService}) == f"/shared-services/{SERVICE_ID}"
+    assert resource_path({"id": SERVICE_ID}) is None
+
+
+async def test_backfill_resource_paths_updates_resources_without_a_path(resource_migration):
+    resource_migration.query = AsyncMock(return_value=[
+        {"id": WORKSPACE_ID, "resourceType": ResourceType.Workspace},
+        {"id": "unknown", "resourceType": "unknown"}
+    ])
+    resource_migration.update_item_dict = AsyncMock()
+
+    num_updated = await resource_migration.backfill_resource_paths()
+
+    assert num_updated == 1
+    resource_migration.update_item_dict.assert_awaited_once_with({"id": WORKSPACE_ID, "resourceType": ResourceType.Workspace, "resourcePath": f"/workspaces/{WORKSPACE_ID}"})
@@ -220,8 +220,52 @@ async def test_get_airlock_requests_with_multiple_filters(airlock_request_repo):
     airlock_request_repo.container.query_items.assert_called_once_with(query=expected_query, parameters=expected_parameters)
 
 
+@patch('db.repositories.airlock_requests.AIRLOCK_MANAGER_WORKSPACES_PER_QUERY', 2)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_manager_workspace_ids', new_callable=AsyncMock, return_value=["ws1", "ws2", "ws3"])
+async def test_get_airlock_requests_for_airlock_manager_merges_ordered_chunks(_, get_requests_for_workspaces_mock, airlock_request_repo):
+    def _request(request_id, updated_when):
+        return AirlockRequest(id=request_id, workspaceId=WORKSPACE_ID, type=AirlockRequestType.Import, updatedWhen=updated_when)
+    get_requests_for_workspaces_mock.side_effect = [[_request("1", 30), _request("2", 10)], [_request("3", 20)]]
+
+    result = await airlock_request_repo.get_airlock_requests_for_airlock_manager("user1", order_by="updatedWhen", order_ascending=False)
+
+    assert [call.kwargs["workspace_ids"] for call in get_requests_for_workspaces_mock.call_args_list] == [["ws1", "ws2"], ["ws3"]]
+    assert [request.id for request in result] == ["1", "3", "2"]
+
+
+@patch.object(AirlockRequestRepository, 'query', new_callable=AsyncMock, return_value=[])
+async def test_get_airlock_requests_for_workspaces_uses_single_query(query_mock, airlock_request_repo):
+    await airlock_request_repo.get_airlock_requests_for_workspaces(["ws1", "ws2"], order_by="updatedWhen")
+
+    query_mock.assert_called_once_with(
+        query='SELECT * FROM c WHERE ARRAY_CONTAINS(@workspace_ids, c.workspaceId) ORDER BY c.updatedWhen ASC',
+        parameters=[{"name": "@workspace_ids", "value": ["ws1", "ws2"]}])
+
+
+@patch.object(AirlockRequestRepository, 'query_page', new_callable=AsyncMock, return_value=([], "next-page"))
+@patch.object(AirlockRequestRepository, 'get_airlock_manager_workspace_ids', new_callable=AsyncMock, return_value=["ws1", "ws2"])
+async def test_get_airlock_requests_for_airlock_manager_page_queries_all_managed_workspaces_at_once(_, query_page_mock, airlock_request_repo):
+    requests, continuation = await airlock_request_repo.get_airlock_requests_for_airlock_manager_page("user1", status=IN_REVIEW, page_size=10, continuation="this-page")
+
+    query_page_mock.assert_called_once_with(
+        query='SELECT * FROM c WHERE ARRAY_CONTAINS(@workspace_ids, c.workspaceId) AND c.status=@status',
+        parameters=[{"name": "@workspace_ids", "value": ["ws1", "ws2"]}, {"name": "@status", "value": IN_REVIEW}],
+        page_size=10,
+        continuation="this-page")
+    assert requests == []
+    assert continuation == "next-page"
+
+
+@patch.object(AirlockRequestRepository, 'query_page', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_manager_workspace_ids', new_callable=AsyncMock, return_value=[])
+async def test_get_airlock_requests_for_airlock_manager_page_without_managed_workspaces_returns_empty_page(_, query_page_mock, airlock_request_repo):
+    assert await airlock_request_repo.get_airlock_requests_for_airlock_manager_page("user1", page_size=10) == ([], None)
+    query_page_mock.assert_not_called()
+
+
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_no_roles(
@@ -231,11 +275,11 @@ async def test_get_airlock_requests_for_airlock_manager_no_roles(
     airlock_request_repo
 ):
     # Mock no user roles
-    mock_access_service.return_value.get_identity_role_assignments.return_value = []
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[])
 
     # Mock active workspaces
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     # Call function
@@ -248,7 +292,7 @@ async def test_get_airlock_requests_for_airlock_manager_no_roles(
 
 
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_single_workspace(
@@ -260,12 +304,12 @@ async def test_get_airlock_requests_for_airlock_manager_single_workspace(
     # Setup workspace and manager role
     workspace = sample_workspace(workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-1"})
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[workspace])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[workspace])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     # Setup user roles
     role_assignment = RoleAssignment(resource_id="resource_id", role_id="manager-role-1")
-    mock_access_service.return_value.get_identity_role_assignments.return_value = [role_assignment]
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[role_assignment])
 
     # Setup corresponding requests from that workspace
     request_mock = AirlockRequest(id="request-1", workspaceId=WORKSPACE_ID, type=AirlockRequestType.Import, reviews=[])
@@ -276,11 +320,11 @@ async def test_get_airlock_requests_for_airlock_manager_single_workspace(
 
     assert len(result) == 1
     assert result[0].id == "request-1"
-    mock_get_requests.assert_called_once_with(workspace_id=WORKSPACE_ID, type=None, status=None, order_by=None, order_ascending=True)
+    mock_get_requests.assert_called_once_with(workspace_ids=[WORKSPACE_ID], type=None, status=None, order_by=None, order_ascending=True)
 
 
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_multiple_workspaces(
@@ -293,31 +337,31 @@ async def test_get_airlock_requests_for_airlock_manager_multiple_workspaces(
     workspace1 = sample_workspace(workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-1"})
     workspace2 = sample_workspace(workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-2"})
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[workspace1, workspace2])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[workspace1, workspace2])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     # Setup user roles
     role_assignment_1 = RoleAssignment(resource_id="resource_id", role_id="manager-role-1")
     role_assignment_2 = RoleAssignment(resource_id="resource_id", role_id="manager-role-2")
-    mock_access_service.return_value.get_identity_role_assignments.return_value = [role_assignment_1, role_assignment_2]
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[role_assignment_1, role_assignment_2])
 
     # Setup requests for each workspace
     first_ws_requests = [AirlockRequest(id="request-1", workspaceId="workspace-1", type=AirlockRequestType.Import, reviews=[])]
     second_ws_requests = [AirlockRequest(id="request-2", workspaceId="workspace-2", type=AirlockRequestType.Import, reviews=[])]
-    mock_get_requests.side_effect = [first_ws_requests, second_ws_requests]
+    mock_get_requests.return_value = first_ws_requests + second_ws_requests
 
     user = User(id="user1", name="TestUser")
     result = await airlock_request_repo.get_airlock_requests_for_airlock_manager(user)
 
-    # combined requests from both
+    # combined requests from both, with a single query
     assert len(result) == 2
     assert result[0].id == "request-1"
     assert result[1].id == "request-2"
-    assert mock_get_requests.call_count == 2
+    assert mock_get_requests.call_count == 1
 
 
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_active_workspaces_but_no_manager_role(
@@ -330,13 +374,13 @@ async def test_get_airlock_requests_for_airlock_manager_active_workspaces_but_no
     workspace1 = sample_workspace(workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-1"})
     workspace2 = sample_workspace(workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-2"})
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[workspace1, workspace2])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[workspace1, workspace2])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     # No matching roles for these workspaces
-    mock_access_service.return_value.get_identity_role_assignments.return_value = [
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[
         RoleAssignment(resource_id="resource_id", role_id="some-other-role")
-    ]
+    ])
 
     user = User(id="user1", name="TestUser")
     result = await airlock_request_repo.get_airlock_requests_for_airlock_manager(user)
@@ -345,7 +389,7 @@ async def test_get_airlock_requests_for_airlock_manager_active_workspaces_but_no
 
 
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_passes_correct_arguments(
@@ -354,18 +398,18 @@ async def test_get_airlock_requests_for_airlock_manager_passes_correct_arguments
     mock_get_requests,
     airlock_request_repo
 ):
-    """Test that get_airlock_requests_for_airlock_manager passes correct arguments to get_airlock_requests"""
+    """Test that get_airlock_requests_for_airlock_manager passes correct arguments to get_airlock_requests_for_workspaces"""
     # Setup workspaces
     workspace1 = sample_workspace(workspace_id="workspace-1", workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-1"})
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[workspace1])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[workspace1])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     # Setup user roles
     role_assignment = RoleAssignment(resource_id="resource_id", role_id="manager-role-1")
-    mock_access_service.return_value.get_identity_role_assignments.return_value = [role_assignment]
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[role_assignment])
 
-    # Setup return value for get_airlock_requests
+    # Setup return value for get_airlock_requests_for_workspaces
     mock_get_requests.return_value = []
 
     user_id = "test-user-id"
@@ -383,9 +427,9 @@ async def test_get_airlock_requests_for_airlock_manager_passes_correct_arguments
         order_ascending=test_order_ascending
     )
 
-    # Verify get_airlock_requests was called with all correct arguments
+    # Verify get_airlock_requests_for_workspaces was called with all correct arguments
     mock_get_requests.assert_called_once_with(
-        workspace_id="workspace-1",  # This is crucial - workspace_id should be passed
+        workspace_ids=["workspace-1"],  # This is crucial - the workspace ids should be passed
         type=test_type,
         status=test_status,
         order_by=test_order_by,
@@ -394,7 +438,7 @@ async def test_get_airlock_requests_for_airlock_manager_passes_correct_arguments
 
 
 @pytest.mark.asyncio
-@patch.object(AirlockRequestRepository, 'get_airlock_requests', new_callable=AsyncMock)
+@patch.object(AirlockRequestRepository, 'get_airlock_requests_for_workspaces', new_callable=AsyncMock)
 @patch('db.repositories.airlock_requests.get_aad_service', autospec=True)
 @patch('db.repositories.airlock_requests.WorkspaceRepository', autospec=True)
 async def test_get_airlock_requests_for_airlock_manager_argument_compatibility(
@@ -407,11 +451,11 @@ async def test_get_airlock_requests_for_airlock_manager_argument_compatibility(
     # Setup minimal required mocks
     workspace1 = sample_workspace(workspace_id="workspace-1", workspace_properties={"app_role_id_workspace_airlock_manager": "manager-role-1"})
     mock_workspace_instance = MagicMock()
-    mock_workspace_instance.get_active_workspaces = AsyncMock(return_value=[workspace1])
+    mock_workspace_instance.get_active_workspace_views = AsyncMock(return_value=[workspace1])
     mock_workspace_repo.create = AsyncMock(return_value=mock_workspace_instance)
 
     role_assignment = RoleAssignment(resource_id="resource_id", role_id="manager-role-1")
-    mock_access_service.return_value.get_identity_role_assignments.return_value = [role_assignment]
+    mock_access_service.return_value.get_identity_role_assignments = AsyncMock(return_value=[role_assignment])
     mock_get_requests.return_value = []
 
     # Test that all these parameter combinations don't cause TypeErrors
@@ -1,8 +1,10 @@
 import pytest
-from mock import patch
+from azure.cosmos.exceptions import CosmosHttpResponseError
+from mock import MagicMock, patch
 
-from db.errors import UnableToAccessDatabase
+from db.errors import InvalidContinuationToken, UnableToAccessDatabase
 from db.repositories.base import BaseRepository
+from models.domain.workspace import WorkspaceSummary
 
 pytestmark = pytest.mark.asyncio
 
@@ -12,3 +14,95 @@ async def test_instantiating_a_repo_raises_unable_to_access_database_if_database
     get_container_proxy_mock.side_effect = Exception()
     with pytest.raises(UnableToAccessDatabase):
         await BaseRepository.create()
+
+
+async def test_create_returns_a_repository_instance_without_mutating_the_class():
+    repo = await BaseRepository.create("test_container")
+
+    assert isinstance(repo, BaseRepository)
+    assert "_container" in vars(repo)
+    assert "_container" not in vars(BaseRepository)
+
+
+class _AsyncList:
+    def __init__(self, items):
+        self._items = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _Pages(_AsyncList):
+    def __init__(self, pages, continuation_token):
+        super().__init__([_AsyncList(page) for page in pages])
+        self.continuation_token = continuation_token
+
+
+async def test_query_page_returns_all_items_when_paging_is_not_requested():
+    repo = await BaseRepository.create("test_container")
+    repo._container = MagicMock()
+    repo._container.query_items.return_value = _AsyncList([{"id": "1"}, {"id": "2"}])
+
+    items, continuation = await repo.query_page(query="SELECT * FROM c")
+
+    assert items == [{"id": "1"}, {"id": "2"}]
+    assert continuation is None
+
+
+async def test_query_page_reads_a_single_page_and_returns_its_continuation_token():
+    repo = await BaseRepository.create("test_container")
+    repo._container = MagicMock()
+    pages = _Pages([[{"id": "2"}], [{"id": "3"}]], "next-page")
+    repo._container.query_items.return_value.by_page.return_value = pages
+
+    items, continuation = await repo.query_page(query="SELECT * FROM c", page_size=1, continuation="this-page")
+
+    repo._container.query_items.assert_called_once_with(query="SELECT * FROM c", parameters=None, max_item_count=1)
+    repo._container.query_items.return_value.by_page.assert_called_once_with("this-page")
+    assert items == [{"id": "2"}]
+    assert continuation == "next-page"
+
+
+@pytest.mark.parametrize("error", [CosmosHttpResponseError(status_code=400, message="Invalid continuation token"), ValueError("Invalid continuation token")])
+async def test_query_page_raises_invalid_continuation_token_if_the_token_is_rejected(error):
+    repo = await BaseRepository.create("test_container")
+    repo._container = MagicMock()
+    repo._container.query_items.return_value.by_page.side_effect = error
+
+    with pytest.raises(InvalidContinuationToken):
+        await repo.query_page(query="SELECT * FROM c", page_size=1, continuation="expired-page")
+
+
+async def test_query_page_reraises_other_cosmos_errors():
+    repo = await BaseRepository.create("test_container")
+    repo._container = MagicMock()
+    repo._container.query_items.return_value.by_page.side_effect = CosmosHttpResponseError(status_code=503, message="Service unavailable")
+
+    with pytest.raises(CosmosHttpResponseError):
+        await repo.query_page(query="SELECT * FROM c", page_size=1, continuation="this-page")
+
+
+async def test_query_view_only_selects_the_view_fields():
+    repo = await BaseRepository.create("test_container")
+    repo._container = MagicMock()
+    repo._container.query_items.return_value = _AsyncList([{"id": "1", "templateName": "tre-workspace-base", "properties": {"display_name": "ws"}}])
+
+    workspaces = await repo.query_view(WorkspaceSummary, query="SELECT * FROM c WHERE c.resourceType = @resourceType", parameters=[])
+
+    repo._container.query_items.assert_called_once_with(
+        query='SELECT c.id, c.templateName, {"display_name": c.properties["display_name"], "workspace_subscription_id": c.properties["workspace_subscription_id"]} AS properties FROM c WHERE c.resourceType = @resourceType',
+        parameters=[])
+    assert workspaces == [WorkspaceSummary(id="1", templateName="tre-workspace-base", properties={"display_name": "ws"})]
+
+
+async def test_query_view_raises_value_error_for_projected_queries():
+    repo = await BaseRepository.create("test_container")
+
+    with pytest.raises(ValueError):
+        await repo.query_view(WorkspaceSummary, query="SELECT c.id FROM c")
@@ -2,7 +2,9 @@ from unittest.mock import AsyncMock
 import uuid
 import pytest_asyncio
 import pytest
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from mock import patch
+from db.errors import EntityDoesNotExist
 from db.repositories.resource_templates import ResourceTemplateRepository
 from models.domain.operation import Status
 from db.repositories.resources import ResourceRepository
@@ -65,3 +67,52 @@ async def test_create_operation_steps_from_multi_step_template(_, __, ___, resou
     )
 
     assert operation.dict() == expected_op.dict()
+
+
+async def test_get_operation_by_id_point_reads_db(operations_repo, multi_step_operation):
+    operations_repo.read_item_by_id = AsyncMock(return_value=multi_step_operation.dict())
+
+    operation = await operations_repo.get_operation_by_id(OPERATION_ID)
+
+    operations_repo.read_item_by_id.assert_called_once_with(OPERATION_ID)
+    assert operation == multi_step_operation
+
+
+async def test_get_operation_by_id_raises_entity_does_not_exist_if_not_found(operations_repo):
+    operations_repo.read_item_by_id = AsyncMock(side_effect=CosmosResourceNotFoundError)
+
+    with pytest.raises(EntityDoesNotExist):
+        await operations_repo.get_operation_by_id(OPERATION_ID)
+
+
+async def test_get_my_operations_queries_with_parameters(operations_repo):
+    operations_repo.query = AsyncMock(return_value=[])
+
+    await operations_repo.get_my_operations("user-id")
+
+    query = operations_repo.query.call_args.kwargs["query"]
+    parameters = operations_repo.query.call_args.kwargs["parameters"]
+    assert "user-id" not in query
+    assert "c.status IN (@status_0, " in query
+    assert {"name": "@userId", "value": "user-id"} in parameters
+    assert {"name": "@status_0", "value": Status.AwaitingAction} in parameters
+
+
+async def test_resource_has_deployed_operation_checks_existence_with_top_1(operations_repo):
+    operations_repo.query = AsyncMock(return_value=[1])
+
+    assert await operations_repo.resource_has_deployed_operation(RESOURCE_ID)
+
+    query = operations_repo.query.call_args.kwargs["query"]
+    assert query.startswith("SELECT TOP 1 VALUE 1 FROM c")
+    assert {"name": "@resourceId", "value": RESOURCE_ID} in operations_repo.query.call_args.kwargs["parameters"]
+
+
+async def test_resource_has_deployed_operation_caches_only_once_deployed(operations_repo):
+    operations_repo.query = AsyncMock(side_effect=[[], [1]])
+
+    assert not await operations_repo.resource_has_deployed_operation(RESOURCE_ID)
+    assert await operations_repo.resource_has_deployed_operation(RESOURCE_ID)
+    assert await operations_repo.resource_has_deployed_operation(RESOURCE_ID)
+
+    assert operations_repo.query.await_count == 2
@@ -0,0 +1,41 @@
+import pytest
+from mock import patch
+
+from db.errors import UnableToAccessDatabase
+from db.repositories.registry import RepositoryRegistry
+from db.repositories.resources import ResourceRepository
+from db.repositories.workspaces import WorkspaceRepository
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_returns_the_same_repository_instance():
+    first = await RepositoryRegistry.get(WorkspaceRepository)
+    second = await RepositoryRegistry.get(WorkspaceRepository)
+
+    assert first is second
+    assert isinstance(first, WorkspaceRepository)
+
+
+async def test_get_returns_a_repository_per_type():
+    workspace_repo = await RepositoryRegistry.get(WorkspaceRepository)
+    resource_repo = await RepositoryRegistry.get(ResourceRepository)
+
+    assert type(workspace_repo) is WorkspaceRepository
+    assert type(resource_repo) is ResourceRepository
+
+
+async def test_initialize_creates_each_repository_once():
+    with patch.object(WorkspaceRepository, "create", wraps=WorkspaceRepository.create) as create_mock:
+        await RepositoryRegistry.initialize([WorkspaceRepository])
+        await RepositoryRegistry.get(WorkspaceRepository)
+
+    create_mock.assert_called_once()
+
+
+@patch("api.dependencies.database.Database.get_container_proxy", side_effect=Exception())
+async def test_get_does_not_cache_failures(_):
+    with pytest.raises(UnableToAccessDatabase):
+        await RepositoryRegistry.get(WorkspaceRepository)
+
+    assert WorkspaceRepository not in RepositoryRegistry._repositories
@@ -371,13 +371,13 @@ async def test_patch_resource_preserves_property_history(_, __, ___, resource_re
     resource_repo.update_item_with_etag.assert_called_with(expected_resource, etag)
 
 
-@patch('db.repositories.resources.ResourceTemplateRepository.enrich_template')
+@patch('db.repositories.resources.ResourceTemplateRepository.get_shared_enriched_template')
 def test_validate_patch_with_good_fields_passes(template_repo, resource_repo):
     """
     Make sure that patch is NOT valid when non-updateable fields are included
     """
 
-    template_repo.enrich_template = MagicMock(return_value=sample_resource_template())
+    template_repo.get_shared_enriched_template = MagicMock(return_value=sample_resource_template())
     template = sample_resource_template()
 
     # check it's valid when updating a single updateable prop
@@ -385,13 +385,13 @@ def test_validate_patch_with_good_fields_passes(template_repo, resource_repo):
     resource_repo.validate_patch(patch, template_repo, template, strings.RESOURCE_ACTION_UPDATE)
 
 
-@patch('db.repositories.resources.ResourceTemplateRepository.enrich_template')
+@patch('db.repositories.resources.ResourceTemplateRepository.get_shared_enriched_template')
 def test_validate_patch_with_bad_fields_fails(template_repo, resource_repo):
     """
     Make sure that patch is NOT valid when non-updateable fields are included
     """
 
-    template_repo.enrich_template = MagicMock(return_value=sample_resource_template())
+    template_repo.get_shared_enriched_template = MagicMock(return_value=sample_resource_template())
     template = sample_resource_template()
 
     # check it's invalid when sending an unexpected field
@@ -408,3 +408,21 @@ def test_validate_patch_with_bad_fields_fails(template_repo, resource_repo):
     patch = ResourcePatch(isEnabled=True, properties={'vm_size': 'large', 'os_image': 'linux'})
     with pytest.raises(ValidationError):
         resource_repo.validate_patch(patch, template_repo, template, strings.RESOURCE_ACTION_INSTALL)
+
+
+@pytest.mark.asyncio
+async def test_get_resource_dependency_list_queries_subtree_by_path_prefix(resource_repo):
+    workspace = sample_resource()
+    workspace.resourcePath = f"/workspaces/{RESOURCE_ID}"
+    user_resource = {"id": "user-resource", "resourcePath": f"/workspaces/{RESOURCE_ID}/workspace-services/service/user-resources/user-resource"}
+    workspace_service = {"id": "service", "resourcePath": f"/workspaces/{RESOURCE_ID}/workspace-services/service"}
+    resource_repo.query = AsyncMock(return_value=[{"id": RESOURCE_ID, "resourcePath": workspace.resourcePath}, workspace_service, user_resource])
+
+    dependencies = await resource_repo.get_resource_dependency_list(workspace)
+
+    query = resource_repo.query.call_args.kwargs["query"]
+    parameters = resource_repo.query.call_args.kwargs["parameters"]
+    assert "STARTSWITH(c.resourcePath, @childResourcePath)" in query
+    assert "CONTAINS" not in query
+    assert {"name": "@childResourcePath", "value": f"/workspaces/{RESOURCE_ID}/"} in parameters
+    assert [resource["id"] for resource in dependencies] == ["user-resource", "service", RESOURCE_ID]
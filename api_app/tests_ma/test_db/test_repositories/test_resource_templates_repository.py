@@ -1,9 +1,12 @@
+from datetime import datetime, UTC
+
 import pytest
 import pytest_asyncio
-from mock import patch
+from mock import MagicMock, call, patch
 from models.domain.user_resource_template import UserResourceTemplate
 
 from db.repositories.resource_templates import ResourceTemplateRepository
+from db.repositories.template_cache import current_template_key, template_cache
 from db.errors import EntityDoesNotExist, InvalidInput
 from models.domain.resource import ResourceType
 from models.domain.resource_template import ResourceTemplate
@@ -144,6 +147,127 @@ async def test_get_current_by_name_raises_entity_does_not_exist_if_no_template_f
         await resource_template_repo.get_current_template(template_name="template1", resource_type=ResourceType.Workspace)
 
 
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.query')
+async def test_get_current_by_name_is_served_from_cache_on_repeated_lookups(query_mock, resource_template_repo):
+    query_mock.return_value = [sample_resource_template_as_dict(name="template1")]
+
+    first = await resource_template_repo.get_current_template(template_name="template1", resource_type=ResourceType.Workspace)
+    second = await resource_template_repo.get_current_template(template_name="template1", resource_type=ResourceType.Workspace)
+
+    query_mock.assert_called_once()
+    assert first == second
+    assert first is not second
+
+
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.query')
+async def test_get_template_by_name_and_version_is_served_from_cache_on_repeated_lookups(query_mock, resource_template_repo):
+    query_mock.return_value = [sample_resource_template_as_dict(name="template1", version="1.0")]
+
+    await resource_template_repo.get_template_by_name_and_version(name="template1", version="1.0", resource_type=ResourceType.Workspace)
+    await resource_template_repo.get_template_by_name_and_version(name="template1", version="1.0", resource_type=ResourceType.Workspace)
+    query_mock.return_value = [sample_resource_template_as_dict(name="template1", version="2.0")]
+    await resource_template_repo.get_template_by_name_and_version(name="template1", version="2.0", resource_type=ResourceType.Workspace)
+
+    assert query_mock.call_count == 2
+
+
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.create_template')
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.update_item')
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.get_template_by_name_and_version', side_effect=EntityDoesNotExist)
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.query')
+async def test_create_and_validate_template_invalidates_cached_current_template(query_mock, _, __, create_template_mock, resource_template_repo, input_workspace_template):
+    query_mock.return_value = [sample_resource_template_as_dict(name=input_workspace_template.name)]
+    create_template_mock.return_value = ResourceTemplate(**sample_resource_template_as_dict(name=input_workspace_template.name, version="2.0"))
+    await resource_template_repo.get_current_template(input_workspace_template.name, ResourceType.Workspace)
+
+    await resource_template_repo.create_and_validate_template(input_workspace_template, ResourceType.Workspace)
+    await resource_template_repo.get_current_template(input_workspace_template.name, ResourceType.Workspace)
+
+    assert query_mock.call_count == 2
+
+
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.query')
+async def test_get_template_version_index_sorts_versions_and_is_cached_until_a_template_changes(query_mock, resource_template_repo):
+    query_mock.return_value = [{"name": "template1", "version": "1.10.0"}, {"name": "template1", "version": "1.2.0"}, {"name": "template2", "version": "0.1.0"}]
+
+    first = await resource_template_repo.get_template_version_index()
+    second = await resource_template_repo.get_template_version_index()
+    template_cache.invalidate("template2")
+    await resource_template_repo.get_template_version_index()
+
+    assert first == {"template1": ["1.2.0", "1.10.0"], "template2": ["0.1.0"]}
+    assert second is first
+    assert query_mock.call_count == 2
+
+
+@patch('db.repositories.resource_templates.ResourceTemplateRepository.query', return_value=[{"name": "template1", "version": "1.2.0"}])
+async def test_get_all_template_versions_returns_versions_from_index(_, resource_template_repo):
+    versions = await resource_template_repo.get_all_template_versions("template1")
+    versions.append("9.9.9")
+
+    assert await resource_template_repo.get_all_template_versions("template1") == ["1.2.0"]
+    assert await resource_template_repo.get_all_template_versions("unknown") == []
+
+
+class ChangeFeedMock:
+    """
+    Change feed pager yielding a page of changes per poll, with the continuation token to resume from.
+    """
+
+    def __init__(self, templates, continuation_token):
+        self._templates = templates
+        self._continuation_token = continuation_token
+        self.continuation_token = None
+
+    def by_page(self):
+        return self
+
+    async def __aiter__(self):
+        if self._templates:
+            self.continuation_token = self._continuation_token
+            yield self._page()
+
+    async def _page(self):
+        for template in self._templates:
+            yield template
+
+
+async def test_invalidate_changed_templates_resumes_from_the_pagers_continuation_token(resource_template_repo):
+    start_time = datetime.now(UTC)
+    resource_template_repo._container = MagicMock()
+    resource_template_repo.container.query_items_change_feed.side_effect = [
+        ChangeFeedMock([], "unused-token"),
+        ChangeFeedMock([sample_resource_template_as_dict(name="template1")], "token-1"),
+        ChangeFeedMock([sample_resource_template_as_dict(name="template2")], "token-2"),
+        ChangeFeedMock([], "unused-token")
+    ]
+    template_cache.set(current_template_key("template1", ResourceType.Workspace, None), ResourceTemplate(**sample_resource_template_as_dict(name="template1")))
+    template_cache.set(current_template_key("template2", ResourceType.Workspace, None), ResourceTemplate(**sample_resource_template_as_dict(name="template2")))
+
+    continuation = None
+    for _ in range(4):
+        continuation = await resource_template_repo._invalidate_changed_templates(continuation, start_time)
+
+    assert resource_template_repo.container.query_items_change_feed.call_args_list == [
+        call(start_time=start_time), call(start_time=start_time), call(continuation="token-1"), call(continuation="token-2")
+    ]
+    assert continuation == "token-2"
+    assert len(template_cache) == 0
+
+
+@patch('db.repositories.resource_templates.ResourceTemplateRepository._enrich_template', return_value={"properties": {}})
+async def test_enrich_template_enriches_each_template_version_once_and_returns_copies(enrich_mock, resource_template_repo):
+    template = ResourceTemplate(**sample_resource_template_as_dict(name="template1"))
+
+    first = resource_template_repo.enrich_template(template)
+    first["properties"]["changed"] = True
+    second = resource_template_repo.enrich_template(template)
+    resource_template_repo.enrich_template(template, is_update=True)
+
+    assert second == {"properties": {}}
+    assert enrich_mock.call_count == 2
+
+
 @patch('db.repositories.resource_templates.ResourceTemplateRepository.query')
 async def test_get_templates_information_returns_unique_template_names(query_mock, resource_template_repo):
     query_mock.return_value = [
@@ -1,12 +1,14 @@
 from unittest.mock import AsyncMock
 import pytest
 import pytest_asyncio
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from mock import patch
 
 from db.errors import DuplicateEntity, EntityDoesNotExist
 from db.repositories.shared_services import SharedServiceRepository
 from db.repositories.operations import OperationRepository
 from models.domain.shared_service import SharedService
+from models.domain.operation import Status
 from models.domain.resource import ResourceType
 from models.schemas.shared_service import SharedServiceInCreate
 
@@ -54,14 +56,15 @@ def basic_shared_service_request():
 
 
 async def test_get_shared_service_by_id_raises_if_does_not_exist(shared_service_repo):
-    shared_service_repo.query = AsyncMock(return_value=[])
+    shared_service_repo.read_item_by_id = AsyncMock(side_effect=CosmosResourceNotFoundError)
 
     with pytest.raises(EntityDoesNotExist):
         await shared_service_repo.get_shared_service_by_id(SHARED_SERVICE_ID)
 
 
-async def test_get_shared_service_by_id_raises_if_deleted(shared_service_repo):
-    shared_service_repo.query = AsyncMock(return_value=[])
+async def test_get_shared_service_by_id_raises_if_deleted(shared_service_repo, shared_service):
+    shared_service.deploymentStatus = Status.Deleted
+    shared_service_repo.read_item_by_id = AsyncMock(return_value=shared_service.dict())
 
     with pytest.raises(EntityDoesNotExist):
         await shared_service_repo.get_shared_service_by_id(SHARED_SERVICE_ID)
@@ -0,0 +1,81 @@
+import time
+
+from mock import patch
+
+from db.repositories.template_cache import TemplateCache, current_template_key, get_template_validator, template_version_key
+from models.domain.resource import ResourceType
+from models.domain.resource_template import ResourceTemplate
+
+
+def sample_template(name: str = "template1", version: str = "1.0") -> ResourceTemplate:
+    return ResourceTemplate(id="a7a7a7bd-7f4e-4a4e-b970-dc86a6b31dfb", name=name, description="test", version=version, resourceType=ResourceType.Workspace, current=True, properties={}, customActions=[], required=[])
+
+
+def test_get_returns_a_copy_of_the_cached_template():
+    cache = TemplateCache(max_size=10, version_index_ttl_seconds=60)
+    key = current_template_key("template1", ResourceType.Workspace, None)
+    cache.set(key, sample_template())
+
+    template = cache.get(key)
+    template.current = False
+
+    assert cache.get(key).current is True
+
+
+def test_least_recently_used_template_is_evicted_when_full():
+    cache = TemplateCache(max_size=2, version_index_ttl_seconds=60)
+    first_key = template_version_key("template1", "1.0", ResourceType.Workspace, None)
+    second_key = template_version_key("template1", "2.0", ResourceType.Workspace, None)
+    third_key = template_version_key("template1", "3.0", ResourceType.Workspace, None)
+    cache.set(first_key, sample_template(version="1.0"))
+    cache.set(second_key, sample_template(version="2.0"))
+
+    cache.get(first_key)
+    cache.set(third_key, sample_template(version="3.0"))
+
+    assert cache.get(first_key) is not None
+    assert cache.get(second_key) is None
+    assert cache.get(third_key) is not None
+
+
+def test_invalidate_drops_every_entry_for_the_template_name():
+    cache = TemplateCache(max_size=10, version_index_ttl_seconds=60)
+    cache.set(current_template_key("template1", ResourceType.Workspace, None), sample_template())
+    cache.set(template_version_key("template1", "1.0", ResourceType.Workspace, None), sample_template())
+    cache.set(current_template_key("template2", ResourceType.Workspace, None), sample_template(name="template2"))
+
+    cache.invalidate("template1")
+
+    assert len(cache) == 1
+
+
+def test_cache_is_disabled_when_max_size_is_zero():
+    cache = TemplateCache(max_size=0, version_index_ttl_seconds=60)
+    key = current_template_key("template1", ResourceType.Workspace, None)
+    cache.set(key, sample_template())
+
+    assert cache.get(key) is None
+
+
+def test_version_index_expires():
+    cache = TemplateCache(max_size=10, version_index_ttl_seconds=60)
+    cache.version_index = {"template1": ["1.0"]}
+
+    assert cache.version_index == {"template1": ["1.0"]}
+    with patch("db.repositories.template_cache.time.monotonic", return_value=time.monotonic() + 61):
+        assert cache.version_index is None
+
+
+def test_get_template_validator_compiles_once_per_template_version_and_kind():
+    schema = sample_template().dict(exclude_none=True)
+
+    validator = get_template_validator(schema, "create")
+
+    assert get_template_validator(schema, "create") is validator
+    assert get_template_validator(schema, "patch") is not validator
+
+
+def test_get_template_validator_does_not_cache_schemas_without_id():
+    schema = {"type": "object", "properties": {}}
+
+    assert get_template_validator(schema, "create") is not get_template_validator(schema, "create")
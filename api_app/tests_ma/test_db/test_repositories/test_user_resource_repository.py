@@ -1,3 +1,4 @@
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from mock import patch
 import pytest
 import pytest_asyncio
@@ -39,7 +40,9 @@ def user_resource():
         properties={},
         etag='',
         templateName="my-user-resource",
-        resourcePath="test"
+        resourcePath="test",
+        workspaceId=WORKSPACE_ID,
+        parentWorkspaceServiceId=SERVICE_ID
     )
     return user_resource
 
@@ -83,39 +86,43 @@ async def test_get_user_resources_for_workspace_queries_db(query_mock, user_reso
     query_mock.assert_called_once_with(query=expected_query, parameters=expected_parameters)
 
 
-@patch('db.repositories.user_resources.UserResourceRepository.query')
-async def test_get_user_resource_returns_resource_if_found(query_mock, user_resource_repo, user_resource):
-    query_mock.return_value = [user_resource.dict()]
+@patch('db.repositories.user_resources.UserResourceRepository.read_item_by_id')
+async def test_get_user_resource_returns_resource_if_found(read_item_mock, user_resource_repo, user_resource):
+    read_item_mock.return_value = user_resource.dict()
 
     actual_resource = await user_resource_repo.get_user_resource_by_id(WORKSPACE_ID, SERVICE_ID, RESOURCE_ID)
 
     assert actual_resource == user_resource
 
 
-@patch('db.repositories.user_resources.UserResourceRepository.query')
-async def test_get_user_resource_by_id_queries_db(query_mock, user_resource_repo, user_resource):
-    query_mock.return_value = [user_resource.dict()]
-    expected_query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.parentWorkspaceServiceId = @serviceId AND c.workspaceId = @workspaceId AND c.id = @resourceId AND c.deploymentStatus != @deletedStatus'
-    expected_parameters = [
-        {'name': '@resourceType', 'value': ResourceType.UserResource},
-        {'name': '@serviceId', 'value': SERVICE_ID},
-        {'name': '@workspaceId', 'value': WORKSPACE_ID},
-        {'name': '@resourceId', 'value': RESOURCE_ID},
-        {'name': '@deletedStatus', 'value': Status.Deleted}
-    ]
+@patch('db.repositories.user_resources.UserResourceRepository.read_item_by_id')
+async def test_get_user_resource_by_id_point_reads_db(read_item_mock, user_resource_repo, user_resource):
+    read_item_mock.return_value = user_resource.dict()
 
     await user_resource_repo.get_user_resource_by_id(WORKSPACE_ID, SERVICE_ID, RESOURCE_ID)
 
-    query_mock.assert_called_once_with(query=expected_query, parameters=expected_parameters)
+    read_item_mock.assert_called_once_with(RESOURCE_ID)
 
 
-@patch('db.repositories.user_resources.UserResourceRepository.query', return_value=[])
+@patch('db.repositories.user_resources.UserResourceRepository.read_item_by_id', side_effect=CosmosResourceNotFoundError)
 async def test_get_user_resource_by_id_raises_entity_does_not_exist_if_not_found(_, user_resource_repo):
     with pytest.raises(EntityDoesNotExist):
         await user_resource_repo.get_user_resource_by_id(WORKSPACE_ID, SERVICE_ID, RESOURCE_ID)
 
 
-@patch('db.repositories.user_resources.UserResourceRepository.query', return_value=[])
-async def test_get_user_resource_by_id_raises_entity_does_not_exist_if_resource_is_deleted(_, user_resource_repo):
+@patch('db.repositories.user_resources.UserResourceRepository.read_item_by_id')
+async def test_get_user_resource_by_id_raises_entity_does_not_exist_if_resource_is_deleted(read_item_mock, user_resource_repo, user_resource):
+    user_resource.deploymentStatus = Status.Deleted
+    read_item_mock.return_value = user_resource.dict()
+
     with pytest.raises(EntityDoesNotExist):
         await user_resource_repo.get_user_resource_by_id(WORKSPACE_ID, SERVICE_ID, RESOURCE_ID)
+
+
+@pytest.mark.parametrize("workspace_id, service_id", [("other-workspace", SERVICE_ID), (WORKSPACE_ID, "other-service")])
+@patch('db.repositories.user_resources.UserResourceRepository.read_item_by_id')
+async def test_get_user_resource_by_id_raises_entity_does_not_exist_if_parent_does_not_match(read_item_mock, workspace_id, service_id, user_resource_repo, user_resource):
+    read_item_mock.return_value = user_resource.dict()
+
+    with pytest.raises(EntityDoesNotExist):
+        await user_resource_repo.get_user_resource_by_id(workspace_id, service_id, RESOURCE_ID)
@@ -2,6 +2,7 @@ import copy
 from unittest.mock import AsyncMock
 import pytest
 import pytest_asyncio
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from mock import patch, MagicMock
 import uuid
 import asyncio
@@ -80,7 +81,7 @@ async def test_get_deployed_workspace_by_id_raises_resource_is_not_deployed_if_n
 @pytest.mark.asyncio
 async def test_get_workspace_by_id_raises_entity_does_not_exist_if_item_does_not_exist(workspace_repo):
     workspace_id = uuid.uuid4()
-    workspace_repo.container.query_items = MagicMock()
+    workspace_repo.container.read_item = AsyncMock(side_effect=CosmosResourceNotFoundError)
 
     with pytest.raises(EntityDoesNotExist):
         await workspace_repo.get_workspace_by_id(workspace_id)
@@ -88,29 +89,31 @@ async def test_get_workspace_by_id_raises_entity_does_not_exist_if_item_does_not
 
 @pytest.mark.asyncio
 async def test_get_workspace_by_id_raises_entity_does_not_exist_if_workspace_is_deleted(workspace_repo, workspace):
-    workspace_id = workspace.id
-    workspace_repo.container.query_items = MagicMock()
-    workspace_repo.container.query_items.return_value = AsyncMock()
-    workspace_repo.container.query_items.return_value.__aiter__.return_value = []
+    workspace.deploymentStatus = Status.Deleted
+    workspace_repo.container.read_item = AsyncMock(return_value=workspace.dict())
 
     with pytest.raises(EntityDoesNotExist):
-        await workspace_repo.get_workspace_by_id(workspace_id)
+        await workspace_repo.get_workspace_by_id(workspace.id)
 
 
 @pytest.mark.asyncio
-async def test_get_workspace_by_id_queries_db(workspace_repo, workspace):
-    workspace_query_item_result = AsyncMock()
-    workspace_query_item_result.__aiter__.return_value = [workspace.dict()]
-    workspace_repo.container.query_items = MagicMock(return_value=workspace_query_item_result)
-    expected_query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.id = @workspaceId AND c.deploymentStatus != @deletedStatus'
-    expected_parameters = [
-        {'name': '@resourceType', 'value': ResourceType.Workspace},
-        {'name': '@workspaceId', 'value': workspace.id},
-        {'name': '@deletedStatus', 'value': Status.Deleted}
-    ]
+async def test_get_workspace_by_id_raises_entity_does_not_exist_if_item_is_not_a_workspace(workspace_repo, workspace):
+    workspace_item = workspace.dict()
+    workspace_item["resourceType"] = ResourceType.WorkspaceService
+    workspace_repo.container.read_item = AsyncMock(return_value=workspace_item)
 
-    await workspace_repo.get_workspace_by_id(workspace.id)
-    workspace_repo.container.query_items.assert_called_once_with(query=expected_query, parameters=expected_parameters)
+    with pytest.raises(EntityDoesNotExist):
+        await workspace_repo.get_workspace_by_id(workspace.id)
+
+
+@pytest.mark.asyncio
+async def test_get_workspace_by_id_point_reads_db(workspace_repo, workspace):
+    workspace_repo.container.read_item = AsyncMock(return_value=workspace.dict())
+
+    actual_workspace = await workspace_repo.get_workspace_by_id(workspace.id)
+
+    workspace_repo.container.read_item.assert_called_once_with(item=workspace.id, partition_key=workspace.id)
+    assert actual_workspace == workspace
 
 
 @pytest.mark.asyncio
@@ -235,7 +238,7 @@ async def test_get_address_space_based_on_size_with_custom_address_space_and_mis
 
 
 @pytest.mark.asyncio
-@patch('db.repositories.workspaces.WorkspaceRepository.get_active_workspaces')
+@patch('db.repositories.workspaces.WorkspaceRepository.get_active_workspace_views')
 @patch('core.config.RESOURCE_LOCATION', "useast2")
 @patch('core.config.TRE_ID', "9876")
 @patch('core.config.CORE_ADDRESS_SPACE', "10.1.0.0/22")
@@ -252,7 +255,7 @@ async def test_get_address_space_based_on_size_with_address_space_only(get_activ
 
 
 @pytest.mark.asyncio
-@patch('db.repositories.workspaces.WorkspaceRepository.get_active_workspaces')
+@patch('db.repositories.workspaces.WorkspaceRepository.get_active_workspace_views')
 @patch('core.config.RESOURCE_LOCATION', "useast2")
 @patch('core.config.TRE_ID', "9876")
 @patch('core.config.CORE_ADDRESS_SPACE', "10.1.0.0/22")
@@ -1,4 +1,5 @@
 from unittest.mock import AsyncMock
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
 from mock import patch, MagicMock
 import pytest
 import pytest_asyncio
@@ -44,7 +45,8 @@ def workspace_service():
         etag='',
         properties={},
         templateName="my-workspace-service",
-        resourcePath="test"
+        resourcePath="test",
+        workspaceId=WORKSPACE_ID
     )
     return workspace_service
 
@@ -80,32 +82,35 @@ async def test_get_deployed_workspace_service_by_id_return_workspace_service_if_
 
 
 async def test_get_workspace_service_by_id_raises_entity_does_not_exist_if_no_available_services(workspace_service_repo):
-    workspace_service_repo.query = AsyncMock(return_value=[])
+    workspace_service_repo.read_item_by_id = AsyncMock(side_effect=CosmosResourceNotFoundError)
 
     with pytest.raises(EntityDoesNotExist):
         await workspace_service_repo.get_workspace_service_by_id(WORKSPACE_ID, SERVICE_ID)
 
 
-async def test_get_workspace_service_by_id_raises_entity_does_not_exist_if_service_is_deleted(workspace_service_repo):
-    workspace_service_repo.query = AsyncMock(return_value=[])
+async def test_get_workspace_service_by_id_raises_entity_does_not_exist_if_service_is_deleted(workspace_service_repo, workspace_service):
+    workspace_service.deploymentStatus = Status.Deleted
+    workspace_service_repo.read_item_by_id = AsyncMock(return_value=workspace_service.dict())
+
+    with pytest.raises(EntityDoesNotExist):
+        await workspace_service_repo.get_workspace_service_by_id(WORKSPACE_ID, SERVICE_ID)
+
+
+async def test_get_workspace_service_by_id_raises_entity_does_not_exist_if_in_another_workspace(workspace_service_repo, workspace_service):
+    workspace_service.workspaceId = "another-workspace"
+    workspace_service_repo.read_item_by_id = AsyncMock(return_value=workspace_service.dict())
 
     with pytest.raises(EntityDoesNotExist):
         await workspace_service_repo.get_workspace_service_by_id(WORKSPACE_ID, SERVICE_ID)
 
 
-async def test_get_workspace_service_by_id_queries_db(workspace_service_repo, workspace_service):
-    workspace_service_repo.query = AsyncMock(return_value=[workspace_service])
-    expected_query = 'SELECT * FROM c WHERE c.resourceType = @resourceType AND c.workspaceId = @workspaceId AND c.id = @serviceId AND c.deploymentStatus != @deletedStatus'
-    expected_parameters = [
-        {'name': '@resourceType', 'value': ResourceType.WorkspaceService},
-        {'name': '@workspaceId', 'value': WORKSPACE_ID},
-        {'name': '@serviceId', 'value': SERVICE_ID},
-        {'name': '@deletedStatus', 'value': Status.Deleted}
-    ]
+async def test_get_workspace_service_by_id_point_reads_db(workspace_service_repo, workspace_service):
+    workspace_service_repo.read_item_by_id = AsyncMock(return_value=workspace_service.dict())
 
-    await workspace_service_repo.get_workspace_service_by_id(WORKSPACE_ID, SERVICE_ID)
+    actual_service = await workspace_service_repo.get_workspace_service_by_id(WORKSPACE_ID, SERVICE_ID)
 
-    workspace_service_repo.query.assert_called_once_with(query=expected_query, parameters=expected_parameters)
+    workspace_service_repo.read_item_by_id.assert_called_once_with(SERVICE_ID)
+    assert actual_service == workspace_service
 
 
 @patch('db.repositories.workspace_services.WorkspaceServiceRepository.validate_input_against_template')
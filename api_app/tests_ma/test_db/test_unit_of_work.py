@@ -0,0 +1,113 @@
+import pytest
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError, CosmosBatchOperationError
+from mock import AsyncMock, MagicMock
+
+from db.repositories.base import BaseRepository
+from db.unit_of_work import UnitOfWork
+from models.domain.resource import ResourceHistoryItem
+
+pytestmark = pytest.mark.asyncio
+
+
+def _repository(container_name: str, partition_key_field: str = "id") -> BaseRepository:
+    repository = BaseRepository()
+    repository._container = MagicMock()
+    repository._container.execute_item_batch = AsyncMock()
+    repository._container_name = container_name
+    repository.partition_key_field = partition_key_field
+    repository.update_item = AsyncMock()
+    repository.update_item_dict = AsyncMock()
+    repository.update_item_with_etag = AsyncMock()
+    repository.save_item = AsyncMock()
+    return repository
+
+
+async def test_commit_writes_each_partition_with_the_repository():
+    resources = _repository("Resources")
+    history = _repository("ResourceHistory", "resourceId")
+    history_item = ResourceHistoryItem(id="history", resourceId="resource", templateVersion="1.0.0")
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.create(history, history_item)
+    unit_of_work.replace(resources, {"id": "resource"}, "etag")
+    await unit_of_work.commit()
+
+    history.save_item.assert_awaited_once_with(history_item)
+    resources.update_item_with_etag.assert_awaited_once_with({"id": "resource"}, "etag")
+    assert len(unit_of_work) == 0
+
+
+async def test_later_write_to_a_document_replaces_the_earlier_one():
+    resources = _repository("Resources")
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.upsert(resources, {"id": "resource", "deploymentStatus": "deploying"})
+    unit_of_work.upsert(resources, {"id": "resource", "deploymentStatus": "deployed"})
+    await unit_of_work.commit()
+
+    resources.update_item_dict.assert_awaited_once_with({"id": "resource", "deploymentStatus": "deployed"})
+
+
+async def test_items_are_copied_when_added():
+    resources = _repository("Resources")
+    resource = {"id": "resource", "properties": {"name": "before"}}
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.upsert(resources, resource)
+    resource["properties"]["name"] = "after"
+    await unit_of_work.commit()
+
+    resources.update_item_dict.assert_awaited_once_with({"id": "resource", "properties": {"name": "before"}})
+
+
+async def test_writes_to_the_same_partition_are_batched():
+    history = _repository("ResourceHistory", "resourceId")
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.create(history, {"id": "history-1", "resourceId": "resource"})
+    unit_of_work.replace(history, {"id": "history-2", "resourceId": "resource"}, "etag")
+    await unit_of_work.commit()
+
+    history.container.execute_item_batch.assert_awaited_once_with(batch_operations=[
+        ("create", ({"id": "history-1", "resourceId": "resource"},)),
+        ("replace", ("history-2", {"id": "history-2", "resourceId": "resource"}), {"if_match_etag": "etag"})
+    ], partition_key="resource")
+    history.save_item.assert_not_awaited()
+
+
+async def test_batch_etag_mismatch_raises_access_condition_failed():
+    history = _repository("ResourceHistory", "resourceId")
+    history.container.execute_item_batch.side_effect = CosmosBatchOperationError(error_index=1, headers={}, status_code=412, message="batch failed", operation_responses=[{"statusCode": 424}, {"statusCode": 412}])
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.upsert(history, {"id": "history-1", "resourceId": "resource"})
+    unit_of_work.replace(history, {"id": "history-2", "resourceId": "resource"}, "etag")
+    with pytest.raises(CosmosAccessConditionFailedError):
+        await unit_of_work.commit()
+
+
+async def test_patches_are_applied_after_earlier_writes_of_the_document():
+    resources = _repository("Resources")
+    patch_operations = [{"op": "set", "path": "/deploymentStatus", "value": "deployed"}]
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.upsert(resources, {"id": "resource"})
+    unit_of_work.patch(resources, "resource", patch_operations)
+    await unit_of_work.commit()
+
+    resources.container.execute_item_batch.assert_awaited_once_with(batch_operations=[
+        ("upsert", ({"id": "resource"},)),
+        ("patch", ("resource", patch_operations), {})
+    ], partition_key="resource")
+
+
+async def test_single_patch_is_a_partial_document_update():
+    resources = _repository("Resources")
+    resources.patch_item = AsyncMock()
+    patch_operations = [{"op": "set", "path": "/deploymentStatus", "value": "deployed"}]
+    unit_of_work = UnitOfWork()
+
+    unit_of_work.patch(resources, "resource", patch_operations, etag="etag")
+    await unit_of_work.commit()
+
+    resources.patch_item.assert_awaited_once_with("resource", patch_operations, partition_key="resource", etag="etag")
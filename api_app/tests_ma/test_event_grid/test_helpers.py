@@ -1,9 +1,11 @@
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from azure.core.exceptions import HttpResponseError, ServiceRequestError
 from azure.eventgrid import EventGridEvent
 
-from event_grid.helpers import publish_event
+from event_grid.helpers import TopicPublisher, close_publishers, publish_event
 
 
 def _make_event():
@@ -21,18 +23,17 @@ def _http_error(status_code: int) -> HttpResponseError:
     return err
 
 
-@pytest.mark.asyncio
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_succeeds_on_first_attempt(mock_cred_ctx):
+def _mock_client(send_side_effect=None):
     mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock()
+    mock_client.send = AsyncMock(side_effect=send_side_effect)
+    mock_client.close = AsyncMock()
+    return mock_client
+
 
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+@pytest.mark.asyncio
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_succeeds_on_first_attempt(_):
+    mock_client = _mock_client()
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         await publish_event(_make_event(), "https://topic.endpoint")
@@ -41,18 +42,41 @@ async def test_publish_event_succeeds_on_first_attempt(mock_cred_ctx):
 
 
 @pytest.mark.asyncio
-@patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_retries_on_429_and_succeeds(mock_cred_ctx, mock_sleep):
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=[_http_error(429), None])
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_reuses_client_per_topic(get_credential_mock):
+    mock_client = _mock_client()
 
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+    with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client) as publisher_client_class:
+        await publish_event(_make_event(), "https://topic.endpoint")
+        await publish_event(_make_event(), "https://topic.endpoint")
+        await publish_event(_make_event(), "https://other-topic.endpoint")
+
+    assert publisher_client_class.call_count == 2
+    get_credential_mock.assert_awaited_once()
+    assert mock_client.send.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_close_publishers_closes_clients_and_credential(get_credential_mock):
+    mock_client = _mock_client()
+    mock_credential = MagicMock()
+    mock_credential.close = AsyncMock()
+    get_credential_mock.return_value = mock_credential
+
+    with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
+        await publish_event(_make_event(), "https://topic.endpoint")
+        await close_publishers()
+
+    mock_client.close.assert_awaited_once()
+    mock_credential.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_retries_on_429_and_succeeds(_, mock_sleep):
+    mock_client = _mock_client(send_side_effect=[_http_error(429), None])
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         await publish_event(_make_event(), "https://topic.endpoint")
@@ -63,17 +87,9 @@ async def test_publish_event_retries_on_429_and_succeeds(mock_cred_ctx, mock_sle
 
 @pytest.mark.asyncio
 @patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_retries_on_503_and_succeeds(mock_cred_ctx, mock_sleep):
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=[_http_error(503), None])
-
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_retries_on_503_and_succeeds(_, mock_sleep):
+    mock_client = _mock_client(send_side_effect=[_http_error(503), None])
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         await publish_event(_make_event(), "https://topic.endpoint")
@@ -84,17 +100,9 @@ async def test_publish_event_retries_on_503_and_succeeds(mock_cred_ctx, mock_sle
 
 @pytest.mark.asyncio
 @patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_retries_on_service_request_error(mock_cred_ctx, mock_sleep):
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=[ServiceRequestError("network error"), None])
-
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_retries_on_service_request_error(_, mock_sleep):
+    mock_client = _mock_client(send_side_effect=[ServiceRequestError("network error"), None])
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         await publish_event(_make_event(), "https://topic.endpoint")
@@ -105,17 +113,9 @@ async def test_publish_event_retries_on_service_request_error(mock_cred_ctx, moc
 
 @pytest.mark.asyncio
 @patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_raises_after_exhausting_retries(mock_cred_ctx, mock_sleep):
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=_http_error(429))
-
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_raises_after_exhausting_retries(_, mock_sleep):
+    mock_client = _mock_client(send_side_effect=_http_error(429))
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         with pytest.raises(HttpResponseError):
@@ -126,17 +126,9 @@ async def test_publish_event_raises_after_exhausting_retries(mock_cred_ctx, mock
 
 
 @pytest.mark.asyncio
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_does_not_retry_on_non_retryable_http_error(mock_cred_ctx):
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=_http_error(401))
-
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_does_not_retry_on_non_retryable_http_error(_):
+    mock_client = _mock_client(send_side_effect=_http_error(401))
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         with pytest.raises(HttpResponseError):
@@ -147,18 +139,10 @@ async def test_publish_event_does_not_retry_on_non_retryable_http_error(mock_cre
 
 @pytest.mark.asyncio
 @patch("event_grid.helpers.asyncio.sleep", new_callable=AsyncMock)
-@patch("event_grid.helpers.credentials.get_credential_async_context")
-async def test_publish_event_exponential_backoff_delays(mock_cred_ctx, mock_sleep):
+@patch("event_grid.helpers.credentials.get_credential_async", new_callable=AsyncMock)
+async def test_publish_event_exponential_backoff_delays(_, mock_sleep):
     """Verify delays grow as 1s, 2s (base * 2^attempt)."""
-    mock_client = AsyncMock()
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    mock_client.send = AsyncMock(side_effect=_http_error(429))
-
-    mock_cred = MagicMock()
-    mock_cred.__aenter__ = AsyncMock(return_value=mock_cred)
-    mock_cred.__aexit__ = AsyncMock(return_value=None)
-    mock_cred_ctx.return_value = mock_cred
+    mock_client = _mock_client(send_side_effect=_http_error(429))
 
     with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
         with pytest.raises(HttpResponseError):
@@ -166,3 +150,27 @@ async def test_publish_event_exponential_backoff_delays(mock_cred_ctx, mock_slee
 
     delays = [call.args[0] for call in mock_sleep.call_args_list]
     assert delays == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_topic_publisher_batches_events_within_window():
+    mock_client = _mock_client()
+
+    with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
+        publisher = TopicPublisher("https://topic.endpoint", MagicMock(), batch_window_seconds=0.01)
+        await asyncio.gather(*[publisher.publish(_make_event()) for _ in range(3)])
+
+    mock_client.send.assert_awaited_once()
+    assert len(mock_client.send.await_args.args[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_topic_publisher_batch_failure_is_raised_to_every_caller():
+    mock_client = _mock_client(send_side_effect=_http_error(401))
+
+    with patch("event_grid.helpers.EventGridPublisherClient", return_value=mock_client):
+        publisher = TopicPublisher("https://topic.endpoint", MagicMock(), batch_window_seconds=0.01)
+        results = await asyncio.gather(*[publisher.publish(_make_event()) for _ in range(2)], return_exceptions=True)
+
+    assert all(isinstance(result, HttpResponseError) for result in results)
+    mock_client.send.assert_awaited_once()
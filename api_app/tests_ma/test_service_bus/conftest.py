@@ -0,0 +1,11 @@
+import pytest
+
+from service_bus import sender_pool
+
+
+@pytest.fixture(autouse=True)
+def reset_sender_pool():
+    # the sender pool is process-wide, so make sure no pooled (mocked) sender leaks between tests
+    sender_pool._sender_pool = None
+    yield
+    sender_pool._sender_pool = None
@@ -1,10 +1,12 @@
+import asyncio
+import copy
 import json
 from fastapi import HTTPException, status
 import pytest
 import time
 
-from mock import AsyncMock, patch
-from service_bus.airlock_request_status_update import AirlockStatusUpdater
+from mock import AsyncMock, MagicMock, patch
+from service_bus.airlock_request_status_update import AirlockStatusUpdater, get_airlock_request_id, next_idle_wait
 from models.domain.events import AirlockNotificationUserData, AirlockFile
 from models.domain.airlock_request import AirlockRequest, AirlockRequestStatus, AirlockRequestType
 from models.domain.workspace import Workspace
@@ -96,9 +98,10 @@ def sample_airlock_request(status=AirlockRequestStatus.Submitted):
 
 
 class ServiceBusReceivedMessageMock:
-    def __init__(self, message: dict):
+    def __init__(self, message: dict, sequence_number: int = 0):
         self.message = json.dumps(message)
         self.correlation_id = "test_correlation_id"
+        self.sequence_number = sequence_number
 
     def __str__(self):
         return self.message
@@ -214,3 +217,117 @@ async def test_when_updating_and_status_update_is_illegal_error_is_logged(sb_cli
     assert complete_message is True
     expected_error_message = strings.STEP_RESULT_MESSAGE_INVALID_STATUS.format(test_sb_step_result_message_with_invalid_status["data"]["request_id"], test_sb_step_result_message_with_invalid_status["data"]["completed_step"], test_sb_step_result_message_with_invalid_status["data"]["new_status"])
     logging_mock.assert_called_once_with(expected_error_message)
+
+
+def step_result_message(request_id, sequence_number=0):
+    message = copy.deepcopy(test_sb_step_result_message)
+    message["data"]["request_id"] = request_id
+    return ServiceBusReceivedMessageMock(message, sequence_number)
+
+
+async def test_get_airlock_request_id_returns_none_for_bad_messages():
+    assert get_airlock_request_id(ServiceBusReceivedMessageMock(test_sb_step_result_message)) == AIRLOCK_REQUEST_ID
+    for payload in test_data:
+        assert get_airlock_request_id(payload) is None
+
+
+async def test_next_idle_wait_backs_off_up_to_the_maximum():
+    with patch('service_bus.airlock_request_status_update.config.AIRLOCK_STEP_RESULT_MAX_IDLE_WAIT', 5):
+        waits = [0]
+        for _ in range(4):
+            waits.append(next_idle_wait(waits[-1]))
+
+    assert waits == [0, 1, 2, 4, 5]
+
+
+async def test_drain_queue_long_polls_an_idle_queue_for_longer_and_longer():
+    msg = step_result_message(AIRLOCK_REQUEST_ID)
+    receiver = MagicMock()
+    # the updater is cancelled while waiting for messages
+    receiver.receive_messages = AsyncMock(side_effect=[[], [], [msg], [], asyncio.CancelledError])
+    airlockStatusUpdater = AirlockStatusUpdater()
+    airlockStatusUpdater.process_messages = AsyncMock()
+
+    with patch('service_bus.airlock_request_status_update.config.AIRLOCK_STEP_RESULT_MAX_IDLE_WAIT', 5), \
+            patch('service_bus.airlock_request_status_update.asyncio.sleep') as sleep_mock:
+        with pytest.raises(asyncio.CancelledError):
+            await airlockStatusUpdater.drain_queue(receiver)
+
+    assert [call.kwargs["max_wait_time"] for call in receiver.receive_messages.await_args_list] == [1, 2, 4, 1, 2]
+    airlockStatusUpdater.process_messages.assert_awaited_once_with(receiver, [msg])
+    sleep_mock.assert_not_called()
+
+
+@patch('service_bus.airlock_request_status_update.record_message_processing_duration')
+@patch('service_bus.airlock_request_status_update.record_message_lag')
+@patch('service_bus.airlock_request_status_update.AutoLockRenewer')
+async def test_process_messages_processes_requests_concurrently_and_each_request_in_order(auto_lock_renewer_mock, record_lag_mock, _):
+    auto_lock_renewer_mock.return_value.__aenter__.return_value = MagicMock()
+    first_request_msgs = [step_result_message("request-1"), step_result_message("request-1")]
+    second_request_msg = step_result_message("request-2")
+    msgs = [first_request_msgs[0], second_request_msg, first_request_msgs[1]]
+    receiver = MagicMock()
+    receiver.complete_message = AsyncMock()
+    receiver.abandon_message = AsyncMock()
+
+    processed = []
+    second_request_processed = asyncio.Event()
+
+    async def process_message(msg):
+        if msg is first_request_msgs[0]:
+            # the second request is processed while the first one is in progress
+            await second_request_processed.wait()
+        else:
+            second_request_processed.set()
+        processed.append(msg)
+        return True
+
+    airlock_status_updater = AirlockStatusUpdater()
+    airlock_status_updater.process_message = process_message
+    await airlock_status_updater.process_messages(receiver, msgs)
+
+    assert processed == [second_request_msg] + first_request_msgs
+    assert receiver.complete_message.await_count == 3
+    assert record_lag_mock.call_count == 3
+
+
+@patch('service_bus.airlock_request_status_update.AutoLockRenewer')
+async def test_process_messages_abandons_later_messages_of_a_failed_request(auto_lock_renewer_mock):
+    auto_lock_renewer_mock.return_value.__aenter__.return_value = MagicMock()
+    msgs = [step_result_message("request-1"), step_result_message("request-1"), step_result_message("request-1")]
+    receiver = MagicMock()
+    receiver.complete_message = AsyncMock()
+    receiver.abandon_message = AsyncMock()
+
+    airlock_status_updater = AirlockStatusUpdater()
+    airlock_status_updater.process_message = AsyncMock(side_effect=[True, False])
+    await airlock_status_updater.process_messages(receiver, msgs)
+
+    assert airlock_status_updater.process_message.await_count == 2
+    receiver.complete_message.assert_awaited_once_with(msgs[0])
+    assert receiver.abandon_message.await_args_list == [((msgs[1],),), ((msgs[2],),)]
+
+
+@patch('service_bus.airlock_request_status_update.AutoLockRenewer')
+async def test_process_messages_abandons_prefetched_later_messages_until_the_failed_one_is_received_again(auto_lock_renewer_mock):
+    auto_lock_renewer_mock.return_value.__aenter__.return_value = MagicMock()
+    failed = step_result_message("request-1", sequence_number=1)
+    prefetched = step_result_message("request-1", sequence_number=2)
+    other_request = step_result_message("request-2", sequence_number=3)
+    receiver = MagicMock()
+    receiver.complete_message = AsyncMock()
+    receiver.abandon_message = AsyncMock()
+    processed = []
+
+    async def process_message(msg):
+        processed.append(msg)
+        return len(processed) > 1
+
+    airlock_status_updater = AirlockStatusUpdater()
+    airlock_status_updater.process_message = process_message
+    await airlock_status_updater.process_messages(receiver, [failed])
+    await airlock_status_updater.process_messages(receiver, [prefetched, other_request])
+    await airlock_status_updater.process_messages(receiver, [failed, prefetched])
+
+    assert processed == [failed, other_request, failed, prefetched]
+    assert receiver.abandon_message.await_args_list == [((failed,),), ((prefetched,),)]
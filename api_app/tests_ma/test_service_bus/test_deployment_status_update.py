@@ -1,20 +1,23 @@
+import asyncio
 import copy
 import json
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, ANY
 from pydantic import parse_obj_as
 import pytest
-import uuid
 
 from mock import AsyncMock, patch
 from tests_ma.test_api.test_routes.test_resource_helpers import FAKE_CREATE_TIMESTAMP, FAKE_UPDATE_TIMESTAMP
 from models.domain.request_action import RequestAction
 from models.domain.resource import ResourceType
 
-from db.errors import EntityDoesNotExist
+from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusConnectionError
 from models.domain.workspace import Workspace
 from models.domain.operation import DeploymentStatusUpdateMessage, Operation, OperationStep, Status
 from resources import strings
 from service_bus.deployment_status_updater import DeploymentStatusUpdater
+from service_bus.metrics import record_message_lag
 
 
 pytestmark = pytest.mark.asyncio
@@ -116,6 +119,12 @@ def create_sample_operation(resource_id, request_action):
     )
 
 
+def partition_by_id(*repository_create_mocks):
+    # the repositories are mocked, but the unit of work still needs to know how their containers are partitioned
+    for repository_create_mock in repository_create_mocks:
+        repository_create_mock.return_value.partition_key_field = "id"
+
+
 @pytest.mark.parametrize("payload", test_data)
 @patch('services.logging.logger.exception')
 async def test_receiving_bad_json_logs_error(logging_mock, payload):
@@ -138,19 +147,18 @@ async def test_receiving_bad_json_logs_error(logging_mock, payload):
 @patch('service_bus.deployment_status_updater.ResourceRepository.create')
 @patch('services.logging.logger.exception')
 async def test_receiving_good_message(logging_mock, resource_repo, operation_repo, _, __):
-    expected_workspace = create_sample_workspace_object(test_sb_message["id"])
-    resource_repo.return_value.get_resource_dict_by_id.return_value = expected_workspace.dict()
-
     operation = create_sample_operation(test_sb_message["id"], RequestAction.Install)
     operation_repo.return_value.get_operation_by_id.return_value = operation
 
+    partition_by_id(resource_repo, operation_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(ServiceBusReceivedMessageMock(test_sb_message))
 
     assert complete_message is True
-    resource_repo.return_value.get_resource_dict_by_id.assert_called_once_with(uuid.UUID(test_sb_message["id"]))
-    resource_repo.return_value.update_item_dict.assert_called_once_with(expected_workspace.dict())
+    # the resource is patched without being read first
+    resource_repo.return_value.get_resource_dict_by_id.assert_not_called()
+    resource_repo.return_value.patch_item.assert_called_once_with(test_sb_message["id"], [{"op": "set", "path": "/deploymentStatus", "value": Status.Deployed}], partition_key=test_sb_message["id"], etag=None)
     logging_mock.assert_not_called()
 
 
@@ -160,11 +168,12 @@ async def test_receiving_good_message(logging_mock, resource_repo, operation_rep
 @patch('service_bus.deployment_status_updater.ResourceRepository.create')
 @patch('services.logging.logger.exception')
 async def test_when_updating_non_existent_workspace_error_is_logged(logging_mock, resource_repo, operation_repo, _, __):
-    resource_repo.return_value.get_resource_dict_by_id.side_effect = EntityDoesNotExist
+    resource_repo.return_value.patch_item.side_effect = CosmosResourceNotFoundError
 
     operation = create_sample_operation(test_sb_message["id"], RequestAction.Install)
     operation_repo.return_value.get_operation_by_id.return_value = operation
 
+    partition_by_id(resource_repo, operation_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(ServiceBusReceivedMessageMock(test_sb_message))
@@ -180,11 +189,12 @@ async def test_when_updating_non_existent_workspace_error_is_logged(logging_mock
 @patch('service_bus.deployment_status_updater.ResourceRepository.create')
 @patch('services.logging.logger.exception')
 async def test_when_updating_and_state_store_exception(logging_mock, resource_repo, operation_repo, _, __):
-    resource_repo.return_value.get_resource_dict_by_id.side_effect = Exception
+    resource_repo.return_value.patch_item.side_effect = Exception
 
     operation = create_sample_operation(test_sb_message["id"], RequestAction.Install)
     operation_repo.return_value.get_operation_by_id.return_value = operation
 
+    partition_by_id(resource_repo, operation_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(ServiceBusReceivedMessageMock(test_sb_message))
@@ -217,6 +227,7 @@ async def test_state_transitions_from_deployed_to_deleted(resource_repo, operati
     expected_operation.status = Status.Deleted
     expected_operation.message = updated_message["message"]
 
+    partition_by_id(resource_repo, operations_repo_mock)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(service_bus_received_message_mock)
@@ -234,10 +245,6 @@ async def test_outputs_are_added_to_resource_item(resource_repo, operations_repo
     received_message["status"] = Status.Deployed
     service_bus_received_message_mock = ServiceBusReceivedMessageMock(received_message)
 
-    resource = create_sample_workspace_object(received_message["id"])
-    resource.properties = {"exitingName": "exitingValue"}
-    resource_repo.return_value.get_resource_dict_by_id.return_value = resource.dict()
-
     new_params = {
         "string1": "value1",
         "string2": "value2",
@@ -247,19 +254,40 @@ async def test_outputs_are_added_to_resource_item(resource_repo, operations_repo
         "list1": "['one', 'two']",
         "list2": ["one", "two"],
     }
+    expected_patch_operations = [{"op": "set", "path": "/deploymentStatus", "value": Status.Deployed}] + \
+        [{"op": "set", "path": f"/properties/{name}", "value": value} for name, value in new_params.items()]
 
-    expected_resource = resource
-    expected_resource.properties = {**resource.properties, **new_params}
-
-    operation = create_sample_operation(resource.id, RequestAction.UnInstall)
+    operation = create_sample_operation(received_message["id"], RequestAction.UnInstall)
     operations_repo.return_value.get_operation_by_id.return_value = operation
 
+    partition_by_id(resource_repo, operations_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(service_bus_received_message_mock)
 
     assert complete_message is True
-    resource_repo.return_value.update_item_dict.assert_called_once_with(expected_resource)
+    resource_repo.return_value.patch_item.assert_called_once_with(received_message["id"], expected_patch_operations, partition_key=received_message["id"], etag=None)
+
+
+@patch('service_bus.deployment_status_updater.ResourceHistoryRepository.create')
+@patch('service_bus.deployment_status_updater.ResourceTemplateRepository.create')
+@patch('service_bus.deployment_status_updater.OperationRepository.create')
+@patch('service_bus.deployment_status_updater.ResourceRepository.create')
+async def test_many_outputs_are_patched_in_one_transactional_batch(resource_repo, operations_repo, _, __):
+    received_message = {**test_sb_message, "outputs": [{"Name": f"output{i}", "Value": str(i), "Type": "string"} for i in range(12)]}
+
+    operation = create_sample_operation(received_message["id"], RequestAction.UnInstall)
+    operations_repo.return_value.get_operation_by_id.return_value = operation
+
+    partition_by_id(resource_repo, operations_repo)
+    status_updater = DeploymentStatusUpdater()
+    await status_updater.init_repos()
+    complete_message = await status_updater.process_message(ServiceBusReceivedMessageMock(received_message))
+
+    assert complete_message is True
+    resource_repo.return_value.patch_item.assert_not_called()
+    batch = resource_repo.return_value.container.execute_item_batch.call_args.kwargs["batch_operations"]
+    assert [len(patch_operations) for _, (_, patch_operations), _ in batch] == [10, 3]
 
 
 @patch('service_bus.deployment_status_updater.ResourceHistoryRepository.create')
@@ -271,21 +299,28 @@ async def test_properties_dont_change_with_no_outputs(resource_repo, operations_
     received_message["status"] = Status.Deployed
     service_bus_received_message_mock = ServiceBusReceivedMessageMock(received_message)
 
-    resource = create_sample_workspace_object(received_message["id"])
-    resource.properties = {"exitingName": "exitingValue"}
-    resource_repo.return_value.get_resource_dict_by_id.return_value = resource.dict()
-
-    operation = create_sample_operation(resource.id, RequestAction.UnInstall)
+    operation = create_sample_operation(received_message["id"], RequestAction.UnInstall)
     operations_repo.return_value.get_operation_by_id.return_value = operation
 
-    expected_resource = resource
-
+    partition_by_id(resource_repo, operations_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(service_bus_received_message_mock)
 
     assert complete_message is True
-    resource_repo.return_value.update_item_dict.assert_called_once_with(expected_resource.dict())
+    patch_operations = resource_repo.return_value.patch_item.call_args.args[1]
+    assert patch_operations == [{"op": "set", "path": "/deploymentStatus", "value": Status.Deployed}]
+
+
+async def test_resource_patch_operations_escape_output_names_and_skip_outputs_of_failed_steps():
+    status_updater = DeploymentStatusUpdater()
+    message = parse_obj_as(DeploymentStatusUpdateMessage, {**test_sb_message, "outputs": [{"Name": "a/b~c", "Value": "value", "Type": "string"}]})
+    step = OperationStep(id="random-uuid", templateStepId="main", stepTitle="main", resourceId=test_sb_message["id"], resourceTemplateName="template", resourceType=ResourceType.Workspace, resourceAction="install", status=Status.Deployed, sourceTemplateResourceId=test_sb_message["id"])
+
+    assert status_updater.create_resource_patch_operations(step, message)[1] == {"op": "set", "path": "/properties/a~1b~0c", "value": "value"}
+
+    step.status = Status.DeploymentFailed
+    assert status_updater.create_resource_patch_operations(step, message) == [{"op": "set", "path": "/deploymentStatus", "value": Status.DeploymentFailed}]
 
 
 @patch('service_bus.deployment_status_updater.ResourceHistoryRepository.create')
@@ -293,7 +328,7 @@ async def test_properties_dont_change_with_no_outputs(resource_repo, operations_
 @patch('service_bus.deployment_status_updater.update_resource_for_step')
 @patch('service_bus.deployment_status_updater.OperationRepository.create')
 @patch('service_bus.deployment_status_updater.ResourceRepository.create')
-@patch('service_bus.helpers.ServiceBusClient')
+@patch('service_bus.sender_pool.ServiceBusClient')
 async def test_multi_step_operation_sends_next_step(sb_sender_client, resource_repo, operations_repo, update_resource_for_step, _, __, multi_step_operation, user_resource_multi, basic_shared_service):
     received_message = test_sb_message_multi_step_1_complete
     received_message["status"] = Status.Updated
@@ -312,6 +347,7 @@ async def test_multi_step_operation_sends_next_step(sb_sender_client, resource_r
     operations_repo.return_value.get_operation_by_id.return_value = multi_step_operation
     update_resource_for_step.return_value = user_resource_multi
 
+    partition_by_id(resource_repo, operations_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(service_bus_received_message_mock)
@@ -347,7 +383,7 @@ async def test_multi_step_operation_sends_next_step(sb_sender_client, resource_r
 @patch('service_bus.deployment_status_updater.ResourceTemplateRepository.create')
 @patch('service_bus.deployment_status_updater.OperationRepository.create')
 @patch('service_bus.deployment_status_updater.ResourceRepository.create')
-@patch('service_bus.helpers.ServiceBusClient')
+@patch('service_bus.sender_pool.ServiceBusClient')
 async def test_multi_step_operation_ends_at_last_step(sb_sender_client, resource_repo, operations_repo, _, __, multi_step_operation, user_resource_multi, basic_shared_service):
     received_message = test_sb_message_multi_step_3_complete
     received_message["status"] = Status.Updated
@@ -375,6 +411,7 @@ async def test_multi_step_operation_ends_at_last_step(sb_sender_client, resource
 
     operations_repo.return_value.get_operation_by_id.return_value = in_flight_op
 
+    partition_by_id(resource_repo, operations_repo)
     status_updater = DeploymentStatusUpdater()
     await status_updater.init_repos()
     complete_message = await status_updater.process_message(service_bus_received_message_mock)
@@ -413,3 +450,85 @@ async def test_convert_outputs_to_dict():
         'list2': ['one', 'two']
     }
     assert status_updater.convert_outputs_to_dict(deployment_status_update_message.outputs) == expected_result
+
+
+class ReceiverMock:
+    def __init__(self, messages):
+        self.messages = messages
+        self.session = MagicMock(session_id="session")
+        self.complete_message = AsyncMock()
+        self.abandon_message = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for msg in self.messages:
+            yield msg
+
+
+@patch('service_bus.deployment_status_updater.record_message_processing_duration')
+@patch('service_bus.deployment_status_updater.record_message_lag')
+@patch('service_bus.deployment_status_updater.AutoLockRenewer')
+async def test_receive_session_processes_messages_in_order_and_records_metrics(auto_lock_renewer_mock, record_lag_mock, record_duration_mock):
+    auto_lock_renewer_mock.return_value.__aenter__.return_value = MagicMock()
+    messages = [MagicMock(), MagicMock()]
+    receiver = ReceiverMock(messages)
+    service_bus_client = MagicMock()
+    service_bus_client.get_queue_receiver.return_value = receiver
+    status_updater = DeploymentStatusUpdater()
+    status_updater.process_message = AsyncMock(side_effect=[True, False])
+
+    await status_updater.receive_session(service_bus_client)
+
+    assert status_updater.process_message.await_args_list == [((messages[0],),), ((messages[1],),)]
+    receiver.complete_message.assert_awaited_once_with(messages[0])
+    receiver.abandon_message.assert_awaited_once_with(messages[1])
+    assert record_lag_mock.call_count == 2
+    assert record_duration_mock.call_count == 2
+
+
+@patch('service_bus.deployment_status_updater.asyncio.sleep', side_effect=asyncio.CancelledError)
+@patch('service_bus.deployment_status_updater.ServiceBusClient')
+@patch('service_bus.deployment_status_updater.credentials.get_credential_async_context')
+async def test_receive_messages_shares_one_client_between_session_receivers(get_credential_mock, service_bus_client_mock, sleep_mock):
+    get_credential_mock.return_value.__aenter__.return_value = MagicMock()
+    client = service_bus_client_mock.return_value.__aenter__.return_value
+    status_updater = DeploymentStatusUpdater()
+    status_updater.receive_sessions = AsyncMock(side_effect=ServiceBusConnectionError(message="connection lost"))
+
+    # the receivers fail, and the updater is cancelled while waiting to reconnect
+    with patch('service_bus.deployment_status_updater.config.DEPLOYMENT_STATUS_UPDATE_SESSION_RECEIVERS', 3):
+        with pytest.raises(asyncio.CancelledError):
+            await status_updater.receive_messages()
+
+    service_bus_client_mock.assert_called_once()
+    assert status_updater.receive_sessions.await_args_list == [((client, 0),), ((client, 1),), ((client, 2),)]
+    sleep_mock.assert_awaited_once_with(1)
+
+
+async def test_receive_sessions_retries_timeouts_and_raises_connection_errors():
+    status_updater = DeploymentStatusUpdater()
+    status_updater.receive_session = AsyncMock(side_effect=[OperationTimeoutError(message="no sessions"), ServiceBusConnectionError(message="connection lost")])
+
+    with pytest.raises(ServiceBusConnectionError):
+        await status_updater.receive_sessions(MagicMock(), 0)
+
+    assert status_updater.receive_session.await_count == 2
+
+
+async def test_record_message_lag_ignores_messages_without_enqueued_time():
+    with patch('service_bus.metrics.message_lag_histogram') as histogram_mock:
+        record_message_lag(MagicMock(enqueued_time_utc=None), "queue")
+        record_message_lag(MagicMock(enqueued_time_utc=datetime.now(timezone.utc) - timedelta(seconds=2)), "queue")
+
+    histogram_mock.record.assert_called_once()
+    lag, attributes = histogram_mock.record.call_args.args
+    assert lag >= 2000
+    assert attributes == {"queue": "queue"}
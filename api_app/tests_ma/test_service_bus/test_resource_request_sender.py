@@ -43,7 +43,7 @@ def create_test_resource():
 )
 @patch("service_bus.resource_request_sender.ResourceHistoryRepository.create")
 @patch("service_bus.resource_request_sender.OperationRepository.create")
-@patch("service_bus.helpers.ServiceBusClient")
+@patch("service_bus.sender_pool.ServiceBusClient")
 @patch("service_bus.resource_request_sender.ResourceRepository.create")
 @patch("service_bus.resource_request_sender.ResourceTemplateRepository.create")
 async def test_resource_request_message_generated_correctly(
@@ -0,0 +1,114 @@
+import pytest
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import ServiceBusConnectionError, MessageSizeExceededError
+from mock import AsyncMock, MagicMock, patch
+
+from service_bus.sender_pool import ServiceBusSenderPool, close_sender_pool, get_sender_pool
+
+pytestmark = pytest.mark.asyncio
+
+
+def _mock_client():
+    client = MagicMock()
+    client.close = AsyncMock()
+    sender = MagicMock()
+    sender.send_messages = AsyncMock()
+    sender.close = AsyncMock()
+    client.get_queue_sender.return_value = sender
+    return client, sender
+
+
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_send_reuses_client_and_sender(service_bus_client_mock, get_credential_mock):
+    client, sender = _mock_client()
+    service_bus_client_mock.return_value = client
+
+    pool = ServiceBusSenderPool("namespace")
+    await pool.send(ServiceBusMessage("one"), "queue")
+    await pool.send(ServiceBusMessage("two"), "queue")
+
+    service_bus_client_mock.assert_called_once()
+    get_credential_mock.assert_awaited_once()
+    client.get_queue_sender.assert_called_once_with(queue_name="queue")
+    assert sender.send_messages.await_count == 2
+
+
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_send_creates_a_sender_per_queue(service_bus_client_mock, _):
+    client, _ = _mock_client()
+    service_bus_client_mock.return_value = client
+
+    pool = ServiceBusSenderPool("namespace")
+    await pool.send(ServiceBusMessage("one"), "queue1")
+    await pool.send(ServiceBusMessage("two"), "queue2")
+
+    service_bus_client_mock.assert_called_once()
+    assert client.get_queue_sender.call_count == 2
+
+
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_send_reconnects_on_connection_error(service_bus_client_mock, _):
+    broken_client, broken_sender = _mock_client()
+    broken_sender.send_messages.side_effect = ServiceBusConnectionError(message="connection lost")
+    new_client, new_sender = _mock_client()
+    service_bus_client_mock.side_effect = [broken_client, new_client]
+
+    pool = ServiceBusSenderPool("namespace")
+    await pool.send(ServiceBusMessage("one"), "queue")
+
+    broken_sender.close.assert_awaited_once()
+    broken_client.close.assert_awaited_once()
+    new_sender.send_messages.assert_awaited_once()
+
+
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_send_does_not_retry_other_errors(service_bus_client_mock, _):
+    client, sender = _mock_client()
+    sender.send_messages.side_effect = MessageSizeExceededError(message="too big")
+    service_bus_client_mock.return_value = client
+
+    pool = ServiceBusSenderPool("namespace")
+    with pytest.raises(MessageSizeExceededError):
+        await pool.send(ServiceBusMessage("one"), "queue")
+
+    sender.send_messages.assert_awaited_once()
+    service_bus_client_mock.assert_called_once()
+
+
+@patch("service_bus.sender_pool.send_duration_histogram")
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_send_records_duration(service_bus_client_mock, _, histogram_mock):
+    client, _ = _mock_client()
+    service_bus_client_mock.return_value = client
+
+    pool = ServiceBusSenderPool("namespace")
+    await pool.send(ServiceBusMessage("one"), "queue")
+
+    histogram_mock.record.assert_called_once()
+    assert histogram_mock.record.call_args.args[1] == {"queue": "queue"}
+
+
+@patch("service_bus.sender_pool.credentials.get_credential_async", new_callable=AsyncMock)
+@patch("service_bus.sender_pool.ServiceBusClient")
+async def test_close_sender_pool_closes_everything(service_bus_client_mock, get_credential_mock):
+    client, sender = _mock_client()
+    service_bus_client_mock.return_value = client
+    credential = MagicMock()
+    credential.close = AsyncMock()
+    get_credential_mock.return_value = credential
+
+    pool = get_sender_pool()
+    assert get_sender_pool() is pool
+    await pool.send(ServiceBusMessage("one"), "queue")
+
+    await close_sender_pool()
+
+    sender.close.assert_awaited_once()
+    client.close.assert_awaited_once()
+    credential.close.assert_awaited_once()
+    assert get_sender_pool() is not pool
@@ -1,10 +1,10 @@
 import pytest
-from mock import call, patch
+from mock import AsyncMock, call, patch
 
 from models.domain.authentication import User, RoleAssignment
 from models.domain.workspace_users import AssignmentType, Role
 from models.domain.workspace import Workspace, WorkspaceRole
-from services.aad_authentication import AzureADAuthorization, AuthConfigValidationError, UserRoleAssignmentError, compare_versions, GRAPH_REQUEST_TIMEOUT
+from services.aad_authentication import AzureADAuthorization, AuthConfigValidationError, UserRoleAssignmentError, compare_versions
 
 MOCK_MICROSOFT_GRAPH_URL = "https://graph.microsoft.com"
 
@@ -144,12 +144,14 @@ def user_with_role():
     return User(id="user2", name="Test User 2", email="test2@example.com", roles=["WorkspaceOwner"])
 
 
-def test_extract_workspace__raises_error_if_client_id_not_available():
+@pytest.mark.asyncio
+async def test_extract_workspace__raises_error_if_client_id_not_available():
     access_service = AzureADAuthorization()
     with pytest.raises(AuthConfigValidationError):
-        access_service.extract_workspace_auth_information(data={"auth_type": "Manual"})
+        await access_service.extract_workspace_auth_information(data={"auth_type": "Manual"})
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_role_assignments")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_details")
@@ -157,7 +159,7 @@ def test_extract_workspace__raises_error_if_client_id_not_available():
     "services.aad_authentication.AzureADAuthorization._get_msgraph_token",
     return_value="token",
 )
-def test_get_workspace_user_emails_by_role_assignment_with_single_user_returns_user_mail_and_role_assignment(
+async def test_get_workspace_user_emails_by_role_assignment_with_single_user_returns_user_mail_and_role_assignment(
     _, users, roles, app_sp_graph_data_mock, user_response, roles_response, get_app_sp_graph_data_mock
 ):
     access_service = AzureADAuthorization()
@@ -168,7 +170,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_returns_u
     app_sp_graph_data_mock.return_value = get_app_sp_graph_data_mock
 
     # Act
-    role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(
+    role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(
         Workspace(
             id="id",
             templateName="tre-workspace-base",
@@ -187,6 +189,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_returns_u
     assert role_assignment_details["WorkspaceOwner"] == ["test_user1@email.com"]
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_role_assignments")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_details")
@@ -194,7 +197,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_returns_u
     "services.aad_authentication.AzureADAuthorization._get_msgraph_token",
     return_value="token",
 )
-def test_get_workspace_user_emails_by_role_assignment_with_single_user_with_no_mail_is_not_returned(
+async def test_get_workspace_user_emails_by_role_assignment_with_single_user_with_no_mail_is_not_returned(
     _, users, roles, app_sp_graph_data_mock, user_response, roles_response, get_app_sp_graph_data_mock
 ):
     access_service = AzureADAuthorization()
@@ -208,7 +211,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_with_no_m
     app_sp_graph_data_mock.return_value = get_app_sp_graph_data_mock
 
     # Act
-    role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(
+    role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(
         Workspace(
             id="id",
             templateName="tre-workspace-base",
@@ -227,6 +230,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_with_no_m
     assert len(role_assignment_details) == 0
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_role_assignments")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_details")
@@ -234,7 +238,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_single_user_with_no_m
     "services.aad_authentication.AzureADAuthorization._get_msgraph_token",
     return_value="token",
 )
-def test_get_workspace_user_emails_by_role_assignment_with_only_groups_assigned_returns_group_members(
+async def test_get_workspace_user_emails_by_role_assignment_with_only_groups_assigned_returns_group_members(
     _, users_and_groups, roles, app_sp_graph_data_mock, group_response, roles_response, get_app_sp_graph_data_mock
 ):
     access_service = AzureADAuthorization()
@@ -244,7 +248,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_only_groups_assigned_
     app_sp_graph_data_mock.return_value = get_app_sp_graph_data_mock
 
     # Act
-    role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(
+    role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(
         Workspace(
             id="id",
             templateName="tre-workspace-base",
@@ -265,6 +269,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_only_groups_assigned_
     assert "test_user4@email.com" in role_assignment_details["WorkspaceOwner"]
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_role_assignments")
 @patch("services.aad_authentication.AzureADAuthorization._get_user_details")
@@ -272,7 +277,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_only_groups_assigned_
     "services.aad_authentication.AzureADAuthorization._get_msgraph_token",
     return_value="token",
 )
-def test_get_workspace_user_emails_by_role_assignment_with_groups_and_users_assigned_returned_as_expected(
+async def test_get_workspace_user_emails_by_role_assignment_with_groups_and_users_assigned_returned_as_expected(
     _, users_and_groups, roles, app_sp_graph_data_mock, roles_response, get_app_sp_graph_data_mock, users_and_group_response
 ):
 
@@ -283,7 +288,7 @@ def test_get_workspace_user_emails_by_role_assignment_with_groups_and_users_assi
     users_and_groups.return_value = users_and_group_response
 
     # Act
-    role_assignment_details = access_service.get_workspace_user_emails_by_role_assignment(
+    role_assignment_details = await access_service.get_workspace_user_emails_by_role_assignment(
         Workspace(
             id="id",
             templateName="tre-workspace-base",
@@ -305,42 +310,46 @@ def test_get_workspace_user_emails_by_role_assignment_with_groups_and_users_assi
     assert "test_user4@email.com" in role_assignment_details["WorkspaceOwner"]
 
 
+@pytest.mark.asyncio
 @patch(
     "services.aad_authentication.AzureADAuthorization._get_app_auth_info",
     return_value={"app_role_id_workspace_researcher": "1234"},
 )
-def test_extract_workspace__raises_error_if_owner_not_in_roles(get_app_auth_info_mock):
+async def test_extract_workspace__raises_error_if_owner_not_in_roles(get_app_auth_info_mock):
     access_service = AzureADAuthorization()
     with pytest.raises(AuthConfigValidationError):
-        access_service.extract_workspace_auth_information(data={"client_id": "1234"})
+        await access_service.extract_workspace_auth_information(data={"client_id": "1234"})
 
 
+@pytest.mark.asyncio
 @patch(
     "services.aad_authentication.AzureADAuthorization._get_app_auth_info",
     return_value={"app_role_id_workspace_owner": "1234"},
 )
-def test_extract_workspace__raises_error_if_researcher_not_in_roles(
+async def test_extract_workspace__raises_error_if_researcher_not_in_roles(
     get_app_auth_info_mock,
 ):
     access_service = AzureADAuthorization()
     with pytest.raises(AuthConfigValidationError):
-        access_service.extract_workspace_auth_information(data={"client_id": "1234"})
+        await access_service.extract_workspace_auth_information(data={"client_id": "1234"})
 
 
+@pytest.mark.asyncio
 @patch(
     "services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data",
     return_value={},
 )
-def test_extract_workspace__raises_error_if_graph_data_is_invalid(
+async def test_extract_workspace__raises_error_if_graph_data_is_invalid(
     get_app_sp_graph_data_mock,
 ):
     access_service = AzureADAuthorization()
     with pytest.raises(AuthConfigValidationError):
-        access_service.extract_workspace_auth_information(data={"client_id": "1234"})
+        await access_service.extract_workspace_auth_information(data={"client_id": "1234"})
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_app_sp_graph_data")
-def test_extract_workspace__returns_sp_id_and_roles(get_app_sp_graph_data_mock):
+async def test_extract_workspace__returns_sp_id_and_roles(get_app_sp_graph_data_mock):
     get_app_sp_graph_data_mock.return_value = {
         "value": [
             {
@@ -363,13 +372,14 @@ def test_extract_workspace__returns_sp_id_and_roles(get_app_sp_graph_data_mock):
     }
 
     access_service = AzureADAuthorization()
-    actual_auth_info = access_service.extract_workspace_auth_information(
+    actual_auth_info = await access_service.extract_workspace_auth_information(
         data={"auth_type": "Manual", "client_id": "1234"}
     )
 
     assert actual_auth_info == expected_auth_info
 
 
+@pytest.mark.asyncio
 @pytest.mark.parametrize(
     "user, workspace, expected_role",
     [
@@ -502,7 +512,7 @@ def test_extract_workspace__returns_sp_id_and_roles(get_app_sp_graph_data_mock):
     ],
 )
 @patch("services.aad_authentication.AzureADAuthorization.get_identity_role_assignments")
-def test_get_workspace_role_returns_correct_owner(
+async def test_get_workspace_role_returns_correct_owner(
     get_identity_role_assignments_mock,
     user: User,
     workspace: Workspace,
@@ -512,17 +522,18 @@ def test_get_workspace_role_returns_correct_owner(
 
     access_service = AzureADAuthorization()
     actual_role = access_service.get_workspace_role(
-        user, workspace, access_service.get_identity_role_assignments(user.id)
+        user, workspace, await access_service.get_identity_role_assignments(user.id)
     )
 
     assert actual_role == expected_role
 
 
+@pytest.mark.asyncio
 @patch(
     "services.aad_authentication.AzureADAuthorization.get_identity_role_assignments",
     return_value=[("ab123", "ab124")],
 )
-def test_raises_auth_config_error_if_workspace_auth_config_is_not_set(_):
+async def test_raises_auth_config_error_if_workspace_auth_config_is_not_set(_):
     access_service = AzureADAuthorization()
 
     user = User(id="123", name="test", email="t@t.com")
@@ -538,15 +549,16 @@ def test_raises_auth_config_error_if_workspace_auth_config_is_not_set(_):
         _ = access_service.get_workspace_role(
             user,
             workspace_with_no_auth_config,
-            access_service.get_identity_role_assignments(user.id),
+            await access_service.get_identity_role_assignments(user.id),
         )
 
 
+@pytest.mark.asyncio
 @patch(
     "services.aad_authentication.AzureADAuthorization.get_identity_role_assignments",
     return_value=[("ab123", "ab124")],
 )
-def test_raises_auth_config_error_if_auth_info_has_incorrect_roles(_):
+async def test_raises_auth_config_error_if_auth_info_has_incorrect_roles(_):
     access_service = AzureADAuthorization()
 
     user = User(id="123", name="test", email="t@t.com")
@@ -563,14 +575,15 @@ def test_raises_auth_config_error_if_auth_info_has_incorrect_roles(_):
         _ = access_service.get_workspace_role(
             user,
             workspace_with_auth_info_but_no_roles,
-            access_service.get_identity_role_assignments(),
+            await access_service.get_identity_role_assignments(),
         )
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_auth_header")
 @patch("services.aad_authentication.AzureADAuthorization._get_batch_users_by_role_assignments_body")
-@patch("requests.post")
-def test_get_user_details_with_batch_of_more_than_20_requests(mock_graph_post, mock_get_batch_users_by_role_assignments_body, mock_headers):
+@patch("services.aad_authentication.get_graph_client")
+async def test_get_user_details_sends_all_lookups_to_the_batch_endpoint(get_graph_client_mock, mock_get_batch_users_by_role_assignments_body, mock_headers):
     # Arrange
     access_service = AzureADAuthorization()
     roles_graph_data = [{"id": "role1"}, {"id": "role2"}]
@@ -580,57 +593,33 @@ def test_get_user_details_with_batch_of_more_than_20_requests(mock_graph_post, m
     # mock the response of _get_auth_header
     headers = {"Authorization": f"Bearer {msgraph_token}"}
     mock_headers.return_value = headers
-    headers["Content-type"] = "application/json"
-
-    # mock the response of the get batch request for 30 users
-    batch_request_body_first_20 = {
-        "requests": [
-            {"id": f"{i}", "method": "GET", "url": f"/users/{i}"} for i in range(20)
-        ]
-    }
-
-    batch_request_body_last_10 = {
-        "requests": [
-            {"id": f"{i}", "method": "GET", "url": f"/users/{i}"} for i in range(20, 30)
-        ]
-    }
 
     batch_request_body = {
         "requests": [
             {"id": f"{i}", "method": "GET", "url": f"/users/{i}"} for i in range(30)
         ]
     }
-
     mock_get_batch_users_by_role_assignments_body.return_value = batch_request_body
 
-    # Mock the response of the post request
-    mock_graph_post_response = {"responses": [{"id": "user1", "request": {"id": "user1"}}, {"id": "user2", "request": {"id": "user2"}}]}
-    mock_graph_post.return_value.json.return_value = mock_graph_post_response
+    # the graph client splits the requests in batches of 20
+    graph_batch_response = {"responses": [{"id": "user1", "request": {"id": "user1"}}, {"id": "user2", "request": {"id": "user2"}}]}
+    get_graph_client_mock.return_value.batch = AsyncMock(return_value=graph_batch_response)
 
     # Act
-    users_graph_data = access_service._get_user_details(roles_graph_data, msgraph_token)
+    users_graph_data = await access_service._get_user_details(roles_graph_data, msgraph_token)
 
     # Assert
-    assert len(users_graph_data["responses"]) == 4
-    calls = [
-        call(
-            f"{batch_endpoint}",
-            json=batch_request_body_first_20,
-            headers=headers,
-            timeout=GRAPH_REQUEST_TIMEOUT
-        ),
-        call(
-            f"{batch_endpoint}",
-            json=batch_request_body_last_10,
-            headers=headers,
-            timeout=GRAPH_REQUEST_TIMEOUT
-        )
-    ]
-    mock_graph_post.assert_has_calls(calls, any_order=True)
+    assert users_graph_data == graph_batch_response
+    get_graph_client_mock.return_value.batch.assert_awaited_once_with(
+        batch_endpoint,
+        batch_request_body["requests"],
+        headers={"Authorization": f"Bearer {msgraph_token}", "Content-type": "application/json"}
+    )
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_role_assignment_graph_data_for_user")
-def test_get_role_assignment_for_user(mock_get_role_assignment_data_for_user):
+async def test_get_role_assignment_for_user(mock_get_role_assignment_data_for_user):
     mock_user_data = {
         "value": [
             {"appRoleId": "123", "principalId": "123", "principalType": "User"},
@@ -640,7 +629,7 @@ def test_get_role_assignment_for_user(mock_get_role_assignment_data_for_user):
 
     mock_get_role_assignment_data_for_user.return_value = mock_user_data
     access_service = AzureADAuthorization()
-    role = access_service._get_role_assignment_for_user("abc", "123")
+    role = await access_service._get_role_assignment_for_user("abc", "123")
 
     mock_get_role_assignment_data_for_user.assert_called_once()
     assert role == mock_user_data["value"][0]
@@ -707,79 +696,85 @@ def get_mock_role_response(principal_roles):
     return response
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._is_user_in_role", return_value=True)
 @patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use")
 @patch("services.aad_authentication.AzureADAuthorization._assign_workspace_user_to_application_group")
-def test_assign_workspace_user_already_has_role(workspace_role_in_use_mock,
-                                                assign_user_to_group_mock,
-                                                workspace_without_groups, role_owner,
-                                                user_with_role):
+async def test_assign_workspace_user_already_has_role(workspace_role_in_use_mock,
+                                                      assign_user_to_group_mock,
+                                                      workspace_without_groups, role_owner,
+                                                      user_with_role):
     access_service = AzureADAuthorization()
-    access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
+    await access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
 
     assert workspace_role_in_use_mock.call_count == 0
     assert assign_user_to_group_mock.call_count == 0
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._is_user_in_role", return_value=False)
 @patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use", return_value=False)
 @patch("services.aad_authentication.AzureADAuthorization._assign_workspace_user_to_application_group")
-def test_assign_workspace_user_if_no_groups_raises_error(_, __, ___, workspace_without_groups, role_owner,
-                                                         user_with_role):
+async def test_assign_workspace_user_if_no_groups_raises_error(_, __, ___, workspace_without_groups, role_owner,
+                                                               user_with_role):
 
     access_service = AzureADAuthorization()
 
     with pytest.raises(UserRoleAssignmentError):
-        access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
+        await access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._is_user_in_role", return_value=False)
 @patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use", return_value=True)
 @patch("services.aad_authentication.AzureADAuthorization._assign_workspace_user_to_application_group")
-def test_assign_workspace_user_if_groups(_, __, assign_user_to_group_mock,
-                                         workspace_without_groups, role_owner,
-                                         user_with_role):
+async def test_assign_workspace_user_if_groups(_, __, assign_user_to_group_mock,
+                                               workspace_without_groups, role_owner,
+                                               user_with_role):
 
     access_service = AzureADAuthorization()
 
-    access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
+    await access_service.assign_workspace_user(user_with_role.id, workspace_without_groups, role_owner.id)
 
     assert assign_user_to_group_mock.call_count == 1
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use", return_value=False)
 @patch("services.aad_authentication.AzureADAuthorization._get_role_assignment_for_user")
-def test_remove_workspace_user_if_no_groups_raises_error(_, get_role_assignment_mock,
-                                                         workspace_without_groups,
-                                                         role_owner,
-                                                         user_with_role):
+async def test_remove_workspace_user_if_no_groups_raises_error(_, get_role_assignment_mock,
+                                                               workspace_without_groups,
+                                                               role_owner,
+                                                               user_with_role):
 
     access_service = AzureADAuthorization()
     get_role_assignment_mock.return_value = []
 
     with pytest.raises(UserRoleAssignmentError):
-        access_service.remove_workspace_role_user_assignment(user_with_role.id, role_owner.id, workspace_without_groups)
+        await access_service.remove_workspace_role_user_assignment(user_with_role.id, role_owner.id, workspace_without_groups)
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._remove_workspace_user_from_application_group")
 @patch("services.aad_authentication.AzureADAuthorization._get_role_assignment_for_user")
 @patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use", return_value=True)
-def test_remove_workspace_user_if_groups(_, get_role_assignment_mock,
-                                         remove_user_to_group_mock,
-                                         workspace_without_groups,
-                                         role_owner,
-                                         user_with_role):
+async def test_remove_workspace_user_if_groups(_, get_role_assignment_mock,
+                                               remove_user_to_group_mock,
+                                               workspace_without_groups,
+                                               role_owner,
+                                               user_with_role):
 
     access_service = AzureADAuthorization()
     get_role_assignment_mock.return_value = []
 
-    access_service.remove_workspace_role_user_assignment(user_with_role.id, role_owner.id, workspace_without_groups)
+    await access_service.remove_workspace_role_user_assignment(user_with_role.id, role_owner.id, workspace_without_groups)
 
     assert remove_user_to_group_mock.call_count == 1
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._ms_graph_query")
-def test_get_assignable_users_returns_users(ms_graph_query_mock):
+async def test_get_assignable_users_returns_users(ms_graph_query_mock):
     access_service = AzureADAuthorization()
 
     # Mock the response of the get request
@@ -794,17 +789,18 @@ def test_get_assignable_users_returns_users(ms_graph_query_mock):
         ]
     }
     ms_graph_query_mock.return_value = request_get_mock_response
-    users = access_service.get_assignable_users()
+    users = await access_service.get_assignable_users()
 
     assert len(users) == 1
     assert users[0].displayName == "User 1"
     assert users[0].userPrincipalName == "User1@test.com"
 
 
+@pytest.mark.asyncio
 @patch("services.aad_authentication.AzureADAuthorization._get_msgraph_token", return_value="token")
 @patch("services.aad_authentication.AzureADAuthorization._ms_graph_query")
 @patch("services.aad_authentication.AzureADAuthorization._get_auth_header")
-def test_get_workspace_roles_returns_roles(_, ms_graph_query_mock, mock_headers, workspace_without_groups):
+async def test_get_workspace_roles_returns_roles(_, ms_graph_query_mock, mock_headers, workspace_without_groups):
     access_service = AzureADAuthorization()
 
     # mock the response of _get_auth_header
@@ -821,7 +817,7 @@ def test_get_workspace_roles_returns_roles(_, ms_graph_query_mock, mock_headers,
         ]
     }
     ms_graph_query_mock.return_value = request_get_mock_response
-    roles = access_service.get_workspace_roles(workspace_without_groups)
+    roles = await access_service.get_workspace_roles(workspace_without_groups)
 
     assert len(roles) == 3
     assert roles[0].id == "1"
@@ -841,3 +837,77 @@ def test_compare_versions_greater_than():
 def test_compare_versions_less_than():
     result = compare_versions("1.0.0", "1.1.0")
     assert result < 0
+
+
+@pytest.mark.asyncio
+@patch("services.aad_authentication.AzureADAuthorization._get_workspace_user_emails_by_role_assignment", return_value={"WorkspaceOwner": ["owner@email.com"]})
+async def test_get_workspace_user_emails_by_role_assignment_is_cached(get_emails_mock, workspace_with_groups):
+    access_service = AzureADAuthorization()
+
+    first = await access_service.get_workspace_user_emails_by_role_assignment(workspace_with_groups)
+    first["WorkspaceOwner"].append("changed@email.com")
+    second = await access_service.get_workspace_user_emails_by_role_assignment(workspace_with_groups)
+
+    assert second == {"WorkspaceOwner": ["owner@email.com"]}
+    get_emails_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("services.aad_authentication.AzureADAuthorization._get_identity_role_assignments", return_value=[RoleAssignment(resource_id="abc127", role_id="abc128")])
+async def test_get_identity_role_assignments_is_cached(get_role_assignments_mock):
+    access_service = AzureADAuthorization()
+
+    assert await access_service.get_identity_role_assignments("123") == await access_service.get_identity_role_assignments("123")
+    get_role_assignments_mock.assert_called_once_with("123")
+
+
+@pytest.mark.asyncio
+@patch("services.aad_authentication.AzureADAuthorization._is_user_in_role", return_value=False)
+@patch("services.aad_authentication.AzureADAuthorization._is_workspace_role_group_in_use", return_value=True)
+@patch("services.aad_authentication.AzureADAuthorization._assign_workspace_user_to_application_group")
+@patch("services.aad_authentication.AzureADAuthorization._remove_workspace_user_from_application_group")
+@patch("services.aad_authentication.AzureADAuthorization._get_identity_role_assignments", return_value=[])
+@patch("services.aad_authentication.AzureADAuthorization._get_workspace_user_emails_by_role_assignment", return_value={})
+async def test_assigning_and_removing_workspace_users_invalidates_cached_role_assignments(
+    get_emails_mock, get_role_assignments_mock, _, __, ___, ____, workspace_with_groups, role_owner, user_with_role
+):
+    access_service = AzureADAuthorization()
+
+    async def read_role_assignments():
+        await access_service.get_workspace_user_emails_by_role_assignment(workspace_with_groups)
+        await access_service.get_identity_role_assignments(user_with_role.id)
+
+    await read_role_assignments()
+    await read_role_assignments()
+    await access_service.assign_workspace_user(user_with_role.id, workspace_with_groups, role_owner.id)
+    await read_role_assignments()
+    await access_service.remove_workspace_role_user_assignment(user_with_role.id, role_owner.id, workspace_with_groups)
+    await read_role_assignments()
+
+    assert get_emails_mock.call_count == 3
+    assert get_role_assignments_mock.call_count == 3
+
+
+@patch("services.aad_authentication.graph_token_acquisitions")
+@patch("services.aad_authentication._msal_app", None)
+@patch("services.aad_authentication.ConfidentialClientApplication")
+def test_get_msgraph_token_reuses_the_msal_app_and_its_token_cache(msal_app_mock, token_acquisitions_mock):
+    msal_app_mock.return_value.acquire_token_for_client.side_effect = [
+        {"access_token": "token", "token_source": "identity_provider"},
+        {"access_token": "token", "token_source": "cache"},
+    ]
+
+    assert AzureADAuthorization._get_msgraph_token() == "token"
+    assert AzureADAuthorization._get_msgraph_token() == "token"
+
+    msal_app_mock.assert_called_once()
+    assert token_acquisitions_mock.add.call_args_list == [call(1, {"source": "identity_provider"}), call(1, {"source": "cache"})]
+
+
+@patch("services.aad_authentication._msal_app", None)
+@patch("services.aad_authentication.ConfidentialClientApplication")
+def test_get_msgraph_token_raises_if_no_token_is_returned(msal_app_mock):
+    msal_app_mock.return_value.acquire_token_for_client.return_value = {"error": "invalid_client", "error_description": "bad secret"}
+
+    with pytest.raises(Exception, match="invalid_client: bad secret"):
+        AzureADAuthorization._get_msgraph_token()
@@ -4,7 +4,7 @@ import pytest_asyncio
 import time
 from resources import strings
 from services.airlock import validate_user_allowed_to_access_storage_account, get_required_permission, \
-    validate_request_status, cancel_request, delete_review_user_resource, check_email_exists, revoke_request
+    validate_request_status, cancel_request, delete_review_user_resource, delete_all_review_user_resources, check_email_exists, revoke_request
 from models.domain.airlock_request import AirlockRequest, AirlockRequestStatus, AirlockRequestType, AirlockReview, AirlockReviewDecision, AirlockActions, AirlockReviewUserResource
 from tests_ma.test_api.conftest import create_workspace_owner_user, create_workspace_researcher_user, get_required_roles
 from mock import AsyncMock, patch, MagicMock
@@ -480,13 +480,14 @@ async def test_update_and_publish_event_airlock_request_without_status_change_sh
 async def test_get_airlock_requests_by_user_and_workspace_with_status_filter_calls_repo(airlock_request_repo_mock):
     workspace = sample_workspace()
     user = create_workspace_airlock_manager_user()
-    airlock_request_repo_mock.get_airlock_requests = AsyncMock()
+    airlock_request_repo_mock.get_airlock_requests_page = AsyncMock(return_value=([], None))
 
     await get_airlock_requests_by_user_and_workspace(user=user, workspace=workspace, airlock_request_repo=airlock_request_repo_mock,
                                                      status=AirlockRequestStatus.InReview)
 
-    airlock_request_repo_mock.get_airlock_requests.assert_called_once_with(workspace_id=workspace.id, creator_user_id=None, type=None,
-                                                                           status=AirlockRequestStatus.InReview, order_by=None, order_ascending=True)
+    airlock_request_repo_mock.get_airlock_requests_page.assert_called_once_with(workspace_id=workspace.id, creator_user_id=None, type=None,
+                                                                                status=AirlockRequestStatus.InReview, order_by=None, order_ascending=True,
+                                                                                page_size=None, continuation=None)
 
 
 @pytest.mark.asyncio
@@ -588,6 +589,25 @@ async def test_delete_review_user_resource_disables_the_resource_before_deletion
     disable_user_resource.assert_called_once()
 
 
+@pytest.mark.asyncio
+@patch("services.airlock.delete_review_user_resource")
+async def test_delete_all_review_user_resources_deletes_every_review_resource(delete_review_user_resource):
+    airlock_request = sample_airlock_request()
+    airlock_request.reviewUserResources = {"user-1": sample_airlock_user_resource_object(), "user-2": sample_airlock_user_resource_object()}
+    delete_review_user_resource.return_value = "operation"
+
+    operations = await delete_all_review_user_resources(airlock_request=airlock_request,
+                                                        user_resource_repo=AsyncMock(),
+                                                        workspace_service_repo=AsyncMock(),
+                                                        resource_template_repo=AsyncMock(),
+                                                        operations_repo=AsyncMock(),
+                                                        resource_history_repo=AsyncMock(),
+                                                        user=create_test_user())
+
+    assert operations == ["operation", "operation"]
+    assert delete_review_user_resource.await_count == 2
+
+
 # --- Graph / role-assignment error separation tests ---
 
 @pytest.mark.asyncio
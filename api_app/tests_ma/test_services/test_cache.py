@@ -0,0 +1,51 @@
+import time
+
+from mock import patch
+
+from services.cache import LRUCache, TTLCache
+
+
+def test_lru_cache_evicts_the_least_recently_used_entry_when_full():
+    cache = LRUCache("test", max_size=2)
+    cache.set("first", "value")
+    cache.set("second", "value")
+
+    cache.get("first")
+    cache.set("third", "value")
+
+    assert cache.get("first") == "value"
+    assert cache.get("second") is None
+    assert cache.get("third") == "value"
+
+
+def test_lru_cache_counts_hits_and_misses_under_the_cache_name():
+    cache = LRUCache("test", max_size=2)
+    cache.set("key", "value")
+
+    with patch("services.cache.cache_hits") as hits_mock, patch("services.cache.cache_misses") as misses_mock:
+        cache.get("key")
+        cache.get("other")
+
+    hits_mock.add.assert_called_once_with(1, {"cache": "test"})
+    misses_mock.add.assert_called_once_with(1, {"cache": "test"})
+
+
+def test_ttl_cache_entries_expire():
+    cache = TTLCache("test", max_size=10, ttl_seconds=60)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    with patch("services.cache.time.monotonic", return_value=time.monotonic() + 61):
+        assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_invalidate_drops_the_entry():
+    cache = TTLCache("test", max_size=10, ttl_seconds=60)
+    cache.set("key", "value")
+    cache.set("other", "value")
+
+    cache.invalidate("key")
+
+    assert cache.get("key") is None
+    assert cache.get("other") == "value"
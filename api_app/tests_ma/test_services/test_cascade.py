@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+from mock import AsyncMock
+
+from services.cascade import CascadeFailed, run_cascade
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_run_cascade_bounds_concurrency():
+    running = 0
+    max_running = 0
+
+    async def action(item):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+        return item * 2
+
+    results = await run_cascade(range(10), action, key=str, max_concurrency=3)
+
+    assert results == [item * 2 for item in range(10)]
+    assert max_running == 3
+
+
+async def test_run_cascade_retries_etag_conflicts_with_refreshed_item():
+    action = AsyncMock(side_effect=[CosmosAccessConditionFailedError(), "patched"])
+    refresh = AsyncMock(return_value="fresh")
+
+    assert await run_cascade(["stale"], action, key=str, refresh=refresh) == ["patched"]
+
+    refresh.assert_awaited_once_with("stale")
+    assert action.await_args_list[1].args == ("fresh",)
+
+
+async def test_run_cascade_reports_all_failures_after_attempting_every_item():
+    async def action(item):
+        if item == "conflict":
+            raise CosmosAccessConditionFailedError()
+        if item == "invalid":
+            raise ValueError("invalid patch")
+        return item
+
+    with pytest.raises(CascadeFailed) as exc_info:
+        await run_cascade(["ok", "conflict", "invalid"], action, key=str, max_retries=1)
+
+    assert set(exc_info.value.errors) == {"conflict", "invalid"}
+    assert isinstance(exc_info.value.errors["invalid"], ValueError)
+    assert "2 dependent resources" in str(exc_info.value)
+
+
+async def test_run_cascade_reports_every_failure_of_the_same_type():
+    action = AsyncMock(side_effect=[ValueError("first"), "ok", ValueError("second")])
+
+    with pytest.raises(CascadeFailed) as exc_info:
+        await run_cascade(["a", "b", "c"], action, key=str)
+
+    assert set(exc_info.value.errors) == {"a", "c"}
+    assert action.await_count == 3
@@ -4,7 +4,7 @@ import pytest
 from models.domain.costs import GranularityEnum
 from models.domain.shared_service import SharedService, ResourceType
 from models.domain.user_resource import UserResource
-from models.domain.workspace import Workspace
+from models.domain.workspace import Workspace, WorkspaceSummary
 from models.domain.workspace_service import WorkspaceService
 from services.cost_service import CostService, SubscriptionNotSupported
 from datetime import date, datetime, timedelta
@@ -366,22 +366,16 @@ async def test_query_tre_costs_with_dates_set_as_none_calls_client_with_custom_d
 
 
 def __set_workspace_repo_mock_get_active_workspaces_return_value(workspace_repo_mock):
-    workspace_repo_mock.get_active_workspaces = AsyncMock(return_value=[
-        Workspace(id='19b7ce24-aa35-438c-adf6-37e6762911a6', templateName='tre-workspace-base',
-                  resourceType=ResourceType.Workspace, templateVersion="1", _etag="x",
-                  properties={'display_name': 'the workspace display name1'}),
-        Workspace(id='d680d6b7-d1d9-411c-9101-0793da980c81', templateName='tre-workspace-base',
-                  resourceType=ResourceType.Workspace, templateVersion="1", _etag="x",
-                  properties={'display_name': 'the workspace display name2'})
+    workspace_repo_mock.get_active_workspace_views = AsyncMock(return_value=[
+        WorkspaceSummary(id='19b7ce24-aa35-438c-adf6-37e6762911a6', templateName='tre-workspace-base', properties={'display_name': 'the workspace display name1'}),
+        WorkspaceSummary(id='d680d6b7-d1d9-411c-9101-0793da980c81', templateName='tre-workspace-base', properties={'display_name': 'the workspace display name2'})
     ])
 
 
 def __set_workspace_repo_mock_get_active_workspaces_return_value_without_display_name(workspace_repo_mock):
-    workspace_repo_mock.get_active_workspaces = AsyncMock(return_value=[
-        Workspace(id='19b7ce24-aa35-438c-adf6-37e6762911a6', templateName='tre-workspace-base',
-                  resourceType=ResourceType.Workspace, templateVersion="1", _etag="x"),
-        Workspace(id='d680d6b7-d1d9-411c-9101-0793da980c81', templateName='tre-workspace-base',
-                  resourceType=ResourceType.Workspace, templateVersion="1", _etag="x")
+    workspace_repo_mock.get_active_workspace_views = AsyncMock(return_value=[
+        WorkspaceSummary(id='19b7ce24-aa35-438c-adf6-37e6762911a6', templateName='tre-workspace-base'),
+        WorkspaceSummary(id='d680d6b7-d1d9-411c-9101-0793da980c81', templateName='tre-workspace-base')
     ])
 
 
@@ -664,11 +658,11 @@ async def test_subscription_id_includes_default_and_workspace_ids(get_resource_g
     cs.config.SUBSCRIPTION_ID = "default-sub-id"
 
     # Workspace with and without subscription id
-    workspace_repo_mock.get_active_workspaces = AsyncMock(return_value=[
-        Workspace(id='ws1', templateName='t1', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={}),
-        Workspace(id='ws2', templateName='t2', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={"workspace_subscription_id": "sub-2"}),
-        Workspace(id='ws3', templateName='t3', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={"workspace_subscription_id": "sub-3"}),
-        Workspace(id='ws4', templateName='t4', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={"workspace_subscription_id": "sub-2"}),  # duplicate
+    workspace_repo_mock.get_active_workspace_views = AsyncMock(return_value=[
+        WorkspaceSummary(id='ws1', templateName='t1', properties={}),
+        WorkspaceSummary(id='ws2', templateName='t2', properties={"workspace_subscription_id": "sub-2"}),
+        WorkspaceSummary(id='ws3', templateName='t3', properties={"workspace_subscription_id": "sub-3"}),
+        WorkspaceSummary(id='ws4', templateName='t4', properties={"workspace_subscription_id": "sub-2"}),  # duplicate
     ])
     __set_shared_service_repo_mock_return_value(shared_service_repo_mock)
     get_resource_groups_by_tag_mock.return_value = {}
@@ -693,9 +687,9 @@ async def test_subscription_id_skips_workspaces_without_id(get_resource_groups_b
     from services import cost_service as cs
     cs.config.SUBSCRIPTION_ID = "default-sub-id"
 
-    workspace_repo_mock.get_active_workspaces = AsyncMock(return_value=[
-        Workspace(id='ws1', templateName='t1', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={}),
-        Workspace(id='ws2', templateName='t2', resourceType=ResourceType.Workspace, templateVersion="1", _etag="x", properties={}),
+    workspace_repo_mock.get_active_workspace_views = AsyncMock(return_value=[
+        WorkspaceSummary(id='ws1', templateName='t1', properties={}),
+        WorkspaceSummary(id='ws2', templateName='t2', properties={}),
     ])
     __set_shared_service_repo_mock_return_value(shared_service_repo_mock)
     get_resource_groups_by_tag_mock.return_value = {}
@@ -0,0 +1,59 @@
+import httpx
+import pytest
+from mock import AsyncMock, patch
+
+from services.graph_client import GraphClient, retry_after_seconds
+
+pytestmark = pytest.mark.asyncio
+
+GRAPH_URL = "https://graph.microsoft.com/v1.0/users"
+BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+
+
+def graph_client(handler) -> GraphClient:
+    return GraphClient(transport=httpx.MockTransport(handler))
+
+
+@patch("services.graph_client.asyncio.sleep", new_callable=AsyncMock)
+async def test_request_retries_throttled_requests_after_retry_after(sleep_mock):
+    responses = [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200, json={"value": []})]
+    client = graph_client(lambda request: responses.pop(0))
+
+    response = await client.request("GET", GRAPH_URL, headers={})
+
+    assert response.status_code == 200
+    sleep_mock.assert_awaited_once_with(2.0)
+
+
+@patch("services.graph_client.asyncio.sleep", new_callable=AsyncMock)
+async def test_request_returns_throttled_response_when_retries_are_exhausted(sleep_mock):
+    client = graph_client(lambda request: httpx.Response(429))
+
+    with patch("services.graph_client.GRAPH_THROTTLED_RETRIES", 2):
+        response = await client.request("GET", GRAPH_URL, headers={})
+
+    assert response.status_code == 429
+    assert sleep_mock.await_count == 2
+
+
+async def test_batch_splits_requests_and_merges_responses():
+    batch_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sub_requests = httpx.Response(200, content=request.content).json()["requests"]
+        batch_sizes.append(len(sub_requests))
+        return httpx.Response(200, json={"responses": [{"id": sub_request["id"]} for sub_request in sub_requests]})
+
+    client = graph_client(handler)
+    requests = [{"id": str(i), "method": "GET", "url": f"/users/{i}"} for i in range(45)]
+
+    batch_data = await client.batch(BATCH_URL, requests, headers={})
+
+    assert sorted(batch_sizes) == [5, 20, 20]
+    assert [response["id"] for response in batch_data["responses"]] == [str(i) for i in range(45)]
+
+
+async def test_retry_after_seconds_defaults_when_header_is_missing_or_invalid():
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "5"})) == 5
+    assert retry_after_seconds(httpx.Response(429)) == 1
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 1
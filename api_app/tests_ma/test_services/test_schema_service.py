@@ -133,3 +133,17 @@ def test_enrich_template_adds_read_only_on_update(basic_resource_template):
 
     assert "readOnly" not in template["properties"]["updateable_property"].keys()
     assert template["properties"]["fixed_property"]["readOnly"] is True
+
+
+def test_read_schema_returns_the_preloaded_schema_fragment():
+    required, properties = services.schema_service.read_schema('workspace.json')
+
+    assert "display_name" in required
+    assert "display_name" in properties
+
+
+def test_enrich_template_on_update_does_not_modify_the_preloaded_schema_fragments(basic_resource_template):
+    services.schema_service.enrich_template(basic_resource_template, [services.schema_service.read_schema('workspace.json')], is_update=True)
+
+    _, properties = services.schema_service.read_schema('workspace.json')
+    assert all("readOnly" not in prop for prop in properties.values())
@@ -4,7 +4,7 @@ from setuptools import find_packages
 from setuptools import setup
 
 PROJECT = 'azure-tre-cli'
-VERSION = '0.2.9'
+VERSION = '0.2.10'
 
 try:
     long_description = open('README.md', 'rt').read()
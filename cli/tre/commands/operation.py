@@ -4,7 +4,7 @@ from time import sleep
 
 import click
 from tre.api_client import ApiClient
-from tre.output import output
+from tre.output import output, page_params
 
 
 def get_operation_id_completion(ctx: click.Context, log: Logger, list_url: str, param: click.Parameter, incomplete: str, scope_id: str = None):
@@ -95,13 +95,14 @@ def operation_show(log, operation_url, no_wait, output_format, query, suppress_o
     return response.text
 
 
-def operations_list(log, operations_url, output_format, query, scope_id: str = None):
+def operations_list(log, operations_url, output_format, query, scope_id: str = None, page_size: int = None, continuation: str = None):
     client = ApiClient.get_api_client_from_config()
 
     response = client.call_api(
         log,
         'GET',
         operations_url,
-        scope_id=scope_id
+        scope_id=scope_id,
+        params=page_params(page_size, continuation)
     )
     output(response, output_format=output_format, query=query, default_table_query=default_operation_table_query_list())
@@ -1,7 +1,7 @@
 import logging
 import click
 from tre.commands.operation import operations_list
-from tre.output import output_option, query_option
+from tre.output import continuation_option, output_option, page_size_option, query_option
 
 from .contexts import SharedServiceContext, pass_shared_service_context
 
@@ -14,8 +14,10 @@ def shared_service_operations():
 @click.command(name="list", help="List shared_service operations")
 @output_option()
 @query_option()
+@page_size_option()
+@continuation_option()
 @pass_shared_service_context
-def shared_service_operations_list(shared_service_context: SharedServiceContext, output_format, query):
+def shared_service_operations_list(shared_service_context: SharedServiceContext, output_format, query, page_size, continuation):
     log = logging.getLogger(__name__)
 
     shared_service_id = shared_service_context.shared_service_id
@@ -23,7 +25,7 @@ def shared_service_operations_list(shared_service_context: SharedServiceContext,
         raise click.UsageError('Missing shared_service ID')
 
     operations_url = f'/api/shared-services/{shared_service_id}/operations'
-    operations_list(log, operations_url, output_format, query)
+    operations_list(log, operations_url, output_format, query, page_size=page_size, continuation=continuation)
 
 
 shared_service_operations.add_command(shared_service_operations_list)
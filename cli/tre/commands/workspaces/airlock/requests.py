@@ -3,7 +3,7 @@ import logging
 
 from tre.api_client import ApiClient
 from tre.commands.workspaces.contexts import pass_workspace_context
-from tre.output import output, output_option, query_option
+from tre.output import continuation_option, output, output_option, page_params, page_size_option, query_option
 
 _default_table_query_list = r"airlockRequests[].airlockRequest.{id:id,workspace_id:workspaceId,type:type,status:status,business_justification:businessJustification}"
 _default_table_query_item = r"airlockRequest.{id:id,workspace_id:workspaceId,type:type,status:status,business_justification:businessJustification}"
@@ -17,8 +17,10 @@ def airlocks() -> None:
 @click.command(name="list", help="List airlocks")
 @output_option()
 @query_option()
+@page_size_option()
+@continuation_option()
 @pass_workspace_context
-def airlocks_list(workspace_context, output_format, query):
+def airlocks_list(workspace_context, output_format, query, page_size, continuation):
     log = logging.getLogger(__name__)
 
     workspace_id = workspace_context.workspace_id
@@ -33,6 +35,7 @@ def airlocks_list(workspace_context, output_format, query):
         'GET',
         f'/api/workspaces/{workspace_id}/requests',
         scope_id=workspace_scope,
+        params=page_params(page_size, continuation)
     )
     output(response, output_format=output_format, query=query, default_table_query=_default_table_query_list)
 
@@ -1,7 +1,7 @@
 import logging
 import click
 from tre.commands.operation import operations_list
-from tre.output import output_option, query_option
+from tre.output import continuation_option, output_option, page_size_option, query_option
 
 from .contexts import WorkspaceContext, pass_workspace_context
 
@@ -14,15 +14,17 @@ def workspace_operations():
 @click.command(name="list", help="List workspace operations")
 @output_option()
 @query_option()
+@page_size_option()
+@continuation_option()
 @pass_workspace_context
-def workspace_operations_list(workspace_context: WorkspaceContext, output_format, query):
+def workspace_operations_list(workspace_context: WorkspaceContext, output_format, query, page_size, continuation):
     log = logging.getLogger(__name__)
 
     workspace_id = workspace_context.workspace_id
     if workspace_id is None:
         raise click.UsageError('Missing workspace ID')
     operations_url = f'/api/workspaces/{workspace_id}/operations'
-    operations_list(log, operations_url, output_format, query)
+    operations_list(log, operations_url, output_format, query, page_size=page_size, continuation=continuation)
 
 
 workspace_operations.add_command(workspace_operations_list)
@@ -2,7 +2,7 @@ import logging
 import click
 from tre.api_client import ApiClient
 from tre.commands.operation import operations_list
-from tre.output import output_option, query_option
+from tre.output import continuation_option, output_option, page_size_option, query_option
 
 from .contexts import UserResourceContext, pass_user_resource_context
 
@@ -15,8 +15,10 @@ def user_resource_operations():
 @click.command(name="list", help="List user resource operations")
 @output_option()
 @query_option()
+@page_size_option()
+@continuation_option()
 @pass_user_resource_context
-def user_resource_operations_list(user_resource_operation_context: UserResourceContext, output_format, query):
+def user_resource_operations_list(user_resource_operation_context: UserResourceContext, output_format, query, page_size, continuation):
     log = logging.getLogger(__name__)
 
     workspace_id = user_resource_operation_context.workspace_id
@@ -31,7 +33,7 @@ def user_resource_operations_list(user_resource_operation_context: UserResourceC
     operations_url = f'/api/workspaces/{workspace_id}/workspace-services/{workspace_service_id}/user-resources/{user_resource_id}/operations'
     client = ApiClient.get_api_client_from_config()
     workspace_scope = client.get_workspace_scope(log, workspace_id)
-    operations_list(log, operations_url, output_format, query, scope_id=workspace_scope)
+    operations_list(log, operations_url, output_format, query, scope_id=workspace_scope, page_size=page_size, continuation=continuation)
 
 
 user_resource_operations.add_command(user_resource_operations_list)
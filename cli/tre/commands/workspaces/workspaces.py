@@ -4,7 +4,7 @@ import logging
 
 from tre.api_client import ApiClient
 from tre.commands.operation import default_operation_table_query_single, operation_show
-from tre.output import output, output_option, query_option
+from tre.output import continuation_option, output, output_option, page_params, page_size_option, query_option
 
 
 @click.group(help="List/add workspaces")
@@ -15,11 +15,13 @@ def workspaces() -> None:
 @click.command(name="list", help="List workspaces")
 @output_option()
 @query_option()
-def workspaces_list(output_format, query):
+@page_size_option()
+@continuation_option()
+def workspaces_list(output_format, query, page_size, continuation):
     log = logging.getLogger(__name__)
 
     client = ApiClient.get_api_client_from_config()
-    response = client.call_api(log, 'GET', '/api/workspaces')
+    response = client.call_api(log, 'GET', '/api/workspaces', params=page_params(page_size, continuation))
     output(
         response,
         output_format=output_format,
@@ -33,6 +33,30 @@ def query_option(*param_decls: str, **kwargs: t.Any):
     return click.option(*param_decls, **kwargs)
 
 
+def page_size_option(*param_decls: str, **kwargs: t.Any):
+    param_decls = ('--page-size',)
+    kwargs.setdefault("default", None)
+    kwargs.setdefault("type", click.IntRange(min=1))
+    kwargs.setdefault("help", "Maximum number of items to return, the continuation token of the next page is returned with the page")
+    return click.option(*param_decls, **kwargs)
+
+
+def continuation_option(*param_decls: str, **kwargs: t.Any):
+    param_decls = ('--continuation',)
+    kwargs.setdefault("default", None)
+    kwargs.setdefault("help", "Continuation token returned with the previous page")
+    return click.option(*param_decls, **kwargs)
+
+
+def page_params(page_size: t.Optional[int], continuation: t.Optional[str]) -> t.Optional[dict]:
+    params = {}
+    if page_size is not None:
+        params["page_size"] = page_size
+    if continuation is not None:
+        params["continuation"] = continuation
+    return params or None
+
+
 def output_result(result_json: str, output_format: OutputFormat = OutputFormat.Json, query: str = None, default_table_query: str = None) -> None:
 
     if query is None and output_format == OutputFormat.Table.value:
@@ -97,5 +121,14 @@ def output(response: Response, output_format: OutputFormat = OutputFormat.Json,
 
     output_result(result_json, output_format, query, default_table_query)
 
+    if output_format == OutputFormat.Table.value and response.is_success:
+        # the table doesn't show the continuation token of paged lists
+        continuation = response.headers.get("x-ms-continuation")
+        if continuation is None:
+            result = response.json()
+            continuation = result.get("continuation") if type(result) is dict else None
+        if continuation is not None:
+            click.echo(f"More items available, use --continuation '{continuation}' to get the next page", err=True)
+
     if not response.is_success:
         sys.exit(1)